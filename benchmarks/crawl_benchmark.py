@@ -0,0 +1,194 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import platform
+import socket
+import subprocess
+import time
+import urllib.request
+
+def percentile(values, fraction):
+    """
+    Percentil por el método del rango más cercano.
+
+    Args:
+        values (List[float]): Valores a resumir.
+        fraction (float): Percentil entre 0 y 1.
+
+    Returns:
+        float | None: El percentil, o None si no hay valores.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def _free_port():
+    """Devuelve un puerto TCP libre en localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def stand_in_server(args):
+    """
+    Arranca `stand_in_server.py` en otro proceso (para no competir por el bucle de eventos del
+    `Scraper`) y devuelve su URL cuando está listo.
+    """
+    port = _free_port()
+    command = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "stand_in_server.py"),
+        "--port", str(port), "--pages", str(args.pages), "--quotes-per-page", str(args.quotes_per_page),
+        "--authors", str(args.authors), "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--seed", str(args.seed), "--error-rate", str(args.error_rate),
+    ]
+    if args.retry_after is not None:
+        command += ["--retry-after", str(args.retry_after)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}/"
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                urllib.request.urlopen(f"{url}__stats__", timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("No se pudo arrancar el servidor del benchmark")
+                time.sleep(0.05)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+def server_stats(url):
+    """Contadores de peticiones del servidor sustituto (None si el servidor no los expone)."""
+    try:
+        with urllib.request.urlopen(f"{url}__stats__", timeout=5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+async def run_scraper(url, args):
+    """
+    Ejecuta el scraping completo (listado + páginas "about") sin base de datos y mide el resultado.
+
+    Returns:
+        dict: Métricas de la ejecución.
+    """
+    from scraper import Scraper
+    from rate_limiter import RequestScheduler
+    from src.utils.metrics import metrics
+
+    scheduler = RequestScheduler(rate=args.rate)
+    scraper = Scraper(concurrency=args.concurrency, discovery=args.discovery, parser=args.parser, base_url=url,
+                      scheduler=scheduler, parse_workers=args.parse_workers)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sys.stderr):  # La salida del Scraper no se mezcla con el JSON
+            await scraper.fetch_html()
+            crawl_seconds = time.perf_counter() - start
+            quotes = await scraper.get_quotes()
+        total_seconds = time.perf_counter() - start
+        # Latencia de las peticiones: el histograma de la telemetría (percentiles estimados por cubetas)
+        summary = metrics.summary()
+        latencies = summary["histograms"].get("http_request_seconds", {})
+        return {
+            "pages": len(scraper.soups),
+            "quotes": len(quotes),
+            "author_fetches": scraper.author_cache.misses,
+            "author_cache_hits": scraper.author_cache.hits,
+            "requests": scraper.http.counters["requests"],
+            "connections_created": scraper.http.counters["connections_created"],
+            "retries": scheduler.counters["retries"],
+            "throttled": scheduler.counters["throttled"],
+            "failed_pages": len(scraper.failed_pages),
+            "bytes_received": scraper.http.counters["bytes_received"],
+            "crawl_seconds": round(crawl_seconds, 4),
+            "total_seconds": round(total_seconds, 4),
+            "pages_per_second": round(len(scraper.soups) / crawl_seconds, 2) if crawl_seconds else None,
+            "quotes_per_second": round(len(quotes) / total_seconds, 2) if total_seconds else None,
+            "latency_ms": {
+                "p50": latencies.get("p50_ms"),
+                "p99": latencies.get("p99_ms"),
+                "max": latencies.get("max_ms"),
+            },
+            "metrics": summary,
+        }
+    finally:
+        await scraper.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de extremo a extremo del Scraper contra un servidor local que imita quotes.toscrape.com."
+    )
+    parser.add_argument("--pages", type=int, default=200, help="Páginas con citas del servidor sustituto.")
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50, help="Autores distintos.")
+    parser.add_argument("--latency", type=float, default=20.0, help="Latencia base por respuesta (ms).")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Variación máxima de la latencia (± ms).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de respuestas 503 del servidor (0-1).")
+    parser.add_argument("--retry-after", type=int, default=None, help="Cabecera Retry-After (s) de las respuestas 503.")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Peticiones/s por host del cubo de tokens (0 = sin límite, solo AIMD).")
+    parser.add_argument("--concurrency", type=int, default=None, help="Páginas descargándose a la vez (por defecto MAX_CONCURRENCY).")
+    parser.add_argument("--discovery", choices=("speculative", "next"), default="speculative")
+    parser.add_argument("--parser", default=None, help="Motor de análisis HTML (por defecto PARSER_BACKEND).")
+    parser.add_argument("--parse-workers", type=int, default=None,
+                        help="Procesos del pool de análisis (por defecto PARSE_WORKERS; 0 = en el bucle de eventos).")
+    parser.add_argument("--url", default=None, help="Usar un servidor ya arrancado en lugar de lanzar uno.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.utils.constants import MAX_CONCURRENCY, PARSE_WORKERS
+    if args.concurrency is None:
+        args.concurrency = MAX_CONCURRENCY
+    if args.parse_workers is None:
+        args.parse_workers = PARSE_WORKERS
+
+    with (contextlib.nullcontext(args.url) if args.url else stand_in_server(args)) as url:
+        metrics = asyncio.run(run_scraper(url, args))
+        metrics["server"] = server_stats(url)
+
+    result = {
+        "benchmark": "crawl",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "config": {
+            "pages": args.pages,
+            "quotes_per_page": args.quotes_per_page,
+            "authors": args.authors,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "error_rate": args.error_rate,
+            "retry_after": args.retry_after,
+            "rate": args.rate,
+            "concurrency": args.concurrency,
+            "discovery": args.discovery,
+            "parser": args.parser or os.getenv("PARSER_BACKEND") or "default",
+            "parse_workers": args.parse_workers,
+            "url": args.url,
+        },
+        "results": metrics,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
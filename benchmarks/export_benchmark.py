@@ -0,0 +1,173 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import tempfile
+import time
+
+from search_benchmark import populate, cleanup, HASH_PREFIX
+
+FORMATS = ("parquet", "jsonl", "csv")
+
+async def child(args):
+    """Una exportación en este proceso: imprime sus estadísticas en JSON (el padre mide su memoria)."""
+    from exporter import QuoteExporter
+    from database import engine
+
+    try:
+        stats = await QuoteExporter(batch_size=args.batch_size).export(args.path, args.format, args.incremental)
+    finally:
+        await engine.dispose()
+    print(json.dumps(stats))
+
+def measure(path, fmt, args, incremental=None):
+    """
+    Ejecuta una exportación en un proceso aparte y mide su memoria máxima (RSS).
+
+    Returns:
+        dict: Las estadísticas de la exportación y la memoria máxima en MiB.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--path", path, "--format", fmt,
+               "--batch-size", str(args.batch_size)]
+    if incremental:
+        command += ["--incremental", incremental]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               env=dict(os.environ, METRICS_PORT="0", METRICS_SUMMARY_PATH=os.devnull))
+    output = process.stdout.read()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise RuntimeError(f"La exportación {fmt} ha terminado con el código {process.returncode}")
+    stats = json.loads(output.decode().strip().splitlines()[-1])
+    stats["peak_rss_mib"] = round(usage.ru_maxrss / 1024, 1)  # ru_maxrss está en KiB en Linux
+    return stats
+
+async def touch(engine, schema, count):
+    """Modifica el texto de `count` citas sintéticas (los triggers actualizan `quote_details`)."""
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            f"UPDATE {schema}.quotes SET quote = quote || '.' WHERE id IN ("
+            f"SELECT id FROM {schema}.quotes WHERE content_hash LIKE :prefix ORDER BY random() LIMIT :count)"),
+            {"prefix": HASH_PREFIX + "%", "count": count})
+    return result.rowcount
+
+async def prepare(args):
+    from database import engine, db_schema
+
+    try:
+        if args.cleanup_only:
+            await cleanup(engine, db_schema)
+            return None
+        return await populate(engine, db_schema, args.quotes, args.authors, args.tags, args.seed)
+    finally:
+        await engine.dispose()
+
+async def modify(args):
+    from database import engine, db_schema
+
+    try:
+        return await touch(engine, db_schema, args.touch)
+    finally:
+        await engine.dispose()
+
+async def finish(args, name):
+    """Borra la marca de agua de la exportación incremental del benchmark (y, con `--cleanup`, los datos)."""
+    from sqlalchemy import delete
+    from database import engine, db_schema
+    from models import ExportState
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(delete(ExportState).where(ExportState.name == name))
+        if args.cleanup:
+            await cleanup(engine, db_schema)
+    finally:
+        await engine.dispose()
+
+def run(args):
+    """
+    Exporta el corpus entero en cada formato y mide filas/s, tamaño y memoria máxima; después modifica
+    `--touch` citas y mide una exportación incremental.
+    """
+    load = asyncio.run(prepare(args))
+    if load is None:
+        return None
+    name = f"benchmark-{os.getpid()}"
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            stats = measure(os.path.join(directory, f"quotes.{fmt}"), fmt, args)
+            results.append(stats)
+            print(f"{fmt}: {stats['rows_per_second']} filas/s, {stats['peak_rss_mib']} MiB", file=sys.stderr)
+        # Incremental: la primera exportación fija la marca de agua; la segunda solo ve las citas modificadas
+        path = os.path.join(directory, "incremental.jsonl")
+        measure(path, "jsonl", args, incremental=name)
+        touched = asyncio.run(modify(args))
+        incremental = measure(path, "jsonl", args, incremental=name)
+        incremental["touched"] = touched
+        print(f"incremental: {incremental['rows']} filas en {incremental['seconds']} s", file=sys.stderr)
+    asyncio.run(finish(args, name))
+    return {"load": load, "full": results, "incremental": incremental}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la exportación en streaming (Parquet, JSONL y CSV) sobre un corpus sintético. "
+                    "Usa la base de datos configurada (DB_*) y reutiliza los datos del benchmark de búsqueda."
+    )
+    parser.add_argument("--quotes", type=int, default=1_000_000, help="Citas sintéticas que debe haber en la tabla.")
+    parser.add_argument("--authors", type=int, default=1000, help="Autores sintéticos.")
+    parser.add_argument("--tags", type=int, default=200, help="Etiquetas sintéticas.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Formatos medidos, separados por comas.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Filas por lote (por defecto EXPORT_BATCH_SIZE).")
+    parser.add_argument("--touch", type=int, default=1000, help="Citas modificadas antes de la exportación incremental.")
+    parser.add_argument("--cleanup", action="store_true", help="Borrar los datos sintéticos al terminar.")
+    parser.add_argument("--cleanup-only", action="store_true", help="Solo borrar los datos sintéticos.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    # Uso interno: una exportación en un proceso aparte
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    parser.add_argument("--incremental", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.formats = [value.strip() for value in args.formats.split(",") if value.strip()]
+    if args.batch_size is None:
+        from src.utils.constants import EXPORT_BATCH_SIZE
+        args.batch_size = EXPORT_BATCH_SIZE
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        asyncio.run(child(args))
+        return
+    results = run(args)
+    if results is None:
+        return
+    result = {
+        "benchmark": "export",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"quotes": args.quotes, "authors": args.authors, "tags": args.tags, "batch_size": args.batch_size,
+                   "touch": args.touch},
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
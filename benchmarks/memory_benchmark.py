@@ -0,0 +1,125 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+from stand_in_server import StandInSite, author_slug
+
+class LegacyQuote:
+    """
+    Representación anterior de `Quote` (objeto con `__dict__`), para comparar: cada cita guarda su propia
+    copia del nombre del autor, su fecha, su lugar de nacimiento, su descripción y una lista de etiquetas.
+    """
+
+    def __init__(self, text, author, birthdate, tag_list, birthplace, description):
+        from quote import Quote
+        self.text = str(text)
+        self.author = Quote.clean_author(author)
+        self.birthdate = Quote.convert_birthdate(birthdate)
+        self.birthplace = str(birthplace) if birthplace is not None else None
+        self.description = str(description) if description is not None else None
+        self.tags = list(tag_list)
+
+def build_inputs(site, parser, pages):
+    """
+    Analiza las páginas del sitio sintético y los "about" de sus autores, como hace el `Scraper`.
+
+    Returns:
+        Tuple[List[tuple], dict]: Entradas (texto, autor, etiquetas, about_url) y detalles por about_url.
+    """
+    from extractors import get_extractor
+    from parse_pool import page_record
+
+    extractor = get_extractor(parser)
+    entries = []
+    for page in range(1, pages + 1):
+        entries.extend(page_record(extractor, site.page_html(page)).entries)
+    slugs = {author_slug(index): index for index in range(site.authors)}
+    details = {}
+    for entry in entries:
+        about_url = entry[3]
+        if about_url not in details:
+            details[about_url] = extractor.author_details(site.author_html(slugs[about_url.rstrip("/").split("/")[-1]]))
+    return entries, details
+
+def measure(cls, entries, details, per_quote_details):
+    """
+    Construye una cita por entrada y mide la memoria que ocupan con `tracemalloc`.
+
+    Args:
+        cls (type): Clase de la cita (`LegacyQuote` o `Quote`).
+        entries (List[tuple]): Entradas extraídas de las páginas.
+        details (dict): Detalles del autor por about_url.
+        per_quote_details (bool): Si cada cita recibe su propia copia de los detalles (como al leerlos de
+            un JSON por cita) en lugar del mismo diccionario compartido de la caché de autores.
+
+    Returns:
+        dict: Bytes totales y bytes por cita.
+    """
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    quotes = []
+    for text, author, tags, about_url in entries:
+        about = details[about_url]
+        if per_quote_details:
+            about = json.loads(json.dumps(about))
+        quotes.append(cls(text, author, about.get("author_birthdate"), tags,
+                          about.get("author_birthplace"), about.get("author_description")))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del quotes
+    return {"bytes": used, "bytes_per_quote": round(used / len(entries), 1)}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de la representación de las citas en memoria.")
+    parser.add_argument("--pages", type=int, default=1000, help="Páginas sintéticas del listado.")
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50, help="Autores distintos.")
+    parser.add_argument("--parser", default="bs4", help="Motor de análisis HTML.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from quote import Quote
+
+    site = StandInSite(pages=args.pages, quotes_per_page=args.quotes_per_page, authors=args.authors)
+    entries, details = build_inputs(site, args.parser, args.pages)
+
+    results = {}
+    for scenario, per_quote in (("shared_details", False), ("per_quote_details", True)):
+        before = measure(LegacyQuote, entries, details, per_quote)
+        after = measure(Quote, entries, details, per_quote)
+        results[scenario] = {
+            "before": before,
+            "after": after,
+            "reduction": round(1 - after["bytes"] / before["bytes"], 3) if before["bytes"] else None,
+        }
+
+    result = {
+        "benchmark": "memory",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "config": {"pages": args.pages, "quotes_per_page": args.quotes_per_page, "authors": args.authors,
+                   "quotes": len(entries), "parser": args.parser},
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
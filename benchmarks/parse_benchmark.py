@@ -0,0 +1,88 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import json
+import platform
+import time
+
+from stand_in_server import StandInSite
+
+async def measure(html_pages, parser, workers, batch_size):
+    """
+    Analiza todas las páginas con un `ParsePool` y mide el rendimiento.
+
+    Returns:
+        dict: Trabajadores, segundos y páginas/s.
+    """
+    from extractors import get_extractor
+    from parse_pool import ParsePool
+
+    pool = ParsePool(get_extractor(parser), workers=workers, batch_size=batch_size)
+    try:
+        if workers:
+            await asyncio.gather(*(pool.page(html) for html in html_pages[:workers * batch_size]))  # Arranque del pool
+        start = time.perf_counter()
+        records = await asyncio.gather(*(pool.page(html) for html in html_pages))
+        seconds = time.perf_counter() - start
+    finally:
+        pool.close()
+    quotes = sum(len(record.entries) for record in records)
+    return {
+        "workers": workers,
+        "seconds": round(seconds, 4),
+        "pages_per_second": round(len(html_pages) / seconds, 2),
+        "quotes": quotes,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del análisis HTML en el pool de procesos (ParsePool).")
+    parser.add_argument("--pages", type=int, default=2000, help="Páginas sintéticas a analizar.")
+    parser.add_argument("--parser", default="bs4", help="Motor de análisis HTML.")
+    parser.add_argument("--workers", default=None,
+                        help="Lista de trabajadores a probar separados por comas (por defecto 0,1,2,4,... hasta los núcleos).")
+    parser.add_argument("--batch-size", type=int, default=None, help="Páginas por lote (por defecto PARSE_BATCH_SIZE).")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    from src.utils.constants import PARSE_BATCH_SIZE
+    batch_size = args.batch_size or PARSE_BATCH_SIZE
+    cores = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",")]
+    else:
+        counts = [0] + [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    site = StandInSite(pages=args.pages)
+    html_pages = [site.page_html(page) for page in range(1, args.pages + 1)]
+
+    runs = [asyncio.run(measure(html_pages, args.parser, workers, batch_size)) for workers in counts]
+    baseline = next((run for run in runs if run["workers"] == 1), runs[0])
+    for run in runs:
+        run["speedup_vs_1"] = round(run["pages_per_second"] / baseline["pages_per_second"], 2)
+
+    result = {
+        "benchmark": "parse",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cores": cores,
+        "config": {"pages": args.pages, "parser": args.parser, "batch_size": batch_size},
+        "results": runs,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
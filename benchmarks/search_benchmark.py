@@ -0,0 +1,254 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import time
+
+from crawl_benchmark import percentile
+from stand_in_server import _word
+
+# Vocabulario de las citas sintéticas (sin palabras vacías), de más a menos frecuente (distribución de Zipf)
+VOCABULARY = (
+    "life love world people time heart truth mind friend dream hope live soul thing man woman god happy "
+    "book day nothing never always change fear beauty light night death laugh smile reason words kind wise "
+    "believe learn forget remember music art war peace freedom power money success failure courage silence "
+    "faith memory child young old trust lie begin end journey road star sky sea fire rain wind tree flower "
+    "river mountain garden house door window voice story poem letter secret question answer choice chance "
+    "moment morning evening summer winter spring autumn color shadow mirror stranger enemy hero king fool "
+    "angel devil heaven hell madness wonder magic miracle passion desire pain sorrow joy anger pride honor"
+).split()
+
+# Prefijos que identifican las filas sintéticas (para completarlas en otra ejecución o borrarlas con --cleanup)
+HASH_PREFIX = "bench:"
+AUTHOR_PREFIX = "Bench Author "
+TAG_PREFIX = "Bench-"  # Con el formato de las etiquetas guardadas (`extractors.clean_tag`)
+
+def synthetic_quotes(start, count, authors, seed):
+    """
+    Genera las citas sintéticas número `start` a `start + count - 1`.
+
+    Cada cita tiene entre 8 y 14 palabras del vocabulario (las primeras son mucho más frecuentes) y una
+    palabra rara generada a partir de su número, de modo que hay términos de todas las frecuencias.
+
+    Yields:
+        tuple: (texto, content_hash, índice del autor).
+    """
+    rng = random.Random(seed * 1_000_003 + start)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+    for number in range(start, start + count):
+        words = rng.choices(VOCABULARY, cum_weights=cum_weights, k=rng.randint(8, 14))
+        words.insert(rng.randrange(len(words)), _word(number % 4096, 3).lower())
+        yield " ".join(words).capitalize() + ".", f"{HASH_PREFIX}{number}", number % authors
+
+async def populate(engine, schema, quotes, authors, tags, seed, chunk_size=100_000):
+    """
+    Completa la base de datos hasta tener `quotes` citas sintéticas (con sus autores y etiquetas).
+
+    Las citas se cargan con COPY en trozos de `chunk_size` (una transacción por trozo, de modo que los
+    triggers de `quote_details` se ejecutan una vez por trozo) y cada una recibe de 1 a 3 etiquetas
+    con una distribución muy desigual (hay etiquetas frecuentes y raras).
+
+    Returns:
+        dict: Citas que ya existían, citas cargadas y segundos de la carga.
+    """
+    from sqlalchemy import text
+
+    start = time.perf_counter()
+    async with engine.begin() as conn:
+        existing = (await conn.execute(
+            text(f"SELECT count(*) FROM {schema}.quotes WHERE content_hash LIKE :prefix"), {"prefix": HASH_PREFIX + "%"}
+        )).scalar()
+        await conn.execute(text(
+            f"INSERT INTO {schema}.author (name) SELECT :prefix || n FROM generate_series(0, :authors - 1) n "
+            f"ON CONFLICT (name) DO NOTHING"), {"prefix": AUTHOR_PREFIX, "authors": authors})
+        await conn.execute(text(
+            f"INSERT INTO {schema}.tags (tag) SELECT :prefix || n FROM generate_series(0, :tags - 1) n "
+            f"ON CONFLICT (tag) DO NOTHING"), {"prefix": TAG_PREFIX, "tags": tags})
+        author_ids = dict((await conn.execute(
+            text(f"SELECT name, id FROM {schema}.author WHERE name LIKE :prefix"), {"prefix": AUTHOR_PREFIX + "%"}
+        )).all())
+    author_ids = [author_ids[f"{AUTHOR_PREFIX}{n}"] for n in range(authors)]
+
+    for chunk_start in range(existing, quotes, chunk_size):
+        count = min(chunk_size, quotes - chunk_start)
+        records = [(text_, hash_, author_ids[author]) for text_, hash_, author in
+                   synthetic_quotes(chunk_start, count, authors, seed)]
+        async with engine.begin() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.copy_records_to_table("quotes", schema_name=schema, records=records,
+                                            columns=("quote", "content_hash", "author_id"))
+            # Etiqueta k-ésima de cada cita: hash de (id, k) elevado al cubo, para que unas pocas sean muy frecuentes
+            await conn.execute(text(f"""
+                INSERT INTO {schema}.quote_tags (quote_id, tag_id)
+                SELECT DISTINCT q.id, t.id
+                FROM {schema}.quotes q
+                CROSS JOIN generate_series(0, 2) k
+                JOIN {schema}.tags t ON t.tag = :prefix || floor(
+                    :tags * power((hashint4(q.id * 3 + k) & 2147483647)::float / 2147483648, 3))::int
+                WHERE q.content_hash = ANY(:hashes) AND k <= q.id % 3
+                ON CONFLICT (quote_id, tag_id) DO NOTHING"""),
+                {"prefix": TAG_PREFIX, "tags": tags, "hashes": [record[1] for record in records]})
+        print(f"Cargadas {chunk_start + count}/{quotes} citas sintéticas", file=sys.stderr)
+
+    if existing < quotes:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            for table in ("quotes", "quote_tags", "quote_details", "author", "tags"):
+                await conn.execute(text(f"VACUUM ANALYZE {schema}.{table}"))
+    return {"existing": existing, "loaded": max(0, quotes - existing),
+            "seconds": round(time.perf_counter() - start, 2)}
+
+async def cleanup(engine, schema):
+    """Borra las citas, autores y etiquetas sintéticas."""
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            f"DELETE FROM {schema}.quote_tags qt USING {schema}.quotes q "
+            f"WHERE qt.quote_id = q.id AND q.content_hash LIKE :prefix"), {"prefix": HASH_PREFIX + "%"})
+        await conn.execute(text(f"DELETE FROM {schema}.quotes WHERE content_hash LIKE :prefix"),
+                           {"prefix": HASH_PREFIX + "%"})
+        await conn.execute(text(f"DELETE FROM {schema}.author WHERE name LIKE :prefix"), {"prefix": AUTHOR_PREFIX + "%"})
+        await conn.execute(text(f"DELETE FROM {schema}.tags WHERE tag LIKE :prefix"), {"prefix": TAG_PREFIX + "%"})
+
+def scenarios(authors, tags):
+    """Búsquedas que se miden: (nombre, argumentos de `QuoteSearch.search`)."""
+    common, frequent, rare = VOCABULARY[0], VOCABULARY[5], _word(1234, 3).lower()
+    return [
+        ("text_common", {"text": common}),
+        ("text_rare", {"text": rare}),
+        ("text_two_words", {"text": f"{frequent} {VOCABULARY[40]}"}),
+        ("text_phrase", {"text": f'"{common} {frequent}"'}),
+        ("text_exclude", {"text": f"{VOCABULARY[20]} -{common}"}),
+        ("tag_common", {"tags": f"{TAG_PREFIX}0"}),
+        ("tag_rare", {"tags": f"{TAG_PREFIX}{tags - 1}"}),
+        ("author", {"author": f"{AUTHOR_PREFIX}{authors // 2}"}),
+        ("text_and_tag", {"text": VOCABULARY[10], "tags": f"{TAG_PREFIX}1"}),
+        ("text_and_author", {"text": VOCABULARY[10], "author": f"{AUTHOR_PREFIX}{authors // 2}"}),
+        ("tag_and_author", {"tags": f"{TAG_PREFIX}0", "author": f"{AUTHOR_PREFIX}7"}),
+    ]
+
+async def timed(repeat, call):
+    """Ejecuta `call` una vez para calentar y `repeat` veces midiendo; devuelve (tiempos, último resultado)."""
+    result = await call()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await call()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+def summarize(times):
+    """Latencias en milisegundos."""
+    return {
+        "p50_ms": round(percentile(times, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(times, 0.95) * 1000, 3),
+        "mean_ms": round(sum(times) / len(times) * 1000, 3),
+    }
+
+async def run(args):
+    """
+    Carga los datos sintéticos (si faltan) y mide cada búsqueda: primera página, una página profunda
+    por cursor y, como referencia, las mismas consultas con `ILIKE` y con `OFFSET`.
+
+    Returns:
+        dict: Carga y latencias por escenario.
+    """
+    from sqlalchemy import text
+    from database import engine, SessionLocal, db_schema
+    from search import QuoteSearch
+
+    schema = db_schema
+    try:
+        if args.cleanup_only:
+            await cleanup(engine, schema)
+            return {"cleanup": True}
+        load = await populate(engine, schema, args.quotes, args.authors, args.tags, args.seed)
+        finder = QuoteSearch()
+        results = {}
+        async with SessionLocal() as session:
+            total = (await session.execute(text(f"SELECT count(*) FROM {schema}.quotes"))).scalar()
+            for name, kwargs in scenarios(args.authors, args.tags):
+                first_times, first = await timed(args.repeat, lambda: finder.search(limit=args.limit, session=session, **kwargs))
+                entry = {"first_page": summarize(first_times), "hits": len(first.hits)}
+
+                # Página profunda: cursor tras `deep` resultados (si la búsqueda tiene tantos)
+                after, seen = None, 0
+                while seen < args.deep:
+                    page = await finder.search(limit=min(1000, args.deep - seen), after=after, session=session, **kwargs)
+                    seen += len(page.hits)
+                    after = page.next_cursor
+                    if after is None:
+                        break
+                if after is not None:
+                    deep_times, _ = await timed(args.repeat, lambda: finder.search(limit=args.limit, after=after, session=session, **kwargs))
+                    entry["deep_page"] = {"offset": seen, **summarize(deep_times)}
+                    if args.baseline:
+                        # Referencia: la misma página con OFFSET (recorre y descarta las `seen` filas anteriores)
+                        statement = finder._statement(kwargs.get("text"), *(await finder._resolve_filters(
+                            session, finder._tags(kwargs.get("tags")), kwargs.get("author"))), None, args.limit)
+                        statement = statement.offset(seen)
+                        offset_times, _ = await timed(args.repeat, lambda: session.execute(statement))
+                        entry["deep_page_offset"] = summarize(offset_times)
+
+                if args.baseline and kwargs.get("text") and len(kwargs) == 1 and " " not in kwargs["text"]:
+                    # Referencia: búsqueda de la palabra con ILIKE (sin índice)
+                    like = text(f"SELECT id FROM {schema}.quotes WHERE quote ILIKE :pattern ORDER BY id LIMIT :limit")
+                    like_times, _ = await timed(max(1, args.repeat // 4), lambda: session.execute(
+                        like, {"pattern": f"%{kwargs['text']}%", "limit": args.limit + 1}))
+                    entry["first_page_ilike"] = summarize(like_times)
+                results[name] = entry
+                print(f"{name}: {entry['first_page']['p50_ms']} ms", file=sys.stderr)
+        if args.cleanup:
+            await cleanup(engine, schema)
+        return {"quotes_in_table": total, "load": load, "scenarios": results}
+    finally:
+        await engine.dispose()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la búsqueda de citas (texto completo, etiquetas, autor y paginación por cursor). "
+                    "Carga citas sintéticas en la base de datos configurada (DB_*): úsese una base de datos de pruebas."
+    )
+    parser.add_argument("--quotes", type=int, default=1_000_000, help="Citas sintéticas que debe haber en la tabla.")
+    parser.add_argument("--authors", type=int, default=1000, help="Autores sintéticos.")
+    parser.add_argument("--tags", type=int, default=200, help="Etiquetas sintéticas.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=20, help="Resultados por página.")
+    parser.add_argument("--deep", type=int, default=10_000, help="Posición de la página profunda.")
+    parser.add_argument("--repeat", type=int, default=20, help="Repeticiones medidas de cada consulta.")
+    parser.add_argument("--no-baseline", dest="baseline", action="store_false",
+                        help="No medir las consultas de referencia (ILIKE y OFFSET).")
+    parser.add_argument("--cleanup", action="store_true", help="Borrar los datos sintéticos al terminar.")
+    parser.add_argument("--cleanup-only", action="store_true", help="Solo borrar los datos sintéticos.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    result = {
+        "benchmark": "search",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "config": {"quotes": args.quotes, "authors": args.authors, "tags": args.tags, "limit": args.limit,
+                   "deep": args.deep, "repeat": args.repeat},
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
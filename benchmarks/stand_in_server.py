@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import random
+from aiohttp import web
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "su", "no", "vi", "del", "mar", "ton", "sel", "bri", "quen", "dor", "lia"]
+TAGS = ["love", "life", "inspirational", "humor", "philosophy", "truth", "friendship", "books", "hope", "science"]
+
+def _word(n, length=2):
+    """Genera una palabra (solo letras) a partir de un número, para que `Quote.clean_author` no la altere."""
+    parts = []
+    for _ in range(length):
+        n, rest = divmod(n, len(SYLLABLES))
+        parts.append(SYLLABLES[rest])
+    return "".join(parts).capitalize()
+
+def author_name(index):
+    """Nombre sintético del autor número `index`."""
+    return f"{_word(index)} {_word(index * 7 + 3, 3)}"
+
+def author_slug(index):
+    """Identificador del autor en la URL, con el mismo formato que quotes.toscrape.com."""
+    return author_name(index).replace(" ", "-")
+
+class StandInSite:
+    """
+    Sitio sintético con el mismo marcado que quotes.toscrape.com: páginas del listado
+    (`/page/<n>/`) y páginas "about" de cada autor (`/author/<nombre>`).
+
+    El contenido es determinista (depende solo de los parámetros), de modo que dos ejecuciones
+    con la misma configuración son comparables.
+
+    Atributos:
+        pages (int): Número de páginas con citas; las siguientes devuelven "No quotes found!".
+        quotes_per_page (int): Citas por página.
+        authors (int): Número de autores distintos.
+        latency (float): Latencia base de cada respuesta (segundos).
+        jitter (float): Variación máxima (± segundos) que se suma a la latencia.
+        error_rate (float): Fracción de peticiones que responden 503 (fallo transitorio).
+        retry_after (int | None): Valor de la cabecera `Retry-After` de las respuestas 503.
+        counters (dict): Peticiones servidas por tipo ("pages", "authors", "not_found", "errors").
+    """
+
+    def __init__(self, pages=100, quotes_per_page=10, authors=50, latency=0.0, jitter=0.0, seed=0,
+                 error_rate=0.0, retry_after=None):
+        self.pages = pages
+        self.quotes_per_page = quotes_per_page
+        self.authors = max(1, authors)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.counters = {"pages": 0, "authors": 0, "not_found": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._slugs = {author_slug(i): i for i in range(self.authors)}
+
+    async def _delay(self):
+        """Simula la latencia de red."""
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _quote(self, page, position):
+        """Marcado de una cita del listado."""
+        number = (page - 1) * self.quotes_per_page + position
+        author = number % self.authors
+        tags = "".join(
+            f'<a class="tag" href="/tag/{tag}/page/1/">{tag}</a>'
+            for tag in (TAGS[(number + k) % len(TAGS)] for k in range(1 + number % 3))
+        )
+        return (
+            '<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">'
+            f'<span class="text" itemprop="text">“Synthetic quote number {number} about {_word(number, 3)}.”</span>'
+            f'<span>by <small class="author" itemprop="author">{author_name(author)}</small>'
+            f' <a href="/author/{author_slug(author)}">(about)</a></span>'
+            f'<div class="tags">Tags: {tags}</div></div>'
+        )
+
+    def page_html(self, page):
+        """HTML de una página del listado."""
+        if page < 1 or page > self.pages:
+            body = "No quotes found!"
+        else:
+            quotes = "".join(self._quote(page, i) for i in range(self.quotes_per_page))
+            pager = f'<li class="next"><a href="/page/{page + 1}/">Next <span aria-hidden="true">&rarr;</span></a></li>' \
+                if page < self.pages else ""
+            body = f'{quotes}<nav><ul class="pager">{pager}</ul></nav>'
+        return (
+            '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Quotes to Scrape</title></head>'
+            '<body><div class="container"><div class="row header-box"><div class="col-md-8">'
+            '<h1><a href="/" style="text-decoration: none">Quotes to Scrape</a></h1></div></div>'
+            f'<div class="row"><div class="col-md-8">{body}</div></div></div></body></html>'
+        )
+
+    def author_html(self, index):
+        """HTML de la página "about" de un autor."""
+        rnd = random.Random(index)
+        born = f"{MONTHS[rnd.randrange(12)]} {rnd.randint(1, 28):02d}, {rnd.randint(1500, 1990)}"
+        return (
+            '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8"><title>Quotes to Scrape</title></head>'
+            '<body><div class="container"><div class="author-details">'
+            f'<h3 class="author-title">{author_name(index)}</h3>'
+            f'<p><strong>Born:</strong> <span class="author-born-date">{born}</span> '
+            f'<span class="author-born-location">in {_word(index, 2)}, {_word(index + 11, 2)}</span></p>'
+            f'<strong>Description:</strong><div class="author-description">'
+            f'{author_name(index)} is a synthetic author generated for benchmarks. {_word(index, 4)}</div>'
+            '</div></div></body></html>'
+        )
+
+    async def handle(self, request):
+        """Atiende cualquier ruta (las URL "about" del `Scraper` llevan doble barra)."""
+        await self._delay()
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.counters["errors"] += 1
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else None
+            raise web.HTTPServiceUnavailable(headers=headers)
+        parts = [part for part in request.path.split("/") if part]
+        if len(parts) == 2 and parts[0] == "page" and parts[1].isdigit():
+            self.counters["pages"] += 1
+            return web.Response(text=self.page_html(int(parts[1])), content_type="text/html")
+        if len(parts) == 2 and parts[0] == "author" and parts[1] in self._slugs:
+            self.counters["authors"] += 1
+            return web.Response(text=self.author_html(self._slugs[parts[1]]), content_type="text/html")
+        self.counters["not_found"] += 1
+        raise web.HTTPNotFound()
+
+    async def handle_stats(self, request):
+        """Devuelve los contadores del servidor en JSON."""
+        return web.json_response(self.counters)
+
+    def app(self):
+        """Crea la aplicación aiohttp."""
+        app = web.Application()
+        app.router.add_get("/__stats__", self.handle_stats)
+        app.router.add_get("/{tail:.*}", self.handle)
+        return app
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita quotes.toscrape.com para los benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=100, help="Páginas con citas.")
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50, help="Autores distintos.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia base por respuesta (ms).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Variación máxima de la latencia (± ms).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de respuestas 503 (0-1).")
+    parser.add_argument("--retry-after", type=int, default=None, help="Cabecera Retry-After (s) de las respuestas 503.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    site = StandInSite(args.pages, args.quotes_per_page, args.authors, args.latency / 1000, args.jitter / 1000, args.seed,
+                       args.error_rate, args.retry_after)
+    print(f"Sirviendo {args.pages} páginas en http://{args.host}:{args.port}/", flush=True)
+    web.run_app(site.app(), host=args.host, port=args.port, print=None, access_log=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+MAIN = os.path.join(ROOT, "src", "main.py")
+
+# Comandos medidos: nombre -> argumentos de main.py (None = intérprete vacío, la referencia)
+COMMANDS = {
+    "python": None,
+    "--help": ["--help"],
+    "crawl --help": ["crawl", "--help"],
+    "search --help": ["search", "--help"],
+    "export --help": ["export", "--help"],
+    "worker --help": ["worker", "--help"],
+    "bench --help": ["bench", "--help"],
+}
+
+# Importaciones medidas por separado: lo que paga cada subcomando al ejecutarse
+IMPORTS = ["database", "search", "exporter", "work_queue", "scraper"]
+
+def command_line(arguments):
+    """Línea de comandos de una medida (el intérprete vacío si `arguments` es None)."""
+    if arguments is None:
+        return [sys.executable, "-c", "pass"]
+    return [sys.executable, MAIN, *arguments]
+
+def import_line(module):
+    """Línea de comandos que solo importa un módulo de src/."""
+    return [sys.executable, "-c", f"import sys; sys.path[:0] = [{ROOT!r}, {os.path.join(ROOT, 'src')!r}]; import {module}"]
+
+def measure(command, repeat, env):
+    """
+    Ejecuta `command` `repeat` veces (más una de calentamiento) y mide el tiempo de cada ejecución.
+
+    Returns:
+        dict: Mediana, p95 y mínimo en milisegundos.
+    """
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env)
+        times.append((time.perf_counter() - start) * 1000)
+        if result.returncode:
+            raise RuntimeError(f"{' '.join(command)} ha terminado con el código {result.returncode}: "
+                               f"{result.stderr.decode(errors='replace')[-500:]}")
+    times.sort()
+    return {"median_ms": round(statistics.median(times), 1),
+            "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 1),
+            "min_ms": round(times[0], 1)}
+
+def slowest_imports(arguments, top, env):
+    """
+    Módulos que más tardan en importarse al ejecutar main.py con `arguments` (según `-X importtime`).
+
+    Returns:
+        List[dict]: Los `top` módulos con más tiempo acumulado, de mayor a menor.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", MAIN, *arguments], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, env=env)
+    modules = []
+    for line in result.stderr.decode(errors="replace").splitlines():
+        # "import time: <propio µs> | <acumulado µs> | <sangría><módulo>"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):  # Solo las importaciones de primer nivel
+            modules.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+    return sorted(modules, key=lambda module: module["cumulative_ms"], reverse=True)[:top]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark del arranque de la línea de comandos: tiempo de `main.py --help`, de la ayuda de "
+                    "cada subcomando y de las importaciones que paga cada subcomando, en procesos nuevos."
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Ejecuciones medidas de cada comando.")
+    parser.add_argument("--top", type=int, default=10, help="Importaciones más lentas de `--help` que se muestran.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = dict(os.environ)
+    commands = {}
+    for name, arguments in COMMANDS.items():
+        commands[name] = measure(command_line(arguments), args.repeat, env)
+        print(f"{name}: {commands[name]['median_ms']} ms", file=sys.stderr)
+    imports = {}
+    for module in IMPORTS:
+        imports[module] = measure(import_line(module), max(3, args.repeat // 4), env)
+        print(f"import {module}: {imports[module]['median_ms']} ms", file=sys.stderr)
+    result = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"repeat": args.repeat},
+        "commands": commands,
+        "imports": imports,
+        "slowest_imports_help": slowest_imports(["--help"], args.top, env),
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import json
+import platform
+import signal
+import subprocess
+import time
+
+from crawl_benchmark import stand_in_server
+from stand_in_server import author_name
+
+async def wait_until(check, timeout, interval=0.1):
+    """Espera hasta que la corrutina `check` devuelva True (o se agote `timeout`)."""
+    deadline = time.monotonic() + timeout
+    while not await check():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Tiempo de espera agotado")
+        await asyncio.sleep(interval)
+
+async def clear_data(session_factory, authors):
+    """Borra las citas y los autores del sitio sintético, para que cada ronda escriba lo mismo."""
+    from sqlalchemy import delete
+    from sqlalchemy.future import select
+    from models import Author, Quote as DBQuote, QuoteTag
+    from quote import Quote
+
+    names = [Quote.clean_author(author_name(index)) for index in range(authors)]
+    async with session_factory() as session:
+        author_ids = select(Author.id).where(Author.name.in_(names)).scalar_subquery()
+        quote_ids = select(DBQuote.id).where(DBQuote.author_id.in_(author_ids)).scalar_subquery()
+        await session.execute(delete(QuoteTag).where(QuoteTag.quote_id.in_(quote_ids)))
+        await session.execute(delete(DBQuote).where(DBQuote.author_id.in_(author_ids)))
+        await session.execute(delete(Author).where(Author.name.in_(names)))
+        await session.commit()
+
+async def run_round(url, workers, args):
+    """
+    Arranca `workers` procesos trabajadores, siembra la cola cuando están todos registrados y mide el
+    tiempo hasta que la vacían.
+
+    Returns:
+        dict: Trabajos, segundos y trabajos/s de la ronda.
+    """
+    from sqlalchemy import func, delete
+    from sqlalchemy.future import select
+    from database import SessionLocal
+    from models import CrawlJob, CrawlWorkerRecord
+    from work_queue import WorkQueue
+    from crawl_worker import page_job
+
+    queue = WorkQueue()
+    await queue.seed([], reset=True)
+    async with SessionLocal() as session:
+        await session.execute(delete(CrawlWorkerRecord))
+        await session.commit()
+    await clear_data(SessionLocal, args.authors)
+
+    env = dict(os.environ, URL_BASE=url, RATE_LIMIT_PER_HOST=str(args.rate), METRICS_PORT="0",
+               METRICS_SUMMARY_PATH=os.devnull)
+    command = [sys.executable, os.path.join(ROOT, "src", "main.py"), "worker", "--forever",
+               "--concurrency", str(args.concurrency)]
+    processes = [subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                 for _ in range(workers)]
+    try:
+        async def registered():
+            async with SessionLocal() as session:
+                return (await session.execute(select(func.count()).select_from(CrawlWorkerRecord))).scalar() >= workers
+        await wait_until(registered, timeout=60)
+
+        start = time.perf_counter()
+        await queue.seed([page_job(page) for page in range(1, args.pages + 1)])
+
+        async def drained():
+            async with SessionLocal() as session:
+                return not await queue.remaining(session)
+        await wait_until(drained, timeout=args.timeout, interval=0.05)
+        seconds = time.perf_counter() - start
+        async with SessionLocal() as session:
+            jobs = (await session.execute(select(func.count()).select_from(CrawlJob).where(CrawlJob.status == "done"))).scalar()
+            failed = (await session.execute(select(func.count()).select_from(CrawlJob).where(CrawlJob.status == "failed"))).scalar()
+    finally:
+        for process in processes:
+            process.send_signal(signal.SIGINT)  # Los trabajadores liberan sus trabajos y se dan de baja
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return {"workers": workers, "jobs": jobs, "failed": failed, "seconds": round(seconds, 3),
+            "jobs_per_second": round(jobs / seconds, 2)}
+
+async def run(url, args):
+    from database import engine
+
+    rounds = []
+    try:
+        for workers in args.workers:
+            result = await run_round(url, workers, args)
+            if rounds:
+                result["speedup"] = round(result["jobs_per_second"] / rounds[0]["jobs_per_second"], 2)
+            rounds.append(result)
+            print(f"{workers} trabajadores: {result['jobs_per_second']} trabajos/s", file=sys.stderr)
+    finally:
+        await engine.dispose()
+    return rounds
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de escalado del crawl distribuido: trabajos/s con 1, 2, 4… procesos trabajadores "
+                    "contra el servidor sustituto. Usa la base de datos configurada (DB_*) y vacía su cola de trabajos."
+    )
+    parser.add_argument("--workers", default="1,2,4", help="Número de trabajadores de cada ronda, separados por comas.")
+    parser.add_argument("--concurrency", type=int, default=2, help="Trabajos en curso por trabajador.")
+    parser.add_argument("--pages", type=int, default=200, help="Páginas con citas del servidor sustituto (todas se siembran).")
+    parser.add_argument("--quotes-per-page", type=int, default=10)
+    parser.add_argument("--authors", type=int, default=50, help="Autores distintos.")
+    parser.add_argument("--latency", type=float, default=100.0, help="Latencia base por respuesta (ms).")
+    parser.add_argument("--jitter", type=float, default=10.0, help="Variación máxima de la latencia (± ms).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate", type=float, default=0.0, help="Peticiones/s por host de cada trabajador (0 = sin límite).")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Segundos máximos por ronda.")
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    args = parser.parse_args(argv)
+    args.workers = [int(value) for value in args.workers.split(",") if value.strip()]
+    args.error_rate, args.retry_after = 0.0, None  # Opciones del servidor sustituto que no se usan aquí
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    with stand_in_server(args) as url:
+        rounds = asyncio.run(run(url, args))
+    result = {
+        "benchmark": "workers",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"pages": args.pages, "quotes_per_page": args.quotes_per_page, "authors": args.authors,
+                   "latency_ms": args.latency, "jitter_ms": args.jitter, "concurrency": args.concurrency,
+                   "rate": args.rate},
+        "results": rounds,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
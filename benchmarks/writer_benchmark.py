@@ -0,0 +1,165 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+
+from stand_in_server import _word
+
+# Prefijos que identifican las filas sintéticas (para borrarlas entre rondas y al terminar)
+AUTHOR_PREFIX = "Writerbench "
+TAG_PREFIX = "writer-bench-"
+PLACE_PREFIX = "Writerbench "
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October",
+          "November", "December"]
+
+def synthetic_quotes(count, authors, tags, seed, dirty=0.0):
+    """
+    Genera `count` citas sintéticas repartidas entre `authors` autores, con 1 a 3 de `tags` etiquetas.
+
+    Los nombres de autor son solo letras para que `Quote.clean_author` no los altere. Una fracción `dirty`
+    de las citas lleva un carácter NUL en el texto, que PostgreSQL rechaza: van a dead letters.
+
+    Returns:
+        List[Quote]: Las citas.
+    """
+    from quote import Quote
+
+    rng = random.Random(seed)
+    people = [(f"{AUTHOR_PREFIX}{_word(n, 3)}", f"{MONTHS[n % 12]} {n % 28 + 1}, {1800 + n % 200}",
+               f"{PLACE_PREFIX}{_word(n % 50)}") for n in range(authors)]
+    quotes = []
+    for number in range(count):
+        name, birthdate, birthplace = people[rng.randrange(authors)]
+        tag_list = [f"{TAG_PREFIX}{rng.randrange(tags)}" for _ in range(rng.randint(1, 3))]
+        text = f"Writer benchmark quote {seed}-{number}." + ("\x00" if rng.random() < dirty else "")
+        quotes.append(Quote(text, name, birthdate, tag_list, birthplace,
+                            "Autor sintético del benchmark de escritura."))
+    return quotes
+
+async def cleanup(engine, schema):
+    """Borra las citas, autores, etiquetas, lugares y dead letters sintéticos."""
+    from sqlalchemy import text
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            f"DELETE FROM {schema}.quote_tags qt USING {schema}.quotes q, {schema}.author a "
+            f"WHERE qt.quote_id = q.id AND q.author_id = a.id AND a.name LIKE :prefix"), {"prefix": AUTHOR_PREFIX + "%"})
+        await conn.execute(text(
+            f"DELETE FROM {schema}.quotes q USING {schema}.author a WHERE q.author_id = a.id AND a.name LIKE :prefix"),
+            {"prefix": AUTHOR_PREFIX + "%"})
+        await conn.execute(text(f"DELETE FROM {schema}.author WHERE name LIKE :prefix"), {"prefix": AUTHOR_PREFIX + "%"})
+        await conn.execute(text(f"DELETE FROM {schema}.dead_letters WHERE payload LIKE :pattern"),
+                           {"pattern": f'%"author": "{AUTHOR_PREFIX}%'})
+        await conn.execute(text(f"DELETE FROM {schema}.tags WHERE tag LIKE :prefix"), {"prefix": TAG_PREFIX + "%"})
+        await conn.execute(text(
+            f"DELETE FROM {schema}.birthplace p WHERE p.birthplace LIKE :prefix AND NOT EXISTS "
+            f"(SELECT 1 FROM {schema}.author a WHERE a.birthplace_id = p.id)"), {"prefix": PLACE_PREFIX + "%"})
+
+async def measure(args, writers):
+    """
+    Guarda las citas sintéticas con `writers` sesiones en paralelo (0 = cita a cita con `Quote.save`).
+    Las citas que fallan van a dead letters.
+
+    Returns:
+        dict: Citas guardadas y en dead letters, segundos y citas procesadas por segundo.
+    """
+    from database import SessionLocal
+    from dimension_cache import DimensionCache
+    from dead_letters import DeadLetterStore
+    from parallel_writer import ParallelWriter
+
+    quotes = synthetic_quotes(args.quotes if writers else args.orm_quotes, args.authors, args.tags, args.seed, args.dirty)
+    cache = DimensionCache()
+    dead_letters = DeadLetterStore()
+    async with SessionLocal() as session:
+        await cache.warm(session)
+        start = time.perf_counter()
+        if writers:
+            saved = await ParallelWriter(writers=writers, batch_size=args.batch_size, cache=cache,
+                                         dead_letters=dead_letters).save(session, quotes)
+        else:
+            # Referencia: una transacción por cita (el modo "orm")
+            for quote in quotes:
+                await quote.save(session, cache)
+            saved = len(quotes)
+    seconds = time.perf_counter() - start
+    return {"quotes": saved, "dead_letters": dead_letters.failed, "seconds": round(seconds, 3),
+            "quotes_per_second": round(len(quotes) / seconds, 1)}
+
+async def run(args):
+    """
+    Mide la escritura de las mismas citas con cada número de escritores, borrando los datos entre rondas.
+
+    Returns:
+        dict: Resultado de cada ronda y aceleración respecto a un solo escritor.
+    """
+    from database import get_engine, dispose_engine, db_schema
+
+    engine = get_engine()
+    results = {}
+    try:
+        await cleanup(engine, db_schema)
+        rounds = ([0] if args.orm_quotes else []) + args.writers
+        for writers in rounds:
+            name = f"writers_{writers}" if writers else "orm"
+            results[name] = await measure(args, writers)
+            print(f"{name}: {results[name]['quotes_per_second']} citas/s", file=sys.stderr)
+            await cleanup(engine, db_schema)
+    finally:
+        await dispose_engine()
+    base = results.get(f"writers_{args.writers[0]}")
+    for name, entry in results.items():
+        if base and name != "orm":
+            entry["speedup"] = round(entry["quotes_per_second"] / base["quotes_per_second"], 2)
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la escritura en paralelo (ParallelWriter): citas por segundo según el número de "
+                    "sesiones que escriben a la vez. Escribe en la base de datos configurada (DB_*) y borra sus filas "
+                    "sintéticas entre rondas: úsese una base de datos de pruebas."
+    )
+    parser.add_argument("--quotes", type=int, default=20_000, help="Citas sintéticas de cada ronda.")
+    parser.add_argument("--authors", type=int, default=500, help="Autores sintéticos.")
+    parser.add_argument("--tags", type=int, default=100, help="Etiquetas sintéticas.")
+    parser.add_argument("--writers", type=lambda value: [int(n) for n in value.split(",")], default=[1, 2, 4, 8],
+                        help="Números de escritores que se miden, separados por comas (el primero es la referencia).")
+    parser.add_argument("--batch-size", type=int, default=500, help="Citas por transacción.")
+    parser.add_argument("--orm-quotes", type=int, default=500,
+                        help="Citas de la ronda de referencia cita a cita (0 para no medirla).")
+    parser.add_argument("--dirty", type=float, default=0.0,
+                        help="Fracción de citas que fallan al guardarse (van a dead letters), p. ej. 0.01.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Fichero donde guardar el resultado en JSON.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    result = {
+        "benchmark": "writer",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {"quotes": args.quotes, "authors": args.authors, "tags": args.tags, "writers": args.writers,
+                   "batch_size": args.batch_size, "orm_quotes": args.orm_quotes, "dirty": args.dirty},
+        "results": results,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
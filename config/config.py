@@ -1,25 +1,30 @@
 import os
 from dotenv import main
 
-# Cargar las variables de entorno del archivo .env
-dotenv_path = os.path.join(os.path.dirname(__file__), '../.env')
-main.load_dotenv(dotenv_path)
+# Variables de entorno que se comprueban, con las que son secretas
+CONFIG_VARIABLES = ['DATABASE_URL', 'DB_HOST', 'DB_PORT', 'DB_NAME', 'SECRET_KEY', 'DB_USER', 'DB_PASS', 'DEBUG']
+SECRET_VARIABLES = {'DATABASE_URL', 'SECRET_KEY', 'DB_PASS'}
 
-# Acceder a las variables de entorno
-database_url = os.getenv('DATABASE_URL')
-db_host = os.getenv('DB_HOST')
-db_port = os.getenv('DB_PORT')
-db_name = os.getenv('DB_NAME')
-secret_key = os.getenv('SECRET_KEY')
-db_user = os.getenv('DB_USER')
-db_pass = os.getenv('DB_PASS')
-debug_mode = os.getenv('DEBUG')
+def load_config():
+    """
+    Carga las variables de entorno del archivo .env y devuelve la configuración de la aplicación.
 
-print(f"Database URL: {database_url}")
-print(f"Database Host: {db_host}")
-print(f"Database Port: {db_port}")
-print(f"Database Name: {db_name}")
-print(f"Secret Key: {secret_key}")
-print(f"User: {db_user}")
-print(f"Secret password: {db_pass}")
-print(f"Debug Mode: {debug_mode}")
+    Returns:
+        dict: Valor de cada variable de `CONFIG_VARIABLES` (None si no está definida).
+    """
+    dotenv_path = os.path.join(os.path.dirname(__file__), '../.env')
+    main.load_dotenv(dotenv_path)
+    return {name: os.getenv(name) for name in CONFIG_VARIABLES}
+
+def mask(value):
+    """Oculta un valor secreto, dejando ver solo si está definido."""
+    return "(no definido)" if not value else "********"
+
+def show_config(config):
+    """Muestra la configuración, con los valores secretos ocultos."""
+    for name, value in config.items():
+        print(f"{name}: {mask(value) if name in SECRET_VARIABLES else value}")
+
+# Comprobar la configuración solo al ejecutar el script (importarlo no lee ni muestra nada)
+if __name__ == "__main__":
+    show_config(load_config())
@@ -4,7 +4,6 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
-from dotenv import main
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy import text
@@ -12,15 +11,14 @@ from sqlalchemy.exc import OperationalError  # Para manejar errores de conexión
 from src.utils.constants import PASTEL_YELLOW, GREEN, PASTEL_PINK, RED_CIRCLE, RED, RESET  # Importa constantes de formato desde el módulo 'constants'.
 
 
-# Cargar variables de entorno desde el archivo .env
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-main.load_dotenv(dotenv_path)
-
 # Crear una base de datos declarativa
 Base = declarative_base()
 
 # Función para establecer la conexión a la base de datos
 async def connect_to_database():
+    # Cargar variables de entorno desde el archivo .env (al conectar, no al importar el módulo)
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
     try:
         db_type = os.getenv('DB_TYPE')
         db_host = 'localhost'
@@ -31,7 +29,9 @@ async def connect_to_database():
 
         # Construir la URL de conexión
         database_url = f"{db_type}://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-        print(f"\n{PASTEL_PINK}Conectando a: {PASTEL_YELLOW}{database_url}{RESET}\n")
+        # La contraseña no se muestra
+        shown_url = f"{db_type}://{db_user}:***@{db_host}:{db_port}/{db_name}"
+        print(f"\n{PASTEL_PINK}Conectando a: {PASTEL_YELLOW}{shown_url}{RESET}\n")
 
         # Crear el motor de base de datos asíncrono
         engine = create_async_engine(database_url, echo=True)
@@ -43,7 +43,7 @@ async def connect_to_database():
         async with async_session() as session:
             result = await session.execute(text("SELECT 1"))
             print(f"\n{result}\n")
-            print(f"{GREEN}\nConexión exitosa a: {PASTEL_YELLOW} {database_url}{RESET}\n")
+            print(f"{GREEN}\nConexión exitosa a: {PASTEL_YELLOW} {shown_url}{RESET}\n")
             return engine, async_session
 
     except OperationalError as e:
@@ -57,5 +57,6 @@ async def main():
     await connect_to_database()
 
 
-# Ejecutar el bucle de eventos de asyncio
-asyncio.run(main())
\ No newline at end of file
+# Ejecutar el bucle de eventos de asyncio solo al ejecutar el script (importarlo no conecta)
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,13 +29,21 @@ DROP TABLE IF EXISTS quotes.tags CASCADE;
 DROP TABLE IF EXISTS quotes.quote_tags CASCADE;
 DROP TABLE IF EXISTS quotes.birthdate CASCADE;
 DROP TABLE IF EXISTS quotes.birthplace CASCADE;
+DROP TABLE IF EXISTS quotes.quote_details CASCADE;
+DROP FUNCTION IF EXISTS quotes.sync_quote_details() CASCADE;
+DROP FUNCTION IF EXISTS quotes.refresh_quote_details(INTEGER[]) CASCADE;
+DROP FUNCTION IF EXISTS quotes.sync_quote_details_update() CASCADE;
+DROP TABLE IF EXISTS quotes.crawl_jobs CASCADE;
+DROP TABLE IF EXISTS quotes.crawl_workers CASCADE;
+DROP TABLE IF EXISTS quotes.export_state CASCADE;
+DROP TABLE IF EXISTS quotes.dead_letters CASCADE;
 
 -- -----------------------------  Crear las tablas  ----------------------------- --
 
 -- Crear la tabla de fechas de nacimiento
 CREATE TABLE quotes.birthdate (
     id SERIAL PRIMARY KEY,
-    birthdate DATE NOT NULL
+    birthdate DATE NOT NULL UNIQUE
 );
 
 -- Agregar comentarios a la tabla de fechas de nacimiento
@@ -45,7 +53,7 @@ COMMENT ON COLUMN quotes.birthdate.birthdate IS 'Fecha de nacimiento';
 -- Crear la tabla de lugares de nacimiento
 CREATE TABLE quotes.birthplace (
     id SERIAL PRIMARY KEY,
-    birthplace VARCHAR(255) NOT NULL
+    birthplace VARCHAR(255) NOT NULL UNIQUE
 );
 
 -- Agregar comentarios a la tabla de lugares de nacimiento
@@ -55,7 +63,7 @@ COMMENT ON COLUMN quotes.birthplace.birthplace IS 'Lugar de nacimiento';
 -- Crear la tabla de autores con referencias a las nuevas tablas
 CREATE TABLE quotes.author (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     birthdate_id INTEGER REFERENCES quotes.birthdate(id),
     birthplace_id INTEGER REFERENCES quotes.birthplace(id),
     description TEXT
@@ -83,20 +91,28 @@ COMMENT ON COLUMN quotes.tags.tag IS 'Etiqueta asociada a una cita';
 CREATE TABLE quotes.quotes (
     id SERIAL PRIMARY KEY,
     quote TEXT NOT NULL,
-    author_id INTEGER REFERENCES quotes.author(id)
+    content_hash VARCHAR(64) NOT NULL UNIQUE,
+    author_id INTEGER REFERENCES quotes.author(id),
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', quote)) STORED
 );
 
 -- Agregar comentarios a la tabla de citas
 COMMENT ON TABLE quotes.quotes IS 'Tabla que almacena las citas';
 COMMENT ON COLUMN quotes.quotes.quote IS 'Texto de la cita';
+COMMENT ON COLUMN quotes.quotes.content_hash IS 'Hash SHA-256 del texto de la cita (clave natural para los upserts)';
 COMMENT ON COLUMN quotes.quotes.author_id IS 'ID del autor de la cita';
+COMMENT ON COLUMN quotes.quotes.search_vector IS 'Texto de la cita normalizado para la búsqueda de texto completo (columna generada)';
+
+-- Índice GIN de la búsqueda de texto completo (search_vector @@ websearch_to_tsquery('english', ...))
+CREATE INDEX ix_quotes_search_vector ON quotes.quotes USING GIN (search_vector);
 
 
 -- Crear la tabla de relación entre citas y etiquetas
 CREATE TABLE quotes.quote_tags (
     id SERIAL PRIMARY KEY,
     quote_id INTEGER REFERENCES quotes.quotes(id),
-    tag_id INTEGER REFERENCES quotes.tags(id)
+    tag_id INTEGER REFERENCES quotes.tags(id),
+    UNIQUE (quote_id, tag_id)
 );
 
 -- Agregar comentarios a la tabla de relación entre citas y etiquetas
@@ -104,24 +120,218 @@ COMMENT ON TABLE quotes.quote_tags IS 'Tabla que almacena la relación entre cit
 COMMENT ON COLUMN quotes.quote_tags.quote_id IS 'ID de la cita';
 COMMENT ON COLUMN quotes.quote_tags.tag_id IS 'ID de la etiqueta';
 
+-- Índices de las claves de los joins (quote_id ya está cubierto por UNIQUE (quote_id, tag_id), y los IDs de
+-- autores y etiquetas por sus claves primarias). En los filtros por autor y por etiqueta de la búsqueda, y al
+-- recalcular los detalles tras renombrar un autor o una etiqueta, el ID de la cita forma parte de la clave: las
+-- citas de un autor o de una etiqueta se recorren ya ordenadas por ID, que es el orden de la paginación por cursor
+CREATE INDEX ix_quotes_author_id ON quotes.quotes (author_id, id);
+CREATE INDEX ix_quote_tags_tag_id ON quotes.quote_tags (tag_id, quote_id);
+
+
+
+-- ------------------------------------------------- Detalles de cada cita (Cita, Autor y Tags), materializados
+
+-- Una fila por cita con el join y el STRING_AGG (y el ARRAY_AGG, para las exportaciones) ya calculados. Se mantiene de forma incremental con los
+-- triggers de más abajo: cada sentencia que inserta, modifica o borra citas o etiquetas de citas, o que
+-- renombra autores o etiquetas, recalcula solo las filas de las citas afectadas, en la misma transacción.
+CREATE TABLE quotes.quote_details (
+    quote_id INTEGER PRIMARY KEY,
+    citation TEXT NOT NULL,
+    author VARCHAR(255) NOT NULL,
+    tags TEXT,
+    tag_list TEXT[],
+    txid BIGINT NOT NULL DEFAULT pg_current_xact_id()::text::BIGINT
+);
+
+COMMENT ON TABLE quotes.quote_details IS 'Detalles materializados de cada cita (se mantienen con triggers; ver refresh_quote_details)';
+COMMENT ON COLUMN quotes.quote_details.quote_id IS 'ID de la cita';
+COMMENT ON COLUMN quotes.quote_details.citation IS 'Texto de la cita';
+COMMENT ON COLUMN quotes.quote_details.author IS 'Nombre del autor';
+COMMENT ON COLUMN quotes.quote_details.tags IS 'Etiquetas de la cita separadas por comas, en el orden en que se asociaron';
+COMMENT ON COLUMN quotes.quote_details.tag_list IS 'Etiquetas de la cita como lista, en el mismo orden (una etiqueta puede contener comas)';
+COMMENT ON COLUMN quotes.quote_details.txid IS 'Transacción que escribió la fila por última vez (para las exportaciones incrementales)';
+
+CREATE INDEX ix_quote_details_author ON quotes.quote_details (author);
+CREATE INDEX ix_quote_details_txid ON quotes.quote_details (txid);
+
+-- Recalcula los detalles de las citas indicadas (o de todas, con NULL). Usa upserts en lugar de TRUNCATE,
+-- así que las lecturas no se bloquean mientras se ejecuta: SELECT quotes.refresh_quote_details(NULL);
+CREATE FUNCTION quotes.refresh_quote_details(ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+    IF ids IS NULL THEN
+        ids := ARRAY(SELECT id FROM quotes.quotes UNION SELECT quote_id FROM quotes.quote_details);
+    END IF;
+
+    -- Se parte de los IDs (join con unnest) para que cada cita se busque por su índice
+    INSERT INTO quotes.quote_details (quote_id, citation, author, tags, tag_list)
+    SELECT q.id, q.quote, a.name, STRING_AGG(t.tag, ', ' ORDER BY qt.id),
+           ARRAY_AGG(t.tag ORDER BY qt.id) FILTER (WHERE t.tag IS NOT NULL)
+    FROM (SELECT DISTINCT unnest(ids) AS id) c
+    JOIN quotes.quotes q ON q.id = c.id
+    JOIN quotes.author a ON q.author_id = a.id
+    LEFT JOIN quotes.quote_tags qt ON q.id = qt.quote_id
+    LEFT JOIN quotes.tags t ON qt.tag_id = t.id
+    GROUP BY q.id, q.quote, a.name
+    ON CONFLICT (quote_id) DO UPDATE
+        SET citation = EXCLUDED.citation, author = EXCLUDED.author, tags = EXCLUDED.tags,
+            tag_list = EXCLUDED.tag_list, txid = EXCLUDED.txid
+        WHERE (quotes.quote_details.citation, quotes.quote_details.author, quotes.quote_details.tag_list)
+              IS DISTINCT FROM (EXCLUDED.citation, EXCLUDED.author, EXCLUDED.tag_list);
+
+    -- Citas borradas (o que han perdido su autor)
+    DELETE FROM quotes.quote_details d
+    USING (SELECT DISTINCT unnest(ids) AS id) c
+    WHERE d.quote_id = c.id
+      AND NOT EXISTS (
+          SELECT 1 FROM quotes.quotes q JOIN quotes.author a ON q.author_id = a.id WHERE q.id = d.quote_id
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger por sentencia: recibe las filas afectadas en la tabla de transición "changed"
+CREATE FUNCTION quotes.sync_quote_details() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'quotes' THEN
+        PERFORM quotes.refresh_quote_details(ARRAY(SELECT DISTINCT id FROM changed));
+    ELSE
+        PERFORM quotes.refresh_quote_details(ARRAY(SELECT DISTINCT quote_id FROM changed));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER quotes_details_insert AFTER INSERT ON quotes.quotes
+    REFERENCING NEW TABLE AS changed FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details();
+CREATE TRIGGER quotes_details_update AFTER UPDATE ON quotes.quotes
+    REFERENCING NEW TABLE AS changed FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details();
+CREATE TRIGGER quotes_details_delete AFTER DELETE ON quotes.quotes
+    REFERENCING OLD TABLE AS changed FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details();
+CREATE TRIGGER quote_tags_details_insert AFTER INSERT ON quotes.quote_tags
+    REFERENCING NEW TABLE AS changed FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details();
+CREATE TRIGGER quote_tags_details_delete AFTER DELETE ON quotes.quote_tags
+    REFERENCING OLD TABLE AS changed FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details();
+
+-- Modificaciones que cambian los detalles de citas ya existentes: renombrar un autor o una etiqueta (solo las
+-- filas cuyo nombre cambia: los upserts de autores del crawl distribuido no recalculan nada si el nombre es el
+-- mismo) o mover una asociación cita-etiqueta (las citas de antes y de después). Borrar un autor o una etiqueta
+-- no necesita trigger: las claves foráneas de quotes y quote_tags impiden borrarlos mientras tengan citas
+CREATE FUNCTION quotes.sync_quote_details_update() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'author' THEN
+        PERFORM quotes.refresh_quote_details(ARRAY(
+            SELECT q.id FROM new_rows n JOIN old_rows o ON o.id = n.id JOIN quotes.quotes q ON q.author_id = n.id
+            WHERE o.name IS DISTINCT FROM n.name));
+    ELSIF TG_TABLE_NAME = 'tags' THEN
+        PERFORM quotes.refresh_quote_details(ARRAY(
+            SELECT qt.quote_id FROM new_rows n JOIN old_rows o ON o.id = n.id JOIN quotes.quote_tags qt ON qt.tag_id = n.id
+            WHERE o.tag IS DISTINCT FROM n.tag));
+    ELSE
+        PERFORM quotes.refresh_quote_details(ARRAY(SELECT quote_id FROM old_rows UNION SELECT quote_id FROM new_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER author_details_update AFTER UPDATE ON quotes.author
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details_update();
+CREATE TRIGGER tags_details_update AFTER UPDATE ON quotes.tags
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details_update();
+CREATE TRIGGER quote_tags_details_update AFTER UPDATE ON quotes.quote_tags
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION quotes.sync_quote_details_update();
+
+
+-- ------------------------------------------------- Estado de las exportaciones incrementales
+
+-- Por cada exportación con nombre, el xmin del snapshot de la última ejecución: la siguiente exporta las
+-- filas de quote_details escritas por transacciones con ID mayor o igual (las que aún no podía ver)
+CREATE TABLE quotes.export_state (
+    name VARCHAR(255) PRIMARY KEY,
+    since_txid BIGINT NOT NULL,
+    exported_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    rows BIGINT NOT NULL DEFAULT 0
+);
+
+COMMENT ON TABLE quotes.export_state IS 'Marca de agua de cada exportación incremental';
+COMMENT ON COLUMN quotes.export_state.since_txid IS 'xmin del snapshot de la última exportación';
+COMMENT ON COLUMN quotes.export_state.rows IS 'Filas escritas en la última exportación';
+
+
+-- ------------------------------------------------- Citas que no se han podido guardar (dead letters)
+
+-- Cada cita que falla al escribirse se deshace sola (savepoint) y se guarda aquí, en la misma transacción que
+-- el resto de su lote, con sus datos en bruto y el error. `python src/main.py dead-letters --replay` las reprocesa.
+-- El payload es JSON en TEXT y no JSONB: JSONB rechaza \u0000, uno de los errores que se quieren conservar
+CREATE TABLE quotes.dead_letters (
+    id BIGSERIAL PRIMARY KEY,
+    payload TEXT NOT NULL,
+    error TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE quotes.dead_letters IS 'Citas que no se han podido guardar, pendientes de reprocesar';
+COMMENT ON COLUMN quotes.dead_letters.payload IS 'Datos en bruto de la cita (JSON)';
+COMMENT ON COLUMN quotes.dead_letters.error IS 'Error de la escritura';
+
+
+-- ------------------------------------------------- Cola de trabajos del crawl distribuido
+
+-- Un trabajo por página del listado o página "about" de un autor. Los trabajadores los reclaman con
+-- SELECT ... FOR UPDATE SKIP LOCKED y los mantienen con un lease que renuevan con cada heartbeat; si un
+-- trabajador muere, su lease caduca y el trabajo vuelve a estar pendiente
+CREATE TABLE quotes.crawl_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('page', 'author')),
+    url TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+    status VARCHAR(10) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id VARCHAR(255),
+    lease_expires_at TIMESTAMPTZ,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at TIMESTAMPTZ,
+    UNIQUE (kind, url)
+);
+
+COMMENT ON TABLE quotes.crawl_jobs IS 'Cola de trabajos del crawl distribuido (páginas del listado y páginas de autores)';
+COMMENT ON COLUMN quotes.crawl_jobs.kind IS 'Tipo de trabajo: page o author';
+COMMENT ON COLUMN quotes.crawl_jobs.url IS 'Ruta de la página, relativa a URL_BASE';
+COMMENT ON COLUMN quotes.crawl_jobs.payload IS 'Datos del trabajo (número de página o nombre del autor)';
+COMMENT ON COLUMN quotes.crawl_jobs.status IS 'pending, running, done o failed';
+COMMENT ON COLUMN quotes.crawl_jobs.attempts IS 'Veces que se ha reclamado el trabajo';
+COMMENT ON COLUMN quotes.crawl_jobs.worker_id IS 'Trabajador que tiene el trabajo en curso';
+COMMENT ON COLUMN quotes.crawl_jobs.lease_expires_at IS 'Fin del lease del trabajo en curso (se renueva con cada heartbeat)';
+COMMENT ON COLUMN quotes.crawl_jobs.available_at IS 'Instante a partir del cual se puede reclamar (espera entre reintentos)';
+
+-- Trabajos pendientes, en orden de llegada, y leases en curso (para recuperar los caducados)
+CREATE INDEX ix_crawl_jobs_pending ON quotes.crawl_jobs (id) WHERE status = 'pending';
+CREATE INDEX ix_crawl_jobs_lease ON quotes.crawl_jobs (lease_expires_at) WHERE status = 'running';
+
+-- Trabajadores registrados y su último heartbeat
+CREATE TABLE quotes.crawl_workers (
+    worker_id VARCHAR(255) PRIMARY KEY,
+    host VARCHAR(255) NOT NULL,
+    pid INTEGER NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    heartbeat_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    jobs_done INTEGER NOT NULL DEFAULT 0
+);
+
+COMMENT ON TABLE quotes.crawl_workers IS 'Trabajadores del crawl distribuido en ejecución';
+COMMENT ON COLUMN quotes.crawl_workers.heartbeat_at IS 'Último heartbeat del trabajador';
+COMMENT ON COLUMN quotes.crawl_workers.jobs_done IS 'Trabajos terminados por el trabajador';
 
 
 -- ------------------------------------------------- Crear la vista con Cita, Autor y Tags
 
+-- Lee los detalles materializados: no recalcula el join en cada lectura
 CREATE VIEW quotes.view_quote_details AS
 SELECT 
-    q.quote AS citation,
-    a.name AS author,
-    STRING_AGG(t.tag, ', ') AS tags
+    d.citation,
+    d.author,
+    d.tags
 FROM 
-    quotes.quotes q
-JOIN 
-    quotes.author a ON q.author_id = a.id
-LEFT JOIN 
-    quotes.quote_tags qt ON q.id = qt.quote_id
-LEFT JOIN 
-    quotes.tags t ON qt.tag_id = t.id
-GROUP BY 
-    q.id, q.quote, a.name
+    quotes.quote_details d
 ORDER BY 
-    q.id ASC;
\ No newline at end of file
+    d.quote_id ASC;
@@ -0,0 +1,143 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from src.utils.logger import logger
+from src.utils.constants import AUTHOR_CACHE_SIZE, AUTHOR_CACHE_TTL
+
+class AuthorCache:
+    """
+    Caché de los detalles de autor (página "about") indexada por `about_url`.
+
+    Tiene dos niveles:
+        - Un LRU en memoria con un máximo de `max_size` entradas.
+        - Un nivel persistente opcional en disco (SQLite) cuyas entradas caducan tras `ttl` segundos.
+
+    Las peticiones concurrentes para la misma URL se agrupan en una única descarga en vuelo. La descarga
+    es una tarea propia de la caché a la que todas esperan con `asyncio.shield`: si se cancela la petición
+    que la inició, las demás siguen esperando el resultado en lugar de recibir `CancelledError`.
+
+    Atributos:
+        max_size (int): Número máximo de entradas en memoria.
+        ttl (float): Tiempo de vida, en segundos, de las entradas en disco.
+        path (str | None): Ruta del fichero SQLite, o None para usar solo memoria.
+        hits (int): Número de aciertos (memoria, disco o descarga compartida).
+        misses (int): Número de descargas realizadas.
+    """
+
+    def __init__(self, max_size=AUTHOR_CACHE_SIZE, path=None, ttl=AUTHOR_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # about_url -> detalles del autor
+        self._inflight = {}  # about_url -> tarea de la descarga en curso
+        self._db = None
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path):
+        """Abre (o crea) el nivel persistente en disco."""
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS author_cache ("
+                "about_url TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error al abrir la caché de autores en disco: {e}")
+            self._db = None
+
+    def _remember(self, key, value):
+        """Guarda una entrada en el LRU de memoria, expulsando la menos usada si hace falta."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        """Devuelve la entrada en disco si existe y no ha caducado."""
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT payload, fetched_at FROM author_cache WHERE about_url = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error al leer la caché de autores en disco: {e}")
+            return None
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def _write_disk(self, key, value):
+        """Guarda una entrada en disco."""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO author_cache (about_url, payload, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error al escribir la caché de autores en disco: {e}")
+
+    async def get(self, key, loader):
+        """
+        Devuelve los detalles del autor para `key`, descargándolos con `loader` solo si no están en caché.
+
+        Args:
+            key (str): La URL de la página "about".
+            loader (Callable[[str], Awaitable[dict]]): Corrutina que descarga los detalles del autor.
+
+        Returns:
+            dict: Los detalles del autor.
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if key in self._inflight:
+            self.hits += 1
+            return await asyncio.shield(self._inflight[key])
+
+        value = self._read_disk(key)
+        if value is not None:
+            self.hits += 1
+            self._remember(key, value)
+            return value
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._load(key, loader))
+        # Marca la excepción como recuperada aunque se hayan cancelado todas las peticiones que la esperaban
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key, loader):
+        """Descarga compartida de `key`: guarda el resultado en memoria y en disco."""
+        try:
+            value = await loader(key)
+            self._remember(key, value)
+            self._write_disk(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def close(self):
+        """Cierra el nivel persistente en disco."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,318 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+from contextlib import asynccontextmanager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from models import Author, Quote as DBQuote, Tag, QuoteTag, Birthdate, Birthplace
+from sql_profiler import operation
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import BULK_BATCH_SIZE, BULK_MAX_PARAMS
+
+def _chunks(rows, size):
+    """Divide una lista en trozos de como máximo `size` elementos."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class BulkWriter:
+    """
+    Persistencia por lotes de objetos `Quote` ya extraídos.
+
+    En lugar de las (6 + 2×etiquetas) consultas por cita de `Quote.save`, cada lote resuelve las
+    dimensiones (`Birthdate`, `Birthplace`, `Author`, `Tag`) con consultas por conjuntos y
+    `INSERT … ON CONFLICT … RETURNING` multi-fila, e inserta las citas y sus `quote_tags` con
+    sentencias multi-fila. El número de sentencias por lote es constante.
+
+    Las escrituras son upserts sobre las claves naturales (valor de cada dimensión, hash del texto
+    de la cita y par cita-etiqueta), por lo que repetir una ejecución no duplica filas.
+
+    Con `dead_letters`, cada lote se escribe en savepoints. Si falla, se deshace solo el savepoint y el
+    lote se divide en grupos más pequeños, cada uno en su savepoint, hasta aislar las citas que fallan, que
+    se guardan en dead letters en la misma transacción; el resto del lote se confirma. Con datos limpios el
+    coste es de dos savepoints por lote (dimensiones y citas). Las dimensiones de una cita que falla (p. ej.
+    su autor) se conservan. Al deshacer un savepoint, la `DimensionCache` descarta los IDs obtenidos dentro
+    de él (esas filas ya no existen) y conserva los anteriores.
+
+    Atributos:
+        batch_size (int): Número máximo de citas por transacción.
+        cache (DimensionCache | None): Caché de IDs de dimensiones compartida por toda la ejecución.
+        dead_letters (DeadLetterStore | None): Dónde guardar las citas que fallan (sin él, el lote falla entero).
+        statements (int): Número de sentencias ejecutadas (para medir).
+    """
+
+    def __init__(self, batch_size=BULK_BATCH_SIZE, cache=None, dead_letters=None):
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.dead_letters = dead_letters
+        self.statements = 0
+
+    async def _execute(self, session, stmt):
+        """Ejecuta una sentencia y la contabiliza."""
+        self.statements += 1
+        return await session.execute(stmt)
+
+    async def _resolve(self, session: AsyncSession, dimension, model, column, rows):
+        """
+        Obtiene el ID de cada valor de una dimensión, insertando en bloque los que faltan.
+
+        Args:
+            session (AsyncSession): Sesión activa.
+            dimension (str): Nombre de la dimensión en la caché.
+            model: Modelo de la dimensión.
+            column (str): Columna con el valor natural de la dimensión.
+            rows (dict): Valor -> diccionario con las columnas a insertar si no existe.
+
+        Returns:
+            dict: Valor -> ID.
+        """
+        if not rows:
+            return {}
+        key = getattr(model, column)
+        width = max(len(row) for row in rows.values())
+        ids = {}
+        if self.cache:
+            for value in rows:
+                cached = self.cache.get(dimension, value)
+                if cached is not None:
+                    ids[value] = cached
+        # En orden, para que transacciones concurrentes (p. ej. trabajadores del crawl distribuido)
+        # bloqueen los valores nuevos en el mismo orden y no se produzcan interbloqueos
+        values = sorted(value for value in rows if value not in ids)
+        if not values:
+            return ids
+
+        # 1. Valores que ya existen, en una sola consulta por trozo
+        for chunk in _chunks(values, BULK_MAX_PARAMS):
+            result = await self._execute(session, select(key, model.id).where(key.in_(chunk)))
+            ids.update(result.all())
+
+        # 2. Valores nuevos: INSERT multi-fila que devuelve los IDs generados
+        missing = [rows[value] for value in values if value not in ids]
+        for chunk in _chunks(missing, max(1, BULK_MAX_PARAMS // width)):
+            stmt = insert(model).values(chunk).on_conflict_do_nothing(index_elements=[key]).returning(key, model.id)
+            result = await self._execute(session, stmt)
+            ids.update(result.all())
+
+        # 3. Valores insertados por otro proceso entre los pasos 1 y 2
+        lost = [value for value in values if value not in ids]
+        if lost:
+            result = await self._execute(session, select(key, model.id).where(key.in_(lost)))
+            ids.update(result.all())
+
+        if self.cache:
+            for value in values:
+                self.cache.put(dimension, value, ids[value])
+        return ids
+
+    async def _resolve_dimensions(self, session: AsyncSession, quotes):
+        """
+        Resuelve (insertando las que faltan) las fechas, lugares, autores y etiquetas de un lote de citas.
+
+        Returns:
+            tuple: (autor -> ID, etiqueta -> ID).
+        """
+        # Las fechas y lugares desconocidos (None) no se insertan: el autor queda sin ellos
+        birthdate_ids = await self._resolve(
+            session, "birthdate", Birthdate, "birthdate",
+            {q.birthdate: {"birthdate": q.birthdate} for q in quotes if q.birthdate is not None}
+        )
+        birthplace_ids = await self._resolve(
+            session, "birthplace", Birthplace, "birthplace",
+            {q.birthplace: {"birthplace": q.birthplace} for q in quotes if q.birthplace is not None}
+        )
+        authors = {}
+        for q in quotes:  # En caso de repetición, se conservan los datos de la primera cita
+            authors.setdefault(q.author, {
+                "name": q.author,
+                "birthdate_id": birthdate_ids.get(q.birthdate),
+                "birthplace_id": birthplace_ids.get(q.birthplace),
+                "description": q.description,
+            })
+        author_ids = await self._resolve(session, "author", Author, "name", authors)
+        tag_ids = await self._resolve(
+            session, "tag", Tag, "tag", {tag: {"tag": tag} for q in quotes for tag in q.tags}
+        )
+        return author_ids, tag_ids
+
+    async def _write_quotes(self, session: AsyncSession, quotes, author_ids, tag_ids):
+        """Inserta las citas de un lote y sus `quote_tags`, con las dimensiones ya resueltas."""
+        # Citas: una fila por hash de texto distinto; las que ya existen se ignoran y se recuperan por su hash
+        unique_quotes = {}
+        for q in quotes:
+            unique_quotes.setdefault(q.content_hash, q)
+        quote_ids = {}
+        for chunk in _chunks(list(unique_quotes.items()), BULK_MAX_PARAMS // 3):
+            stmt = insert(DBQuote).values(
+                [{"quote": q.text, "content_hash": h, "author_id": author_ids[q.author]} for h, q in chunk]
+            ).on_conflict_do_nothing(index_elements=[DBQuote.content_hash]).returning(DBQuote.content_hash, DBQuote.id)
+            result = await self._execute(session, stmt)
+            quote_ids.update(result.all())
+        existing = [h for h in unique_quotes if h not in quote_ids]
+        for chunk in _chunks(existing, BULK_MAX_PARAMS):
+            result = await self._execute(
+                session, select(DBQuote.content_hash, DBQuote.id).where(DBQuote.content_hash.in_(chunk))
+            )
+            quote_ids.update(result.all())
+
+        # Relación cita-etiqueta, también multi-fila; las asociaciones que ya existen se ignoran
+        links = [
+            {"quote_id": quote_ids[h], "tag_id": tag_ids[tag]}
+            for h, q in unique_quotes.items()
+            for tag in dict.fromkeys(q.tags)
+        ]
+        for chunk in _chunks(links, BULK_MAX_PARAMS // 2):
+            stmt = insert(QuoteTag).values(chunk).on_conflict_do_nothing(
+                index_elements=[QuoteTag.quote_id, QuoteTag.tag_id]
+            )
+            await self._execute(session, stmt)
+        return len(unique_quotes)
+
+    async def _write_batch(self, session: AsyncSession, quotes):
+        """Escribe un lote de citas en la transacción en curso."""
+        return await self._write_quotes(session, quotes, *await self._resolve_dimensions(session, quotes))
+
+    @asynccontextmanager
+    async def _savepoint(self, session: AsyncSession):
+        """Savepoint que, si se deshace, descarta de la caché los IDs obtenidos dentro de él."""
+        snapshot = self.cache.savepoint() if self.cache else None
+        try:
+            async with session.begin_nested():
+                yield
+        except BaseException:
+            if snapshot is not None:
+                self.cache.rollback_to(snapshot)
+            raise
+
+    async def _isolate(self, session: AsyncSession, quotes, ids):
+        """
+        Escribe citas en un savepoint; si falla, las divide en unos √n grupos (cada uno en su savepoint) hasta
+        aislar las que fallan y las guarda en dead letters.
+
+        Con √n grupos en lugar de mitades, las citas correctas de un lote se reescriben una vez y no una vez
+        por nivel: el coste de reintentar depende del número de filas (compilar y enviar cada sentencia
+        multi-fila), no del número de sentencias.
+
+        Args:
+            ids (tuple | None): IDs de autores y etiquetas ya resueltos, o None para resolverlos en cada intento.
+
+        Returns:
+            int: Número de citas escritas.
+        """
+        try:
+            async with self._savepoint(session):
+                if ids is None:
+                    return await self._write_batch(session, quotes)
+                return await self._write_quotes(session, quotes, *ids)
+        except Exception as e:
+            if len(quotes) == 1:
+                await self.dead_letters.add(session, quotes[0], e)
+                return 0
+        size = -(-len(quotes) // max(2, math.isqrt(len(quotes))))
+        written = 0
+        for group in _chunks(quotes, size):
+            written += await self._isolate(session, group, ids)
+        return written
+
+    async def _write_isolated(self, session: AsyncSession, quotes):
+        """
+        Escribe un lote aislando las citas que fallan: resuelve las dimensiones de todo el lote en un savepoint
+        y divide solo la inserción de las citas y sus `quote_tags` (dos sentencias por intento). Si fallan las
+        dimensiones, cada intento las resuelve de nuevo.
+
+        Returns:
+            int: Número de citas escritas.
+        """
+        try:
+            async with self._savepoint(session):
+                ids = await self._resolve_dimensions(session, quotes)
+        except Exception:
+            ids = None
+        return await self._isolate(session, quotes, ids)
+
+    async def save_authors(self, session: AsyncSession, authors):
+        """
+        Guarda los datos de varios autores sin citas (p. ej. los de las páginas "about" del crawl distribuido).
+
+        A diferencia de `save`, los autores que ya existen se actualizan: pueden haberse creado solo con el
+        nombre al guardar sus citas antes de que se descargara su página "about".
+
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            authors (List[dict]): Diccionarios con "name", "birthdate" (date | None), "birthplace" y "description".
+
+        Returns:
+            int: Número de autores guardados.
+        """
+        if self.cache:
+            self.cache.bind(session)
+        authors = list({author["name"]: author for author in authors}.values())  # Un autor por nombre y sentencia
+        if not authors:
+            return 0
+        try:
+            with metrics.timer("db_write_seconds", writer="authors"), operation("BulkWriter.authors"):
+                birthdate_ids = await self._resolve(
+                    session, "birthdate", Birthdate, "birthdate",
+                    {a["birthdate"]: {"birthdate": a["birthdate"]} for a in authors if a["birthdate"] is not None}
+                )
+                birthplace_ids = await self._resolve(
+                    session, "birthplace", Birthplace, "birthplace",
+                    {a["birthplace"]: {"birthplace": a["birthplace"]} for a in authors if a["birthplace"] is not None}
+                )
+                stmt = insert(Author).values([{
+                    "name": a["name"],
+                    "birthdate_id": birthdate_ids.get(a["birthdate"]),
+                    "birthplace_id": birthplace_ids.get(a["birthplace"]),
+                    "description": a["description"],
+                } for a in authors])
+                stmt = stmt.on_conflict_do_update(index_elements=[Author.name], set_={
+                    "birthdate_id": stmt.excluded.birthdate_id,
+                    "birthplace_id": stmt.excluded.birthplace_id,
+                    "description": stmt.excluded.description,
+                }).returning(Author.name, Author.id)
+                result = await self._execute(session, stmt)
+                if self.cache:
+                    for name, id_ in result.all():
+                        self.cache.put("author", name, id_)
+                await session.commit()
+            metrics.inc("rows_written_total", len(authors), writer="authors")
+        except Exception as e:
+            logger.error(f"Error al guardar los autores en la base de datos: {e}")
+            await session.rollback()
+            raise
+        return len(authors)
+
+    async def save(self, session: AsyncSession, quotes):
+        """
+        Guarda una lista de citas en lotes de `batch_size`, con un commit por lote.
+        Con `dead_letters`, las citas que fallan se guardan en dead letters y no cuentan como guardadas.
+
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            quotes (List[Quote]): Citas extraídas por el `Scraper`.
+
+        Returns:
+            int: Número de citas guardadas.
+        """
+        if self.cache:
+            self.cache.bind(session)  # Mantiene la caché coherente con los commits y rollbacks de la sesión.
+        saved = 0
+        for batch in _chunks(list(quotes), self.batch_size):
+            try:
+                with metrics.timer("db_write_seconds", writer="bulk"), operation("BulkWriter.batch"):
+                    if self.dead_letters:
+                        written = await self._write_isolated(session, batch)
+                    else:
+                        written = await self._write_batch(session, batch)
+                    await session.commit()
+                saved += written
+                metrics.inc("rows_written_total", written, writer="bulk")
+            except Exception as e:
+                logger.error(f"Error al guardar el lote de citas en la base de datos: {e}")
+                await session.rollback()
+                raise
+        return saved
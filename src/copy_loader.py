@@ -0,0 +1,136 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import COPY_BATCH_SIZE
+
+from database import db_schema
+
+class CopyLoader:
+    """
+    Modo de carga masiva basado en `COPY` de PostgreSQL (asyncpg `copy_records_to_table`).
+
+    Cada lote se vuelca en dos tablas temporales de staging (`stage_quote` con las citas y sus
+    etiquetas, y `stage_author` con los autores normalizados) y después se integra en las tablas
+    del esquema (`birthdate`, `birthplace`, `author`, `tags`, `quotes`, `quote_tags`) con
+    sentencias por conjuntos (`INSERT … ON CONFLICT DO NOTHING` sobre las claves naturales), todo
+    dentro de una única transacción.
+
+    Tiene la misma interfaz que `BulkWriter`, por lo que puede usarse en el pipeline o en
+    `Scraper.save_quotes_to_db`.
+
+    Atributos:
+        batch_size (int): Número máximo de citas por transacción.
+        schema (str): Esquema de destino.
+        statements (int): Número de sentencias ejecutadas (para medir).
+    """
+
+    def __init__(self, batch_size=COPY_BATCH_SIZE, schema=db_schema):
+        self.batch_size = max(1, int(batch_size))
+        self.schema = schema
+        self.statements = 0
+
+    def _merge_statements(self):
+        """Sentencias que integran las tablas de staging en las tablas del esquema."""
+        s = self.schema
+        return [
+            # Fechas y lugares de nacimiento nuevos
+            f"""INSERT INTO {s}.birthdate (birthdate)
+                SELECT DISTINCT st.birthdate FROM stage_author st
+                WHERE st.birthdate IS NOT NULL
+                ON CONFLICT (birthdate) DO NOTHING""",
+            f"""INSERT INTO {s}.birthplace (birthplace)
+                SELECT DISTINCT st.birthplace FROM stage_author st
+                WHERE st.birthplace IS NOT NULL
+                ON CONFLICT (birthplace) DO NOTHING""",
+            # Autores nuevos con sus referencias a fecha y lugar
+            f"""INSERT INTO {s}.author (name, birthdate_id, birthplace_id, description)
+                SELECT st.name, b.id, p.id, st.description
+                FROM stage_author st
+                LEFT JOIN {s}.birthdate b ON b.birthdate = st.birthdate
+                LEFT JOIN {s}.birthplace p ON p.birthplace = st.birthplace
+                ON CONFLICT (name) DO NOTHING""",
+            # Etiquetas nuevas
+            f"""INSERT INTO {s}.tags (tag)
+                SELECT DISTINCT u.tag FROM stage_quote st CROSS JOIN LATERAL unnest(st.tags) AS u(tag)
+                ON CONFLICT (tag) DO NOTHING""",
+            # Citas nuevas (por el hash de su texto)
+            f"""INSERT INTO {s}.quotes (quote, content_hash, author_id)
+                SELECT DISTINCT ON (st.content_hash) st.quote, st.content_hash, a.id
+                FROM stage_quote st JOIN {s}.author a ON a.name = st.author
+                ORDER BY st.content_hash
+                ON CONFLICT (content_hash) DO NOTHING""",
+            # Relación de todas las citas del lote con sus etiquetas
+            f"""INSERT INTO {s}.quote_tags (quote_id, tag_id)
+                SELECT DISTINCT q.id, t.id
+                FROM stage_quote st
+                JOIN {s}.quotes q ON q.content_hash = st.content_hash
+                CROSS JOIN LATERAL unnest(st.tags) AS u(tag)
+                JOIN {s}.tags t ON t.tag = u.tag
+                ON CONFLICT (quote_id, tag_id) DO NOTHING""",
+        ]
+
+    async def _load_batch(self, connection, quotes):
+        """Carga un lote mediante COPY en una transacción (o savepoint) de `connection` (asyncpg)."""
+        async with connection.transaction():
+            await connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS stage_quote "
+                "(quote TEXT, content_hash TEXT, author TEXT, tags TEXT[]) ON COMMIT DELETE ROWS"
+            )
+            await connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS stage_author "
+                "(name TEXT, birthdate DATE, birthplace TEXT, description TEXT) ON COMMIT DELETE ROWS"
+            )
+            self.statements += 2
+
+            authors = {}  # Autores normalizados que se recogen mientras se vuelcan las citas
+
+            def quote_records():
+                for quote in quotes:
+                    authors.setdefault(quote.author, (quote.author, quote.birthdate, quote.birthplace, quote.description))
+                    yield (quote.text, quote.content_hash, quote.author, list(quote.tags))
+
+            await connection.copy_records_to_table(
+                "stage_quote", records=quote_records(), columns=("quote", "content_hash", "author", "tags")
+            )
+            await connection.copy_records_to_table(
+                "stage_author", records=authors.values(), columns=("name", "birthdate", "birthplace", "description")
+            )
+            self.statements += 2
+
+            for statement in self._merge_statements():
+                await connection.execute(statement)
+                self.statements += 1
+
+    async def save(self, session: AsyncSession, quotes):
+        """
+        Guarda una lista de citas en lotes de `batch_size`, con un commit por lote.
+
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy sobre `postgresql+asyncpg`.
+            quotes (Iterable[Quote]): Citas extraídas por el `Scraper`.
+
+        Returns:
+            int: Número de citas procesadas.
+        """
+        quotes = list(quotes)
+        saved = 0
+        for start in range(0, len(quotes), self.batch_size):
+            batch = quotes[start:start + self.batch_size]
+            try:
+                with metrics.timer("db_write_seconds", writer="copy"):
+                    connection = await session.connection()
+                    raw = await connection.get_raw_connection()
+                    await self._load_batch(raw.driver_connection, batch)
+                    await session.commit()
+                saved += len(batch)
+                metrics.inc("rows_written_total", len(batch), writer="copy")
+            except Exception as e:
+                logger.error(f"Error al cargar el lote de citas mediante COPY: {e}")
+                await session.rollback()
+                raise
+        return saved
@@ -0,0 +1,219 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import json
+import sqlite3
+import time
+from src.utils.logger import logger
+
+class _Unchanged:
+    """Marca de página sin cambios desde la última ejecución."""
+
+    def __repr__(self):
+        return "UNCHANGED"
+
+# Se devuelve en lugar del HTML cuando una página no ha cambiado
+UNCHANGED = _Unchanged()
+
+def content_hash(text):
+    """
+    Calcula el hash del contenido de una página.
+
+    Args:
+        text (str): El HTML de la página.
+
+    Returns:
+        str: El hash SHA-256 en hexadecimal.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class CrawlState:
+    """
+    Estado persistente (SQLite) de cada URL descargada: ETag, Last-Modified, hash del contenido y,
+    opcionalmente, los datos ya extraídos de la página.
+
+    Permite hacer peticiones condicionales (`If-None-Match` / `If-Modified-Since`) y detectar las
+    páginas que no han cambiado (304 o mismo hash) para no volver a analizarlas ni escribirlas.
+
+    Los cambios se acumulan en memoria y solo se guardan con `commit()`, al terminar con éxito la
+    ejecución, para que una ejecución fallida no marque como procesadas páginas que no llegaron a
+    la base de datos. Además, el estado de una página del listado (`fetched`) solo pasa a guardarse
+    cuando todas sus citas (`extracted`) se han confirmado en la base de datos (`persisted`): una página
+    con citas descartadas o sin guardar se vuelve a descargar y analizar en la siguiente ejecución.
+
+    Atributos:
+        path (str): Ruta del fichero SQLite.
+        unchanged (int): Número de páginas sin cambios en esta ejecución.
+        changed (int): Número de páginas nuevas o modificadas en esta ejecución.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.unchanged = 0
+        self.changed = 0
+        self._pending = {}
+        self._fetched = {}  # Estado de las páginas descargadas cuyas citas aún no están guardadas
+        self._outstanding = {}  # URL -> hashes de sus citas pendientes de guardar
+        self._pages = {}  # Hash de una cita -> URL de las páginas en las que aparece
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_state ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT, "
+            "payload TEXT, fetched_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def _row(self, url):
+        """Devuelve el estado guardado de una URL o None."""
+        return self._db.execute(
+            "SELECT etag, last_modified, content_hash, payload FROM crawl_state WHERE url = ?", (url,)
+        ).fetchone()
+
+    def conditional_headers(self, url):
+        """
+        Construye las cabeceras de la petición condicional de una URL.
+
+        Args:
+            url (str): La URL a solicitar.
+
+        Returns:
+            dict: Cabeceras `If-None-Match` / `If-Modified-Since` (vacío si la URL es nueva).
+        """
+        row = self._row(url)
+        headers = {}
+        if row is None:
+            return headers
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def is_unchanged(self, url, response):
+        """
+        Indica si la página no ha cambiado desde la última ejecución.
+
+        Args:
+            url (str): La URL solicitada.
+            response (HttpResponse): La respuesta recibida.
+
+        Returns:
+            bool: True si la página no ha cambiado (304 o mismo hash).
+        """
+        if response.status == 304:
+            self.unchanged += 1
+            return True
+        row = self._row(url)
+        if row is not None and row[2] == content_hash(response.text):
+            self.unchanged += 1
+            return True
+        self.changed += 1
+        return False
+
+    def record(self, url, response, payload=None):
+        """
+        Deja pendiente de guardar el estado de una página descargada.
+
+        Args:
+            url (str): La URL solicitada.
+            response (HttpResponse): La respuesta recibida (con cuerpo).
+            payload (Any, opcional): Datos extraídos de la página que se quieren conservar (JSON).
+        """
+        self._pending[url] = self._state(response, payload)
+
+    @staticmethod
+    def _state(response, payload=None):
+        """Estado que se guarda de una respuesta: validadores, hash del contenido y datos extraídos."""
+        return (
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            content_hash(response.text),
+            json.dumps(payload) if payload is not None else None,
+        )
+
+    def fetched(self, url, response):
+        """
+        Recuerda el estado de una página del listado descargada, sin dejarlo pendiente de guardar todavía:
+        eso ocurre cuando sus citas se confirman en la base de datos (`extracted` y `persisted`).
+
+        Args:
+            url (str): La URL solicitada.
+            response (HttpResponse): La respuesta recibida (con cuerpo).
+        """
+        self._fetched[url] = self._state(response)
+
+    def extracted(self, url, entries):
+        """
+        Registra las citas extraídas de una página descargada con `fetched`.
+
+        Args:
+            url (str): La URL de la página.
+            entries (List[tuple]): Citas extraídas (texto, autor, etiquetas, about_url).
+        """
+        if url not in self._fetched:
+            return
+        hashes = {content_hash(str(entry[0])) for entry in entries}
+        for digest in hashes:
+            self._pages.setdefault(digest, set()).add(url)
+        self._outstanding[url] = hashes
+        if not hashes:
+            self._confirm(url)
+
+    def persisted(self, quotes):
+        """
+        Marca como guardadas unas citas; las páginas con todas sus citas guardadas quedan pendientes de guardar.
+
+        Args:
+            quotes (Iterable[Quote]): Citas confirmadas en la base de datos.
+        """
+        for quote in quotes:
+            digest = quote.content_hash
+            for url in self._pages.pop(digest, ()):
+                outstanding = self._outstanding.get(url)
+                if outstanding is not None:
+                    outstanding.discard(digest)
+                    if not outstanding:
+                        self._confirm(url)
+
+    def _confirm(self, url):
+        """Deja pendiente de guardar el estado de una página cuyas citas ya están en la base de datos."""
+        del self._outstanding[url]
+        self._pending[url] = self._fetched.pop(url)
+
+    def payload(self, url):
+        """
+        Devuelve los datos extraídos guardados para una URL.
+
+        Args:
+            url (str): La URL.
+
+        Returns:
+            Any | None: Los datos guardados o None.
+        """
+        if url in self._pending and self._pending[url][3] is not None:
+            return json.loads(self._pending[url][3])
+        row = self._row(url)
+        return json.loads(row[3]) if row is not None and row[3] else None
+
+    def commit(self):
+        """Guarda en disco el estado de todas las páginas procesadas en esta ejecución."""
+        try:
+            now = time.time()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO crawl_state (url, etag, last_modified, content_hash, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(url, *state, now) for url, state in self._pending.items()],
+            )
+            self._db.commit()
+            self._pending.clear()
+        except sqlite3.Error as e:
+            logger.error(f"Error al guardar el estado del crawl: {e}")
+            raise
+
+    def close(self):
+        """Cierra el fichero de estado."""
+        self._db.close()
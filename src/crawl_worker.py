@@ -0,0 +1,218 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from quote import Quote
+from bulk_writer import BulkWriter
+from dead_letters import DeadLetterStore
+from work_queue import WorkQueue, PAGE, AUTHOR, new_worker_id
+from http_client import HttpError
+from database import SessionLocal
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import (URL_PAGE, WORKER_CONCURRENCY, WORKER_HEARTBEAT_INTERVAL, WORKER_POLL_INTERVAL,
+                                 COORDINATOR_SEED_PAGES)
+
+# Códigos de estado definitivos: el recurso no existe y reintentar no sirve de nada
+GONE_STATUSES = frozenset({404, 410})
+
+def page_job(page):
+    """Trabajo de una página del listado: (tipo, URL relativa, payload)."""
+    return (PAGE, f"{URL_PAGE}{page}", {"page": page})
+
+def author_job(about_url, author):
+    """Trabajo de la página "about" de un autor: (tipo, URL relativa, payload)."""
+    return (AUTHOR, about_url, {"author": Quote.clean_author(author)})
+
+class CrawlWorker:
+    """
+    Trabajador del crawl distribuido: procesa trabajos de la `WorkQueue` hasta que la cola se vacía.
+
+    Se pueden arrancar tantos trabajadores como se quiera, en la misma máquina o en otras, contra la
+    misma base de datos. Cada uno usa un `Scraper` para descargar y analizar (cliente HTTP, control de
+    ritmo, caché de autores y pool de análisis propios) y un `BulkWriter` para escribir.
+
+    - Página del listado: guarda sus citas (con el autor solo por su nombre) y, en la misma transacción,
+      encola la página siguiente (si hay enlace "next") y la página "about" de cada autor. Una página
+      vacía o que no existe (404/410, p. ej. una sembrada más allá del final) marca el final del listado.
+    - Página "about": guarda los datos del autor, creándolo o completando el que ya crearon sus citas.
+
+    Las citas y su autor se escriben en trabajos distintos y en cualquier orden: ambos son upserts por
+    nombre, así que el resultado final es el mismo que el del `Scraper` en un solo proceso.
+
+    El `BulkWriter` no lleva `DimensionCache`: sus IDs pendientes son comunes a todas las sesiones, y aquí
+    cada trabajo en curso escribe en su propia transacción. Sí lleva dead letters: una cita que no se puede
+    guardar no hace fallar (ni repetir) el trabajo de su página entera. Un autor cuya página "about" no
+    existe (404/410) queda como fallido sin reintentos.
+
+    Una tarea en segundo plano envía un heartbeat cada `heartbeat_interval` segundos, que renueva los
+    leases de los trabajos en curso y recupera los trabajos de otros trabajadores caídos.
+
+    Atributos:
+        scraper (Scraper): Descarga y análisis de las páginas.
+        queue (WorkQueue): Cola de trabajos.
+        writer (BulkWriter): Escritura de citas y autores.
+        concurrency (int): Trabajos en curso a la vez.
+        worker_id (str): Identificador del trabajador.
+        forever (bool): Si es True, sigue esperando trabajos cuando la cola se vacía.
+        stats (dict): Trabajos terminados y fallidos, citas y autores guardados.
+    """
+
+    def __init__(self, scraper, queue=None, writer=None, concurrency=WORKER_CONCURRENCY, worker_id=None,
+                 session_factory=SessionLocal, heartbeat_interval=WORKER_HEARTBEAT_INTERVAL,
+                 poll_interval=WORKER_POLL_INTERVAL, forever=False):
+        self.scraper = scraper
+        self.queue = queue or WorkQueue(session_factory)
+        self.writer = writer or BulkWriter(dead_letters=DeadLetterStore())
+        self.concurrency = max(1, int(concurrency))
+        self.worker_id = worker_id or new_worker_id()
+        self.session_factory = session_factory
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.forever = forever
+        self.stats = {"done": 0, "failed": 0, "quotes": 0, "authors": 0}
+
+    async def _page(self, session, job):
+        """Procesa una página del listado."""
+        page = job.payload["page"]
+        response = await self.scraper.http.get(self.scraper.page_url(page))
+        if response.status in GONE_STATUSES:
+            return  # Página sembrada más allá del final del listado
+        response.raise_for_status()
+        record = await self.scraper.parse_pool.page(response.text)
+        if not self.scraper.has_data(record):
+            return  # Final del listado
+        entries = self.scraper.extract_entries(record)
+        follow = [page_job(page + 1)] if self.scraper.has_next(record) else []
+        follow += [author_job(about_url, author) for _, author, _, about_url in entries if about_url]
+        await self.queue.enqueue(session, follow)
+        # Los datos del autor llegan con su propio trabajo; `save` confirma también los trabajos encolados
+        saved = await self.writer.save(session, [self.scraper.build_quote(entry, {}) for entry in entries])
+        self.stats["quotes"] += saved
+
+    async def _author(self, session, job):
+        """Procesa la página "about" de un autor."""
+        with metrics.timer("enrich_seconds"):
+            details = await self.scraper.download_about_content(job.url)
+        saved = await self.writer.save_authors(session, [{
+            "name": job.payload["author"],
+            "birthdate": Quote.convert_birthdate(details.get("author_birthdate")),
+            "birthplace": details.get("author_birthplace"),
+            "description": details.get("author_description"),
+        }])
+        self.stats["authors"] += saved
+
+    async def _process(self, job):
+        """Procesa un trabajo y lo marca como terminado, o como fallido si algo falla."""
+        start = time.perf_counter()
+        async with self.session_factory() as session:
+            try:
+                if job.kind == PAGE:
+                    await self._page(session, job)
+                else:
+                    await self._author(session, job)
+                await self.queue.complete(session, job, self.worker_id)
+                await session.commit()
+            except Exception as e:
+                logger.error(f"Error en el trabajo {job.kind} {job.url} (intento {job.attempts}): {e}")
+                await session.rollback()
+                self.stats["failed"] += 1
+                try:
+                    gone = isinstance(e, HttpError) and e.status in GONE_STATUSES
+                    await self.queue.fail(session, job, self.worker_id, e, final=gone)
+                except Exception as fail_error:
+                    logger.error(f"Error al devolver el trabajo {job.url} a la cola: {fail_error}")
+                return
+        self.stats["done"] += 1
+        metrics.observe("job_seconds", time.perf_counter() - start, kind=job.kind)
+        metrics.inc("jobs_done_total", kind=job.kind)
+
+    async def _heartbeat(self):
+        """Renueva los leases propios y recupera los trabajos de los trabajadores caídos, periódicamente."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    await self.queue.heartbeat(session, self.worker_id, self.stats["done"])
+                    await self.queue.reclaim_expired(session)
+            except Exception as e:
+                logger.error(f"Error en el heartbeat de {self.worker_id}: {e}")
+
+    async def run(self):
+        """
+        Procesa trabajos hasta que no quedan pendientes ni en curso (o indefinidamente con `forever`).
+
+        Returns:
+            dict: Los contadores del trabajador (`stats`).
+        """
+        logger.info(f"Trabajador {self.worker_id} arrancado ({self.concurrency} trabajos a la vez)")
+        async with self.session_factory() as session:
+            await self.queue.register(session, self.worker_id)
+            await self.queue.reclaim_expired(session)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        running = set()
+        try:
+            async with self.session_factory() as session:
+                while True:
+                    if len(running) < self.concurrency:
+                        for job in await self.queue.claim(session, self.worker_id, self.concurrency - len(running)):
+                            running.add(asyncio.create_task(self._process(job)))
+                    if len(running) >= self.concurrency:
+                        _, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                        continue
+                    if not running and not self.forever and not await self.queue.remaining(session):
+                        await session.commit()
+                        break
+                    await session.commit()
+                    # Cola vacía (o sin trabajos suficientes): espera a que termine alguno o a que lleguen más
+                    if running:
+                        _, running = await asyncio.wait(running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                    else:
+                        await asyncio.sleep(self.poll_interval)
+        finally:
+            heartbeat.cancel()
+            for task in running:
+                task.cancel()
+            await asyncio.gather(heartbeat, *running, return_exceptions=True)
+            try:
+                async with self.session_factory() as session:
+                    await self.queue.release(session, self.worker_id)
+            except Exception as e:
+                logger.error(f"Error al liberar los trabajos de {self.worker_id}: {e}")
+        logger.info(f"Trabajador {self.worker_id} terminado: {self.stats}")
+        return self.stats
+
+async def coordinate(queue, pages=COORDINATOR_SEED_PAGES, reset=False, wait=False, interval=5.0):
+    """
+    Coordinador: siembra la cola con las primeras `pages` páginas del listado y, con `wait`, espera a que
+    los trabajadores la vacíen mostrando el progreso y recuperando los trabajos de los trabajadores caídos.
+
+    Las páginas se siembran por adelantado para que los trabajadores empiecen en paralelo; cada página con
+    enlace "next" encola la siguiente, así que el listado se recorre entero aunque tenga más páginas.
+
+    Args:
+        queue (WorkQueue): Cola de trabajos.
+        pages (int): Páginas del listado que se siembran.
+        reset (bool): Borrar antes todos los trabajos (para repetir un crawl terminado).
+        wait (bool): Esperar a que la cola se vacíe.
+        interval (float): Segundos entre informes de progreso.
+
+    Returns:
+        dict: Estado final de la cola.
+    """
+    added = await queue.seed([page_job(page) for page in range(1, max(1, int(pages)) + 1)], reset=reset)
+    print(f"Cola sembrada: {added} páginas nuevas")
+    stats = await queue.stats()
+    while wait:
+        async with queue.session_factory() as session:
+            await queue.reclaim_expired(session)
+            remaining = await queue.remaining(session)
+            stats = await queue.stats(session)
+        print(f"Cola: {remaining} trabajos por terminar · {stats}")
+        if not remaining:
+            break
+        await asyncio.sleep(interval)
+    return stats
@@ -0,0 +1,199 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from src.utils.logger import logger
+from src.utils.constants import URL_BASE, URL_PAGE, MAX_CONCURRENCY, CRAWL_MAX_CONSECUTIVE_FAILURES, CRAWL_PAGE_RETRIES
+
+class PageCrawler:
+    """
+    Motor asíncrono para descargar las páginas del listado de citas de forma concurrente.
+
+    Las páginas se descargan fuera de orden, con un máximo de `concurrency` peticiones en vuelo,
+    pero se entregan siempre en orden (page/1, page/2, ...).
+
+    Hay dos estrategias para descubrir nuevas páginas:
+        - "speculative": descarga por adelantado las páginas siguientes hasta que una de ellas no supera `has_data`.
+        - "next": solo programa la página siguiente cuando la actual contiene el enlace "next".
+
+    Una página cuya descarga falla (ya agotados los reintentos del cliente HTTP) no marca el final del
+    listado: el recorrido continúa con las siguientes y la página se vuelve a pedir (hasta `retries` veces)
+    en cuanto otra descarga tiene éxito, o al final del recorrido si no queda nada más en vuelo. Las páginas
+    posteriores esperan a que se resuelva para entregarse en orden. Si sigue fallando, se registra en
+    `failed` y se salta. Solo si fallan `max_failures` páginas nuevas seguidas (p. ej. el servidor ha caído)
+    se detiene el recorrido.
+
+    Atributos:
+        fetch (Callable[[str], Awaitable[str]]): Corrutina que descarga una URL y devuelve su HTML.
+        parse (Callable[[str], Any]): Función que convierte el HTML en un árbol (p. ej. BeautifulSoup).
+        has_data (Callable[[Any], bool]): Indica si la página contiene citas.
+        has_next (Callable[[Any], bool]): Indica si la página contiene el enlace "next" (modo "next").
+        concurrency (int): Número máximo de páginas descargándose a la vez.
+        discovery (str): Estrategia de descubrimiento, "speculative" o "next".
+        max_failures (int): Número de páginas fallidas seguidas que detienen el recorrido.
+        retries (int): Veces que se vuelve a pedir una página fallida.
+        failed (List[int]): Páginas que no se pudieron descargar (ni al reintentarlas).
+    """
+
+    def __init__(self, fetch, parse, has_data, has_next=None, base_url=URL_BASE,
+                 concurrency=MAX_CONCURRENCY, discovery="speculative", max_failures=CRAWL_MAX_CONSECUTIVE_FAILURES,
+                 retries=CRAWL_PAGE_RETRIES):
+        if discovery not in ("speculative", "next"):
+            raise ValueError(f"Estrategia de descubrimiento desconocida: {discovery}")
+        if discovery == "next" and has_next is None:
+            raise ValueError("La estrategia 'next' necesita la función 'has_next'")
+        self.fetch = fetch
+        self.parse = parse
+        self.has_data = has_data
+        self.has_next = has_next
+        self.base_url = base_url
+        self.concurrency = max(1, int(concurrency))
+        self.discovery = discovery
+        self.max_failures = max(1, int(max_failures))
+        self.retries = max(0, int(retries))
+        self.failed = []
+
+    def page_url(self, page):
+        """
+        Construye la URL de una página del listado.
+
+        Args:
+            page (int): Número de página.
+
+        Returns:
+            str: La URL completa de la página.
+        """
+        return f"{self.base_url}{URL_PAGE}{page}"
+
+    async def _fetch_page(self, page):
+        """
+        Descarga y analiza una página. Devuelve `None` como árbol si la petición falla.
+
+        Args:
+            page (int): Número de página.
+
+        Returns:
+            tuple: (page, árbol o None, error o None)
+        """
+        try:
+            html = await self.fetch(self.page_url(page))
+            return page, self.parse(html), None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error al obtener la página {page}: {e}")
+            return page, None, e
+
+    async def crawl(self):
+        """
+        Recorre el listado y entrega las páginas con datos en orden.
+
+        Yields:
+            tuple: (número de página, árbol de la página)
+        """
+        pending = {}  # Página -> tarea en vuelo
+        ready = {}  # Páginas descargadas que esperan su turno para ser entregadas
+        next_to_schedule = 1
+        next_to_yield = 1
+        last_page = None  # Primera página sin datos: el listado termina antes de ella
+        skipped = set()  # Páginas fallidas que se saltan al entregar
+        retry = []  # Páginas fallidas que se volverán a pedir
+        attempts = {}  # Página -> descargas fallidas
+        streak = 0  # Descargas fallidas seguidas
+        known_max = 1  # Última página cuya existencia conocemos (modo "next")
+        discarded = []  # Tareas canceladas al conocerse el final, que se esperan al terminar
+
+        def discard_after(limit):
+            """Descarta las páginas posteriores al final del listado (que pueden haber terminado ya)."""
+            for extra in [p for p in pending if p > limit]:
+                task = pending.pop(extra, None)
+                if task is not None:
+                    task.cancel()
+                    discarded.append(task)
+            for extra in [p for p in ready if p > limit]:
+                ready.pop(extra, None)
+            retry[:] = [p for p in retry if p <= limit]
+
+        try:
+            while True:
+                # Programa descargas mientras haya hueco: primero las páginas fallidas, si el servidor ya ha
+                # respondido bien después del fallo o no queda nada más en vuelo; luego las nuevas, si no se
+                # conoce el final
+                while len(pending) < self.concurrency:
+                    if retry and (streak == 0 or not pending):
+                        page = retry.pop(0)
+                    elif last_page is None and (self.discovery == "speculative" or next_to_schedule <= known_max):
+                        page = next_to_schedule
+                        next_to_schedule += 1
+                    else:
+                        break
+                    pending[page] = asyncio.create_task(self._fetch_page(page))
+
+                # Entrega en orden todo lo que ya esté disponible
+                while next_to_yield in ready or next_to_yield in skipped:
+                    if next_to_yield in ready:
+                        yield next_to_yield, ready.pop(next_to_yield)
+                    next_to_yield += 1
+
+                if last_page is not None and next_to_yield >= last_page:
+                    break
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    page, tree, error = task.result()
+                    if pending.pop(page, None) is None:
+                        continue  # Ya descartada al conocerse el final del listado
+                    if error is not None:
+                        if last_page is not None and page > last_page:
+                            continue
+                        attempts[page] = attempts.get(page, 0) + 1
+                        if attempts[page] > 1:
+                            # Un reintento fallido no cuenta para la racha: no indica dónde termina el listado
+                            if attempts[page] > self.retries:
+                                self.failed.append(page)
+                                skipped.add(page)
+                            else:
+                                retry.append(page)
+                            continue
+                        streak += 1
+                        if streak >= self.max_failures:
+                            logger.error(f"{streak} páginas fallidas seguidas: se detiene el recorrido en la página {page}")
+                            self.failed.append(page)
+                            last_page = page
+                            discard_after(last_page)
+                            continue
+                        # Se desconoce su contenido: en modo "next" se supone que hay siguiente
+                        known_max = max(known_max, page + 1)
+                        if self.retries:
+                            retry.append(page)
+                        else:
+                            self.failed.append(page)
+                            skipped.add(page)
+                        continue
+                    streak = 0
+                    if not self.has_data(tree):
+                        if last_page is None or page < last_page:
+                            last_page = page
+                        # Las páginas posteriores al final ya no son necesarias
+                        discard_after(last_page)
+                        continue
+                    if last_page is not None and page > last_page:
+                        continue
+                    ready[page] = tree
+                    if self.discovery == "next" and self.has_next(tree):
+                        known_max = max(known_max, page + 1)
+        finally:
+            tasks = [*pending.values(), *discarded]
+            for task in tasks:
+                task.cancel()
+            # Se espera a que terminen de cancelarse, para no dejar descargas huérfanas al cerrar el bucle
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Las páginas fallidas posteriores al final del listado no se han perdido
+            if last_page is not None:
+                self.failed[:] = [p for p in self.failed if p <= last_page]
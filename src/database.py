@@ -1,13 +1,15 @@
 import os
+import threading
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import declarative_base
 from sqlalchemy import text
-from dotenv import load_dotenv
+from src.utils.environment import load_environment
+from src.utils.constants import DB_POOL_SIZE, DB_MAX_OVERFLOW
 
 
-# Cargar variables de entorno
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
+# Las variables de entorno del archivo .env se cargan con `load_environment` antes de leer la
+# configuración: el esquema (aquí), las constantes y la cadena de conexión.
+load_environment()
 
 # Configuración del esquema
 db_schema = os.getenv('DB_SCHEMA', 'quotes')  # Valor por defecto si DB_SCHEMA no está definido
@@ -15,25 +17,79 @@ db_schema = os.getenv('DB_SCHEMA', 'quotes')  # Valor por defecto si DB_SCHEMA n
 metadata = MetaData(schema=db_schema)
 Base = declarative_base(metadata=metadata)
 
-# Cadena de conexión 
-db_type = os.getenv('DB_TYPE', 'postgresql+asyncpg')
-db_host = os.getenv('DB_HOST', 'postgres')
-db_port = os.getenv('DB_PORT', '5432')
-db_name = os.getenv('DB_NAME', 'quotes')
-db_user = os.getenv('DB_USER', 'postgres')
-db_pass = os.getenv('DB_PASSWORD', 'postgres')
+def database_url():
+    """
+    Cadena de conexión a partir de las variables de entorno DB_*.
 
-database_url = f"{db_type}://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
-# print(f"DATA BASE URL: {database_url}")
+    Returns:
+        str: La URL de la base de datos.
+    """
+    load_environment()
+    db_type = os.getenv('DB_TYPE', 'postgresql+asyncpg')
+    db_host = os.getenv('DB_HOST', 'postgres')
+    db_port = os.getenv('DB_PORT', '5432')
+    db_name = os.getenv('DB_NAME', 'quotes')
+    db_user = os.getenv('DB_USER', 'postgres')
+    db_pass = os.getenv('DB_PASSWORD', 'postgres')
+    return f"{db_type}://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
 
-# Crear motor asíncrono
-engine = create_async_engine(database_url, echo=True)
+# Motor y fábrica de sesiones, creados con el primer uso
+_engine = None
+_sessionmaker = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """
+    Devuelve el motor asíncrono, creándolo la primera vez.
+
+    Crear el motor importa SQLAlchemy asyncio y el driver (asyncpg), así que los comandos que no usan
+    la base de datos no pagan ese coste. El pool admite `DB_POOL_SIZE` conexiones (más `DB_MAX_OVERFLOW`
+    temporales), suficientes para las `DB_WRITERS` sesiones de la escritura en paralelo.
+
+    Returns:
+        AsyncEngine: El motor de la base de datos.
+    """
+    global _engine, _sessionmaker
+    with _engine_lock:
+        if _engine is None:
+            from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+            from sqlalchemy.orm import sessionmaker
+            # DB_ECHO=1 muestra cada sentencia SQL; para perfilar las consultas es mejor SQL_PROFILE
+            db_echo = os.getenv('DB_ECHO', '').lower() in ('1', 'true', 'yes')
+            _engine = create_async_engine(database_url(), echo=db_echo, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+            _sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=_engine, class_=AsyncSession)
+        return _engine
+
+async def dispose_engine():
+    """Cierra las conexiones del motor, si se llegó a crear."""
+    if _engine is not None:
+        await _engine.dispose()
+
+class LazySessionFactory:
+    """
+    Fábrica de sesiones asíncronas que crea el motor con la primera sesión.
+
+    Se usa igual que el `sessionmaker` al que delega: `async with SessionLocal() as session: ...`.
+    """
+
+    def __call__(self, **kwargs):
+        get_engine()
+        return _sessionmaker(**kwargs)
+
+    def __repr__(self):
+        return f"<LazySessionFactory engine={'creado' if _engine is not None else 'pendiente'}>"
 
 # Crear una clase de sesión asíncrona
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+SessionLocal = LazySessionFactory()
+
+def __getattr__(name):
+    """`database.engine` sigue disponible: devuelve el motor, creándolo si hace falta."""
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def init_db():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         try:
             # Establecer el search_path al esquema deseado usando SQL raw
             await conn.execute(text(f'SET search_path TO {db_schema}'))
@@ -45,6 +101,5 @@ async def init_db():
             raise
 
 async def shutdown_db():
-    # El método dispose no es asíncrono y no necesita ser utilizado en un contexto de async with
-    engine.dispose()
+    await dispose_engine()
     print("Base de datos cerrada correctamente.")
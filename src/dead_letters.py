@@ -0,0 +1,169 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+from sqlalchemy import func, delete
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from models import DeadLetter
+from quote import Quote
+from database import SessionLocal
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import DEAD_LETTER_BATCH_SIZE
+
+def describe(error):
+    """Texto de un error de escritura: el del driver si lo hay (sin la sentencia SQL ni sus parámetros)."""
+    error = getattr(error, "orig", None) or error
+    return f"{type(error).__name__}: {error}"
+
+class DeadLetterStore:
+    """
+    Almacén de las citas que no se han podido guardar (tabla `dead_letters` del esquema `quotes`).
+
+    Los escritores (`BulkWriter` y el modo "orm" de `Scraper.save_quotes_to_db`) escriben cada cita o grupo
+    de citas en un savepoint. Si falla, deshacen solo ese savepoint y guardan aquí la cita con sus datos en
+    bruto (JSON) y el error, en la misma transacción que el resto del lote: cada cita queda guardada o en
+    dead letters, nunca perdida, y el lote sigue adelante.
+
+    `replay` reprocesa las citas guardadas (p. ej. después de corregir el payload o el esquema).
+
+    Atributos:
+        batch_size (int): Citas por transacción al reprocesar.
+        failed (int): Citas enviadas a dead letters por este almacén.
+    """
+
+    def __init__(self, batch_size=DEAD_LETTER_BATCH_SIZE):
+        self.batch_size = max(1, int(batch_size))
+        self.failed = 0
+
+    @staticmethod
+    def payload(quote):
+        """
+        Datos en bruto de una cita, en JSON, con los mismos argumentos que recibe `Quote`.
+
+        Args:
+            quote (Quote): La cita.
+
+        Returns:
+            str: El payload.
+        """
+        return json.dumps({
+            "text": quote.text,
+            "author": quote.author,
+            "birthdate": quote.birthdate.strftime('%B %d, %Y') if quote.birthdate else None,
+            "tags": list(quote.tags),
+            "birthplace": quote.birthplace,
+            "description": quote.description,
+        })
+
+    @staticmethod
+    def quote(payload):
+        """
+        Reconstruye la cita de un payload.
+
+        Args:
+            payload (str): Payload JSON generado por `payload`.
+
+        Returns:
+            Quote: La cita.
+        """
+        data = json.loads(payload)
+        return Quote(data["text"], data["author"], data.get("birthdate"), data.get("tags") or [],
+                     data.get("birthplace"), data.get("description"))
+
+    async def _insert(self, session, payload, error):
+        """Guarda un payload y su error en la transacción en curso."""
+        await session.execute(insert(DeadLetter).values(payload=payload, error=describe(error)))
+        self.failed += 1
+        metrics.inc("dead_letters_total")
+
+    async def add(self, session, quote, error):
+        """
+        Guarda una cita que no se ha podido escribir, en la transacción en curso (sin commit).
+
+        Args:
+            session (AsyncSession): Sesión del escritor; el savepoint de la cita ya debe estar deshecho.
+            quote (Quote): La cita.
+            error (Exception): El error de la escritura.
+        """
+        logger.error(f"Cita enviada a dead letters ({quote.author}): {describe(error)}")
+        await self._insert(session, self.payload(quote), error)
+
+    async def count(self, session_factory=SessionLocal):
+        """Número de citas en dead letters."""
+        async with session_factory() as session:
+            return (await session.execute(select(func.count()).select_from(DeadLetter))).scalar()
+
+    async def latest(self, limit, session_factory=SessionLocal):
+        """
+        Últimas citas enviadas a dead letters.
+
+        Returns:
+            List[Row]: Filas (id, payload, error, created_at), de la más reciente a la más antigua.
+        """
+        async with session_factory() as session:
+            result = await session.execute(
+                select(DeadLetter.id, DeadLetter.payload, DeadLetter.error, DeadLetter.created_at)
+                .order_by(DeadLetter.id.desc()).limit(limit)
+            )
+            return result.all()
+
+    async def replay(self, limit=None, session_factory=SessionLocal):
+        """
+        Reprocesa las citas en dead letters, en transacciones de `batch_size` citas.
+
+        En cada transacción reclama las filas con `FOR UPDATE SKIP LOCKED` (dos ejecuciones a la vez no
+        reprocesan la misma cita), las borra y guarda sus citas con un `BulkWriter`; las que vuelven a fallar
+        vuelven a dead letters con el nuevo error. Solo se reprocesan las filas que existían al empezar, de
+        modo que una cita que sigue fallando se intenta una vez por ejecución.
+
+        Args:
+            limit (int, opcional): Máximo de citas a reprocesar (por defecto, todas).
+            session_factory (Callable): Fábrica de sesiones asíncronas de SQLAlchemy.
+
+        Returns:
+            dict: Citas reprocesadas, guardadas y que han vuelto a fallar.
+        """
+        from bulk_writer import BulkWriter
+        from dimension_cache import DimensionCache
+
+        stats = {"replayed": 0, "saved": 0, "failed": 0}
+        async with session_factory() as session:
+            last_id = (await session.execute(select(func.max(DeadLetter.id)))).scalar()
+            if last_id is None:
+                return stats
+            cache = DimensionCache()
+            await cache.warm(session)
+            writer = BulkWriter(batch_size=self.batch_size, cache=cache, dead_letters=self)
+            after = 0
+            while limit is None or stats["replayed"] < limit:
+                size = self.batch_size if limit is None else min(self.batch_size, limit - stats["replayed"])
+                rows = (await session.execute(
+                    select(DeadLetter.id, DeadLetter.payload)
+                    .where(DeadLetter.id > after, DeadLetter.id <= last_id)
+                    .order_by(DeadLetter.id).limit(size).with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    break
+                after = rows[-1].id
+                failed = self.failed
+                try:
+                    await session.execute(delete(DeadLetter).where(DeadLetter.id.in_([row.id for row in rows])))
+                    quotes = []
+                    for row in rows:
+                        try:
+                            quotes.append(self.quote(row.payload))
+                        except Exception as e:
+                            await self._insert(session, row.payload, e)  # Payload que ya no es una cita válida
+                    stats["saved"] += await writer.save(session, quotes)
+                    await session.commit()
+                except Exception as e:
+                    logger.error(f"Error al reprocesar las dead letters: {e}")
+                    await session.rollback()
+                    raise
+                stats["replayed"] += len(rows)
+                stats["failed"] += self.failed - failed
+        return stats
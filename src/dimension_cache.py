@@ -0,0 +1,148 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from models import Author, Tag, Birthdate, Birthplace
+from sql_profiler import operation
+from src.utils.logger import logger
+
+# Dimensiones cacheadas: nombre -> (modelo, columna con el valor natural)
+DIMENSIONS = {
+    "birthdate": (Birthdate, "birthdate"),
+    "birthplace": (Birthplace, "birthplace"),
+    "author": (Author, "name"),
+    "tag": (Tag, "tag"),
+}
+
+class DimensionCache:
+    """
+    Mapa de identidad de los IDs de las dimensiones (fechas, lugares, autores y etiquetas) compartido
+    por todas las escrituras de una ejecución.
+
+    Los IDs obtenidos dentro de una transacción quedan como pendientes hasta el commit; si la
+    transacción se deshace, los pendientes se descartan, porque esas filas ya no existen. Quien abre un
+    savepoint guarda antes los pendientes (`savepoint`) y, si lo deshace, los restaura (`rollback_to`).
+
+    Atributos:
+        hits (int): Número de valores resueltos sin consultar la base de datos.
+        misses (int): Número de valores que no estaban en caché.
+    """
+
+    def __init__(self):
+        self._committed = {name: {} for name in DIMENSIONS}
+        self._pending = {name: {} for name in DIMENSIONS}
+        self.hits = 0
+        self.misses = 0
+
+    def copy(self):
+        """
+        Nueva caché con los IDs ya confirmados de esta, sin pendientes ni sesiones vinculadas.
+
+        Sirve para dar a cada escritor en paralelo su propia caché sin volver a precargarla: los IDs
+        pendientes son de la transacción en curso de una sesión y no pueden compartirse entre sesiones.
+
+        Returns:
+            DimensionCache: La copia.
+        """
+        cache = DimensionCache()
+        for name, committed in self._committed.items():
+            cache._committed[name].update(committed)
+        return cache
+
+    def get(self, dimension, value):
+        """
+        Devuelve el ID de un valor de la dimensión, o None si no está en caché.
+
+        Args:
+            dimension (str): Nombre de la dimensión ("birthdate", "birthplace", "author" o "tag").
+            value: Valor natural (fecha, lugar, nombre o etiqueta).
+
+        Returns:
+            int | None: El ID del valor.
+        """
+        found = self._pending[dimension].get(value)
+        if found is None:
+            found = self._committed[dimension].get(value)
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def put(self, dimension, value, id_):
+        """Registra el ID de un valor obtenido en la transacción en curso."""
+        self._pending[dimension][value] = id_
+
+    def commit(self):
+        """Consolida los IDs pendientes tras un commit."""
+        for name, pending in self._pending.items():
+            self._committed[name].update(pending)
+            pending.clear()
+
+    def rollback(self):
+        """Descarta los IDs pendientes tras un rollback."""
+        for pending in self._pending.values():
+            pending.clear()
+
+    def savepoint(self):
+        """
+        Copia de los IDs pendientes antes de abrir un savepoint, para restaurarla con `rollback_to`.
+
+        Returns:
+            dict: Los IDs pendientes de cada dimensión.
+        """
+        return {name: dict(pending) for name, pending in self._pending.items()}
+
+    def rollback_to(self, snapshot):
+        """
+        Restaura los IDs pendientes de antes de un savepoint que se ha deshecho: los obtenidos dentro del
+        savepoint ya no existen y los anteriores siguen siendo válidos en la transacción.
+
+        Args:
+            snapshot (dict): Copia devuelta por `savepoint`.
+        """
+        for name, pending in self._pending.items():
+            pending.clear()
+            pending.update(snapshot[name])
+
+    def bind(self, session: AsyncSession):
+        """
+        Sincroniza la caché con las transacciones de una sesión (commit y rollback).
+
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+        """
+        sync_session = session.sync_session
+        # Los listeners son métodos de la caché: SQLAlchemy los reconoce si ya están registrados en la sesión
+        if not event.contains(sync_session, "after_commit", self._after_commit):
+            event.listen(sync_session, "after_commit", self._after_commit)
+        if not event.contains(sync_session, "after_rollback", self._after_rollback):
+            event.listen(sync_session, "after_rollback", self._after_rollback)
+
+    def _after_commit(self, session):
+        """Listener del evento `after_commit` de las sesiones vinculadas."""
+        self.commit()
+
+    def _after_rollback(self, session):
+        """Listener del evento `after_rollback` de las sesiones vinculadas."""
+        self.rollback()
+
+    async def warm(self, session: AsyncSession):
+        """
+        Precarga todas las dimensiones existentes con una consulta por tabla.
+
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+        """
+        try:
+            with operation("DimensionCache.warm"):
+                for name, (model, column) in DIMENSIONS.items():
+                    result = await session.execute(select(getattr(model, column), model.id))
+                    self._committed[name].update(result.all())  # Valores únicos por restricción UNIQUE
+        except Exception as e:
+            logger.error(f"Error al precargar la caché de dimensiones: {e}")
+            raise
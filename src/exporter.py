@@ -0,0 +1,262 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import contextlib
+import csv
+import json
+import time
+from sqlalchemy import func, text
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from models import QuoteDetail, ExportState
+from database import get_engine
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import EXPORT_BATCH_SIZE, EXPORT_PARQUET_COMPRESSION
+
+# Columnas exportadas de cada cita
+COLUMNS = ("id", "citation", "author", "tags")
+
+class JsonlSink:
+    """
+    Escribe una cita por línea en JSON, con las etiquetas como lista.
+
+    Las líneas se componen a mano: solo se codifican los textos, y los autores y las etiquetas (que se
+    repiten mucho) se codifican una vez y se reutilizan.
+    """
+
+    split_tags = True
+
+    def __init__(self, file):
+        self._file = file
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self._encoded = {}
+
+    def _cached(self, value):
+        """Autor o etiqueta codificado en JSON, reutilizando el de las filas anteriores."""
+        encoded = self._encoded.get(value)
+        if encoded is None:
+            encoded = self._encoded[value] = self._encode(value)
+        return encoded
+
+    def write(self, rows):
+        encode, cached = self._encode, self._cached
+        self._file.write("".join(
+            f'{{"id": {id_}, "citation": {encode(citation)}, "author": {cached(author)}, '
+            f'"tags": [{", ".join(map(cached, tags or ()))}]}}\n'
+            for id_, citation, author, tags in rows
+        ))
+
+    def close(self):
+        self._file.flush()
+
+class CsvSink:
+    """Escribe las citas en CSV con cabecera, con las etiquetas separadas por comas (como `view_quote_details`)."""
+
+    split_tags = False
+
+    def __init__(self, file):
+        self._file = file
+        self._writer = csv.writer(file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.flush()
+
+class ParquetSink:
+    """
+    Escribe las citas en Parquet, un grupo de filas por lote.
+
+    El autor es una columna de diccionario y las etiquetas una lista de valores de diccionario: cada nombre
+    y cada etiqueta se guardan una vez por grupo de filas y las filas solo guardan su índice.
+    """
+
+    split_tags = True
+
+    def __init__(self, file, compression=EXPORT_PARQUET_COMPRESSION):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(f"La exportación a Parquet necesita el paquete 'pyarrow': {e}")
+        self._pa = pa
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        self._schema = pa.schema([
+            ("id", pa.int64()),
+            ("citation", pa.string()),
+            ("author", dictionary),
+            ("tags", pa.list_(dictionary)),
+        ])
+        self._writer = pq.ParquetWriter(file, self._schema, compression=compression,
+                                        use_dictionary=["author", "tags.list.element"])
+
+    def write(self, rows):
+        pa = self._pa
+        columns = list(zip(*rows))
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, self._schema)]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema), row_group_size=len(rows))
+
+    def close(self):
+        self._writer.close()
+
+# Formatos admitidos: nombre -> (clase, modo de apertura del fichero)
+SINKS = {"parquet": (ParquetSink, "wb"), "jsonl": (JsonlSink, "w"), "csv": (CsvSink, "w")}
+
+def detect_format(path):
+    """
+    Deduce el formato de exportación de la extensión del fichero.
+
+    Args:
+        path (str): Ruta del fichero.
+
+    Returns:
+        str: "parquet", "jsonl" o "csv".
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    extension = {"pq": "parquet", "json": "jsonl", "ndjson": "jsonl"}.get(extension, extension)
+    if extension not in SINKS:
+        raise ValueError(f"No se puede deducir el formato de exportación de {path}: indique parquet, jsonl o csv")
+    return extension
+
+class QuoteExporter:
+    """
+    Exportación en streaming del corpus de citas (`quote_details`) a Parquet, JSONL o CSV.
+
+    Las filas se leen con un cursor del servidor en lotes de `batch_size` y cada lote se escribe en cuanto
+    llega, de modo que la memoria no depende del tamaño del corpus. El cursor es el de asyncpg (la consulta
+    se compila desde los modelos): las filas llegan como registros de asyncpg, sin pasar por las filas de
+    SQLAlchemy, que costaban más que la propia escritura. Para JSONL y Parquet las etiquetas se leen como
+    lista (`tag_list`, calculada con `ARRAY_AGG` junto a `tags`), de modo que una etiqueta con comas sigue entera.
+
+    Exportación incremental: cada exportación con nombre guarda en `export_state` el xmin del snapshot
+    con el que leyó (la transacción más antigua que aún no podía ver). La siguiente exporta solo las filas
+    escritas por transacciones con ID mayor o igual: ninguna escritura se pierde aunque se confirme durante
+    la exportación, y alguna fila puede exportarse dos veces (el consumidor se queda con la última por `id`).
+    Las citas borradas no aparecen en las exportaciones incrementales.
+
+    Atributos:
+        engine (AsyncEngine): Motor de la base de datos (por defecto, el de `database`).
+        batch_size (int): Filas por lote.
+    """
+
+    def __init__(self, engine=None, batch_size=EXPORT_BATCH_SIZE):
+        self.engine = engine or get_engine()
+        self.batch_size = max(1, int(batch_size))
+
+    def _statement(self, split_tags, since):
+        """Consulta de las filas a exportar."""
+        tags = QuoteDetail.tag_list if split_tags else QuoteDetail.tags
+        stmt = select(QuoteDetail.quote_id, QuoteDetail.citation, QuoteDetail.author, tags)
+        if since is not None:
+            stmt = stmt.where(QuoteDetail.txid >= since)
+        return stmt.order_by(QuoteDetail.quote_id)
+
+    async def _batches(self, conn, stmt):
+        """Lotes de `batch_size` filas de `stmt`, leídos con un cursor de asyncpg en la transacción de `conn`."""
+        compiled = stmt.compile(dialect=conn.dialect)
+        params = [compiled.params[name] for name in compiled.positiontup]
+        raw = await conn.get_raw_connection()
+        cursor = await raw.driver_connection.cursor(str(compiled), *params)
+        # El lote siguiente se pide antes de devolver el actual: el servidor lo prepara mientras se escribe
+        pending = asyncio.ensure_future(cursor.fetch(self.batch_size))
+        try:
+            while True:
+                rows = await pending
+                if not rows:
+                    return
+                pending = asyncio.ensure_future(cursor.fetch(self.batch_size))
+                yield rows
+        finally:
+            if not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+
+    async def export(self, path, fmt=None, incremental=None, on_batch=None):
+        """
+        Exporta las citas a un fichero (o a la salida estándar con `path="-"`, en JSONL o CSV).
+
+        El fichero se escribe con un nombre temporal y se renombra al terminar, así que nunca queda una
+        exportación a medias con el nombre definitivo. La marca de agua de una exportación incremental
+        solo se actualiza si el fichero se ha escrito entero.
+
+        Args:
+            path (str): Ruta del fichero de salida.
+            fmt (str, opcional): "parquet", "jsonl" o "csv" (por defecto, según la extensión de `path`).
+            incremental (str, opcional): Nombre de la exportación incremental; solo se exportan las citas
+                nuevas o modificadas desde la anterior exportación con ese nombre.
+            on_batch (Callable[[int], None], opcional): Se llama tras escribir cada lote con las filas escritas.
+
+        Returns:
+            dict: Filas, segundos, filas/s, bytes escritos y marcas de agua (transacciones) desde/hasta.
+        """
+        fmt = fmt or detect_format(path)
+        if fmt not in SINKS:
+            raise ValueError(f"Formato de exportación desconocido: {fmt}")
+        sink_class, mode = SINKS[fmt]
+        to_stdout = path == "-"
+        if to_stdout and fmt == "parquet":
+            raise ValueError("La exportación a Parquet necesita un fichero")
+        temporary = None if to_stdout else f"{path}.tmp"
+        start = time.perf_counter()
+        rows = 0
+        since = until = None
+        try:
+            # REPEATABLE READ: la marca de agua y el cursor usan el mismo snapshot
+            async with self.engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+                until = (await conn.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::BIGINT"))).scalar()
+                if incremental:
+                    since = (await conn.execute(
+                        select(ExportState.since_txid).where(ExportState.name == incremental)
+                    )).scalar()
+                if temporary:
+                    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                file = sys.stdout if to_stdout else open(temporary, mode, **({} if "b" in mode else {"encoding": "utf-8", "newline": ""}))
+                try:
+                    sink = sink_class(file)
+                    # aclosing: si falla la escritura, el generador se cierra aquí (y con él la lectura pendiente
+                    # del cursor) antes de deshacer la transacción, y no cuando lo recoja el recolector de basura
+                    batches = self._batches(conn, self._statement(sink_class.split_tags, since))
+                    async with contextlib.aclosing(batches):
+                        async for partition in batches:
+                            with metrics.timer("export_batch_seconds", format=fmt):
+                                # En un hilo, para que el bucle de eventos siga recibiendo el lote siguiente
+                                await asyncio.to_thread(sink.write, partition)
+                            rows += len(partition)
+                            metrics.inc("export_rows_total", len(partition), format=fmt)
+                            if on_batch:
+                                on_batch(rows)
+                    sink.close()
+                finally:
+                    if not to_stdout:
+                        file.close()
+                if temporary:
+                    os.replace(temporary, path)
+                if incremental:
+                    stmt = insert(ExportState).values(name=incremental, since_txid=until, rows=rows)
+                    await conn.execute(stmt.on_conflict_do_update(
+                        index_elements=[ExportState.name],
+                        set_={"since_txid": stmt.excluded.since_txid, "rows": stmt.excluded.rows, "exported_at": func.now()},
+                    ))
+                await conn.commit()
+        except Exception as e:
+            logger.error(f"Error al exportar las citas a {path}: {e}")
+            if temporary and os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        seconds = time.perf_counter() - start
+        return {
+            "format": fmt,
+            "rows": rows,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds, 1) if seconds else None,
+            "bytes": None if to_stdout else os.path.getsize(path),
+            "since_txid": since,
+            "until_txid": until,
+        }
@@ -0,0 +1,262 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.constants import PARSER_BACKEND
+
+# Valores por defecto cuando la página "about" no contiene algún dato
+NO_AUTHOR_DETAILS = {
+    "author_title": "No title found",
+    "author_birthdate": "No birth date found",
+    "author_birthplace": "No birth location found",
+    "author_description": "No description found"
+}
+
+# Selectores de cada campo de la página "about": clave del diccionario -> (etiqueta, clase)
+AUTHOR_FIELDS = {
+    "author_title": ("h3", "author-title"),
+    "author_birthdate": ("span", "author-born-date"),
+    "author_birthplace": ("span", "author-born-location"),
+    "author_description": ("div", "author-description"),
+}
+
+ABOUT_TEXT = "(about)"
+
+def clean_tag(tag):
+    """
+    Normaliza una etiqueta como se guarda en la base de datos ("life" -> "Life").
+
+    Args:
+        tag (str): La etiqueta.
+
+    Returns:
+        str: La etiqueta sin espacios alrededor y con la primera letra en mayúscula.
+    """
+    return str(tag).strip().capitalize()
+
+class QuoteExtractor:
+    """
+    Interfaz común de los motores de análisis HTML.
+
+    Todos los motores producen exactamente la misma salida:
+        - `quotes(doc)` devuelve tuplas (texto, autor, etiquetas, about_url).
+        - `author_details(html)` devuelve el diccionario de la página "about".
+
+    Métodos:
+        parse(html): Convierte el HTML en un documento del motor.
+        has_data(doc): Indica si la página contiene citas.
+        has_next(doc): Indica si la página contiene el enlace "next".
+        header(doc): Devuelve el texto del primer H1 o None.
+        quotes(doc): Extrae las citas de la página.
+        author_details(html): Extrae la información del autor de la página "about".
+        release(doc): Libera la memoria del documento.
+    """
+
+    name = None
+
+    def parse(self, html):
+        raise NotImplementedError
+
+    def has_data(self, doc):
+        raise NotImplementedError
+
+    def has_next(self, doc):
+        raise NotImplementedError
+
+    def header(self, doc):
+        raise NotImplementedError
+
+    def quotes(self, doc):
+        raise NotImplementedError
+
+    def author_details(self, html):
+        raise NotImplementedError
+
+    def release(self, doc):
+        """Libera la memoria del documento (por defecto no hace nada)."""
+
+    @staticmethod
+    def _entry(text, author, tags, about_url):
+        """Normaliza los datos de una cita igual que en todos los motores."""
+        return (text.strip(), author.strip(), [clean_tag(tag) for tag in tags], about_url)
+
+class Bs4Extractor(QuoteExtractor):
+    """
+    Motor basado en BeautifulSoup. Con `parser="html.parser"` es el comportamiento original
+    (Python puro); con `parser="lxml"` usa el analizador en C de lxml.
+    """
+
+    def __init__(self, parser="html.parser"):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+        self.parser = parser
+        self.name = "bs4" if parser == "html.parser" else f"bs4-{parser}"
+
+    def parse(self, html):
+        return self._soup(html, self.parser)
+
+    def has_data(self, doc):
+        return bool(doc.find('div', class_='quote'))
+
+    def has_next(self, doc):
+        return bool(doc.find('li', class_='next'))
+
+    def header(self, doc):
+        h1 = doc.find('h1')
+        return h1.text if h1 else None
+
+    def quotes(self, doc):
+        entries = []
+        for quote in doc.find_all('div', class_='quote'):
+            text = quote.find('span', class_='text').text
+            author = quote.find('small', class_='author').text
+            tags = [tag.text for tag in quote.find_all('a', class_='tag')]
+            about = quote.find('a', string=ABOUT_TEXT)
+            entries.append(self._entry(text, author, tags, about.get('href') if about else None))
+        return entries
+
+    def author_details(self, html):
+        details = self.parse(html).find('div', class_='author-details')
+        if not details:
+            return dict(NO_AUTHOR_DETAILS)
+        result = {}
+        for key, (tag, css_class) in AUTHOR_FIELDS.items():
+            node = details.find(tag, class_=css_class)
+            result[key] = node.text.strip() if node else NO_AUTHOR_DETAILS[key]
+        return result
+
+    def release(self, doc):
+        doc.decompose()
+
+class LxmlExtractor(QuoteExtractor):
+    """
+    Motor basado en lxml.html con selectores CSS precompilados (cssselect) a XPath.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        try:
+            import lxml.html
+            from lxml.cssselect import CSSSelector
+        except ImportError as e:
+            raise ImportError(f"El motor 'lxml' necesita los paquetes 'lxml' y 'cssselect': {e}")
+        self._fromstring = lxml.html.fromstring
+        self._quote = CSSSelector('div.quote')
+        self._text = CSSSelector('span.text')
+        self._author = CSSSelector('small.author')
+        self._tag = CSSSelector('a.tag')
+        self._link = CSSSelector('a')
+        self._next = CSSSelector('li.next')
+        self._h1 = CSSSelector('h1')
+        self._details = CSSSelector('div.author-details')
+        self._fields = {key: CSSSelector(f"{tag}.{css_class}") for key, (tag, css_class) in AUTHOR_FIELDS.items()}
+
+    def parse(self, html):
+        return self._fromstring(html)
+
+    def has_data(self, doc):
+        return bool(self._quote(doc))
+
+    def has_next(self, doc):
+        return bool(self._next(doc))
+
+    def header(self, doc):
+        h1 = self._h1(doc)
+        return h1[0].text_content() if h1 else None
+
+    def quotes(self, doc):
+        entries = []
+        for quote in self._quote(doc):
+            text = self._text(quote)[0].text_content()
+            author = self._author(quote)[0].text_content()
+            tags = [tag.text_content() for tag in self._tag(quote)]
+            about = next((a for a in self._link(quote) if a.text_content() == ABOUT_TEXT), None)
+            entries.append(self._entry(text, author, tags, about.get('href') if about is not None else None))
+        return entries
+
+    def author_details(self, html):
+        details = self._details(self.parse(html))
+        if not details:
+            return dict(NO_AUTHOR_DETAILS)
+        result = {}
+        for key, selector in self._fields.items():
+            nodes = selector(details[0])
+            result[key] = nodes[0].text_content().strip() if nodes else NO_AUTHOR_DETAILS[key]
+        return result
+
+    def release(self, doc):
+        doc.clear()
+
+class SelectolaxExtractor(QuoteExtractor):
+    """
+    Motor basado en selectolax (Lexbor), el más rápido de los disponibles.
+    """
+
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as e:
+            raise ImportError(f"El motor 'selectolax' necesita el paquete 'selectolax': {e}")
+        self._parser = LexborHTMLParser
+        self._fields = {key: f"{tag}.{css_class}" for key, (tag, css_class) in AUTHOR_FIELDS.items()}
+
+    def parse(self, html):
+        return self._parser(html)
+
+    def has_data(self, doc):
+        return doc.css_first('div.quote') is not None
+
+    def has_next(self, doc):
+        return doc.css_first('li.next') is not None
+
+    def header(self, doc):
+        h1 = doc.css_first('h1')
+        return h1.text() if h1 is not None else None
+
+    def quotes(self, doc):
+        entries = []
+        for quote in doc.css('div.quote'):
+            text = quote.css_first('span.text').text()
+            author = quote.css_first('small.author').text()
+            tags = [tag.text() for tag in quote.css('a.tag')]
+            about = next((a for a in quote.css('a') if a.text() == ABOUT_TEXT), None)
+            entries.append(self._entry(text, author, tags, about.attributes.get('href') if about is not None else None))
+        return entries
+
+    def author_details(self, html):
+        details = self.parse(html).css_first('div.author-details')
+        if details is None:
+            return dict(NO_AUTHOR_DETAILS)
+        result = {}
+        for key, selector in self._fields.items():
+            node = details.css_first(selector)
+            result[key] = node.text().strip() if node is not None else NO_AUTHOR_DETAILS[key]
+        return result
+
+# Motores disponibles por nombre
+EXTRACTORS = {
+    "bs4": lambda: Bs4Extractor("html.parser"),
+    "bs4-lxml": lambda: Bs4Extractor("lxml"),
+    "lxml": LxmlExtractor,
+    "selectolax": SelectolaxExtractor,
+}
+
+def get_extractor(name=None):
+    """
+    Crea el motor de análisis indicado.
+
+    Args:
+        name (str, opcional): Nombre del motor ("bs4", "bs4-lxml", "lxml" o "selectolax").
+            Por defecto se usa la variable de entorno `PARSER_BACKEND` o la constante `PARSER_BACKEND`.
+
+    Returns:
+        QuoteExtractor: El motor de análisis.
+    """
+    name = name or os.getenv('PARSER_BACKEND', PARSER_BACKEND)
+    if name not in EXTRACTORS:
+        raise ValueError(f"Motor de análisis desconocido: {name}. Opciones: {', '.join(EXTRACTORS)}")
+    return EXTRACTORS[name]()
@@ -0,0 +1,179 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import json
+import sqlite3
+import time
+from src.utils.logger import logger
+from src.utils.constants import FRONTIER_CHECKPOINT_INTERVAL
+
+# Estados de una URL en la frontera
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"
+
+class CrawlFrontier:
+    """
+    Frontera persistente (SQLite) de un crawl, para poder reanudarlo si el proceso muere.
+
+    Guarda dos cosas:
+        - El estado de cada URL del listado: pendiente, en vuelo o terminada. Una página solo se marca
+          como terminada junto con sus citas extraídas, en la misma transacción.
+        - Un checkpoint de las citas extraídas que todavía no se han guardado en la base de datos.
+          Se borran en cuanto el lote que las contiene se confirma en PostgreSQL, o en cuanto se descartan
+          (p. ej. una cita que no se puede construir), para que no cuenten como pendientes al reanudar.
+
+    Los cambios se confirman en disco como mucho cada `interval` segundos (y al cerrar). Si el
+    proceso muere entre dos checkpoints, las páginas no confirmadas se vuelven a descargar y las
+    citas ya guardadas se vuelven a escribir; las escrituras son idempotentes, así que no se duplican.
+
+    Al arrancar, las URL que quedaron "en vuelo" vuelven a estar pendientes. `finish()` vacía la
+    frontera cuando el crawl termina correctamente, de modo que la siguiente ejecución empieza de cero.
+
+    Atributos:
+        path (str): Ruta del fichero SQLite.
+        interval (float): Segundos máximos entre checkpoints.
+        resumed (bool): Indica si se ha reanudado un crawl interrumpido.
+    """
+
+    def __init__(self, path, interval=FRONTIER_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._last_commit = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS frontier ("
+                "url TEXT PRIMARY KEY, status TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoint ("
+                "content_hash TEXT PRIMARY KEY, url TEXT NOT NULL, entry TEXT NOT NULL)"
+            )
+            # Las URL que estaban en vuelo cuando murió el proceso vuelven a estar pendientes
+            self._db.execute("UPDATE frontier SET status = ? WHERE status = ?", (PENDING, IN_FLIGHT))
+            self._db.commit()
+            self._done = {url for (url,) in self._db.execute("SELECT url FROM frontier WHERE status = ?", (DONE,))}
+        except sqlite3.Error as e:
+            logger.error(f"Error al abrir la frontera del crawl: {e}")
+            raise
+        self.resumed = bool(self._done) or self.checkpointed() > 0
+        if self.resumed:
+            logger.info(f"Reanudando el crawl: {len(self._done)} páginas terminadas, {self.checkpointed()} citas pendientes de guardar")
+
+    @staticmethod
+    def _hash(text):
+        """Clave de una cita en el checkpoint (la misma que `Quote.content_hash`)."""
+        return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+    def _maybe_commit(self):
+        """Confirma los cambios en disco si ha pasado el intervalo desde el último checkpoint."""
+        if time.monotonic() - self._last_commit >= self.interval:
+            self.commit()
+
+    def commit(self):
+        """Confirma en disco todos los cambios pendientes (checkpoint)."""
+        try:
+            self._db.commit()
+            self._last_commit = time.monotonic()
+        except sqlite3.Error as e:
+            logger.error(f"Error al guardar el checkpoint del crawl: {e}")
+            raise
+
+    def is_done(self, url):
+        """
+        Indica si una URL ya se terminó en una ejecución anterior (o en esta).
+
+        Args:
+            url (str): La URL.
+
+        Returns:
+            bool: True si la página y sus citas ya están a salvo.
+        """
+        return url in self._done
+
+    def start(self, url):
+        """Marca una URL como en vuelo."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO frontier (url, status, updated_at) VALUES (?, ?, ?)", (url, IN_FLIGHT, time.time())
+        )
+        self._maybe_commit()
+
+    def discard(self, url):
+        """Olvida una URL que no forma parte del listado (p. ej. la página vacía del final)."""
+        self._db.execute("DELETE FROM frontier WHERE url = ?", (url,))
+        self._maybe_commit()
+
+    def complete(self, url, entries):
+        """
+        Marca una página como terminada y guarda en el checkpoint las citas extraídas de ella.
+
+        Args:
+            url (str): La URL de la página.
+            entries (List[tuple]): Citas extraídas (texto, autor, etiquetas, about_url).
+        """
+        self._db.executemany(
+            "INSERT OR REPLACE INTO checkpoint (content_hash, url, entry) VALUES (?, ?, ?)",
+            [(self._hash(entry[0]), url, json.dumps(entry)) for entry in entries],
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO frontier (url, status, updated_at) VALUES (?, ?, ?)", (url, DONE, time.time())
+        )
+        self._done.add(url)
+        self._maybe_commit()
+
+    def persisted(self, quotes):
+        """
+        Elimina del checkpoint las citas ya confirmadas en la base de datos.
+
+        Args:
+            quotes (Iterable[Quote]): Citas guardadas.
+        """
+        self._db.executemany("DELETE FROM checkpoint WHERE content_hash = ?", [(q.content_hash,) for q in quotes])
+        self._maybe_commit()
+
+    def dropped(self, entries):
+        """
+        Elimina del checkpoint citas extraídas que se han descartado y nunca llegarán a la base de datos.
+
+        Args:
+            entries (Iterable[tuple]): Citas descartadas (texto, autor, etiquetas, about_url).
+        """
+        self._db.executemany("DELETE FROM checkpoint WHERE content_hash = ?", [(self._hash(entry[0]),) for entry in entries])
+        self._maybe_commit()
+
+    def checkpointed(self):
+        """Número de citas extraídas pendientes de guardar."""
+        return self._db.execute("SELECT COUNT(*) FROM checkpoint").fetchone()[0]
+
+    def pending_entries(self):
+        """
+        Devuelve las citas extraídas en ejecuciones anteriores que no llegaron a la base de datos.
+
+        Returns:
+            List[tuple]: Citas (texto, autor, etiquetas, about_url).
+        """
+        return [tuple(json.loads(entry)) for (entry,) in self._db.execute("SELECT entry FROM checkpoint ORDER BY rowid")]
+
+    def finish(self):
+        """Vacía la frontera tras un crawl completo, para que la siguiente ejecución empiece de cero."""
+        try:
+            self._db.execute("DELETE FROM frontier")
+            self._db.execute("DELETE FROM checkpoint")
+            self.commit()
+            self._done.clear()
+        except sqlite3.Error as e:
+            logger.error(f"Error al vaciar la frontera del crawl: {e}")
+            raise
+
+    def close(self):
+        """Guarda el último checkpoint y cierra el fichero."""
+        try:
+            self.commit()
+        finally:
+            self._db.close()
@@ -0,0 +1,236 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hashlib
+import json
+import mmap
+import struct
+import time
+import zstandard
+from http_client import HttpResponse
+from src.utils.logger import logger
+from src.utils.constants import ARCHIVE_SEGMENT_SIZE, ARCHIVE_ZSTD_LEVEL
+
+# Entrada del índice: hash de la URL (16 bytes), número de segmento, posición y longitud del registro
+_INDEX_ENTRY = struct.Struct("<16sIQI")
+# Cabecera de cada registro de un segmento: longitud del bloque comprimido
+_RECORD_HEADER = struct.Struct("<I")
+_INDEX_FILE = "index.bin"
+
+def _url_key(url):
+    """Clave de una URL en el índice."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+class HtmlArchive:
+    """
+    Archivo de solo escritura al final (append-only) con el HTML en bruto de cada respuesta descargada.
+
+    El archivo es un directorio con:
+        - Segmentos `segment-NNNNNN.zst`: cada registro es un bloque zstd independiente con una cabecera
+          JSON (URL, estado, instante de descarga) y el cuerpo de la respuesta. Cada ejecución empieza un
+          segmento nuevo y los segmentos cerrados no se modifican nunca; al superar `segment_size` bytes
+          se pasa al siguiente.
+        - `index.bin`: índice de entradas de tamaño fijo (hash de la URL, segmento, posición, longitud),
+          que se lee mediante `mmap` al abrir. Si una URL aparece varias veces, vale la última.
+
+    Los registros se escriben antes que su entrada del índice, de modo que un índice recortado por una
+    caída nunca apunta a datos incompletos (las entradas inválidas se descartan al abrir).
+
+    Atributos:
+        path (str): Directorio del archivo.
+        segment_size (int): Tamaño (bytes) a partir del cual se empieza un segmento nuevo.
+        readonly (bool): Si es True, el archivo solo se lee (modo replay).
+        written (int): Registros escritos en esta ejecución.
+    """
+
+    def __init__(self, path, segment_size=ARCHIVE_SEGMENT_SIZE, level=ARCHIVE_ZSTD_LEVEL, readonly=False):
+        self.path = path
+        self.segment_size = segment_size
+        self.readonly = readonly
+        self.written = 0
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._entries = {}  # Clave de la URL -> (segmento, posición, longitud)
+        self._views = {}  # Segmento -> mmap de solo lectura
+        self._segment = None  # Segmento en escritura
+        self._segment_number = None
+        self._index = None
+        try:
+            if readonly and not os.path.isdir(path):
+                raise FileNotFoundError(f"No existe el archivo HTML {path}")
+            os.makedirs(path, exist_ok=True)
+            self._load_index()
+        except OSError as e:
+            logger.error(f"Error al abrir el archivo HTML: {e}")
+            raise
+
+    def _segment_path(self, number):
+        """Ruta de un segmento."""
+        return os.path.join(self.path, f"segment-{number:06d}.zst")
+
+    def _segments(self):
+        """Números de los segmentos existentes."""
+        return sorted(int(name[8:14]) for name in os.listdir(self.path)
+                      if name.startswith("segment-") and name.endswith(".zst"))
+
+    def _load_index(self):
+        """Lee el índice mediante `mmap`, descartando las entradas incompletas o que apuntan fuera de su segmento."""
+        index_path = os.path.join(self.path, _INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        sizes = {number: os.path.getsize(self._segment_path(number)) for number in self._segments()}
+        with open(index_path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            usable = length - length % _INDEX_ENTRY.size
+            if not usable:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for key, segment, offset, size in _INDEX_ENTRY.iter_unpack(view[:usable]):
+                    if offset + size <= sizes.get(segment, -1):
+                        self._entries[key] = (segment, offset, size)
+        if usable != length and not self.readonly:
+            logger.warning("Índice del archivo HTML recortado: se descarta la última entrada incompleta")
+            with open(index_path, "r+b") as f:
+                f.truncate(usable)
+
+    def _open_segment(self):
+        """Empieza un segmento nuevo para escribir."""
+        if self._segment is not None:
+            self._segment.close()
+        existing = self._segments()
+        self._segment_number = (existing[-1] + 1) if existing else 1
+        self._segment = open(self._segment_path(self._segment_number), "ab")
+        if self._index is None:
+            self._index = open(os.path.join(self.path, _INDEX_FILE), "ab")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, url):
+        return _url_key(url) in self._entries
+
+    def append(self, url, status, text):
+        """
+        Añade una respuesta al archivo.
+
+        Args:
+            url (str): La URL descargada.
+            status (int): Código de estado HTTP.
+            text (str): El cuerpo de la respuesta.
+        """
+        if self.readonly:
+            raise ValueError("El archivo HTML está abierto en modo solo lectura")
+        header = json.dumps({"url": url, "status": status, "fetched_at": time.time()}).encode("utf-8")
+        block = self._compressor.compress(header + b"\n" + text.encode("utf-8"))
+        try:
+            if self._segment is None or self._segment.tell() >= self.segment_size:
+                self._open_segment()
+            offset = self._segment.tell()
+            self._segment.write(_RECORD_HEADER.pack(len(block)))
+            self._segment.write(block)
+            size = _RECORD_HEADER.size + len(block)
+            key = _url_key(url)
+            self._index.write(_INDEX_ENTRY.pack(key, self._segment_number, offset, size))
+        except OSError as e:
+            logger.error(f"Error al escribir en el archivo HTML: {e}")
+            raise
+        self._entries[key] = (self._segment_number, offset, size)
+        self.written += 1
+
+    def _view(self, segment, end):
+        """Devuelve el `mmap` de un segmento que cubra al menos hasta la posición `end`."""
+        view = self._views.get(segment)
+        if view is None or len(view) < end:
+            if segment == self._segment_number:
+                self.flush()  # El registro puede estar todavía en el búfer de escritura
+            if view is not None:
+                view.close()
+            with open(self._segment_path(segment), "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._views[segment] = view
+        return view
+
+    def get(self, url):
+        """
+        Devuelve la última respuesta archivada de una URL.
+
+        Args:
+            url (str): La URL.
+
+        Returns:
+            tuple | None: (estado, texto), o None si la URL no está en el archivo.
+        """
+        location = self._entries.get(_url_key(url))
+        if location is None:
+            return None
+        segment, offset, size = location
+        view = self._view(segment, offset + size)
+        start = offset + _RECORD_HEADER.size
+        data = self._decompressor.decompress(view[start:offset + size])
+        header, _, body = data.partition(b"\n")
+        header = json.loads(header)
+        if header["url"] != url:
+            return None  # Colisión del hash: no es la URL pedida
+        return header["status"], body.decode("utf-8")
+
+    def flush(self):
+        """Vuelca a disco los segmentos y el índice (primero los datos, después el índice)."""
+        if self._segment is not None:
+            self._segment.flush()
+            self._index.flush()
+
+    def close(self):
+        """Cierra el segmento en escritura, el índice y las vistas `mmap`."""
+        try:
+            self.flush()
+        finally:
+            for view in self._views.values():
+                view.close()
+            self._views.clear()
+            if self._segment is not None:
+                self._segment.close()
+                self._index.close()
+                self._segment = None
+                self._index = None
+        if self.written:
+            logger.info(f"Archivo HTML: {self.written} respuestas guardadas en {self.path}")
+
+class ReplayClient:
+    """
+    Sustituto de `HttpClient` que sirve las respuestas desde un `HtmlArchive`, sin red.
+
+    Las URL que no están en el archivo devuelven un 404, de modo que el crawl y la información de
+    los autores se comportan igual que si el servidor no tuviera esas páginas.
+
+    Atributos:
+        archive (HtmlArchive): El archivo del que se leen las respuestas.
+        counters (dict): Peticiones servidas desde el archivo y URL que no estaban archivadas.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.counters = {"requests": 0, "missing": 0}
+
+    async def get(self, url, headers=None):
+        """
+        Devuelve la respuesta archivada de una URL.
+
+        Args:
+            url (str): URL solicitada.
+            headers (dict, opcional): Se ignoran (no hay peticiones condicionales en el replay).
+
+        Returns:
+            HttpResponse: La respuesta archivada, o un 404 si la URL no está en el archivo.
+        """
+        self.counters["requests"] += 1
+        stored = self.archive.get(url)
+        if stored is None:
+            self.counters["missing"] += 1
+            return HttpResponse(url, 404, {}, "", 0.0)
+        status, text = stored
+        return HttpResponse(url, status, {}, text, 0.0)
+
+    async def close(self):
+        """No hay conexiones que cerrar."""
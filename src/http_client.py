@@ -0,0 +1,219 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from rate_limiter import RequestScheduler
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import HEADERS, HTTP_POOL_SIZE, HTTP_POOL_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_TTL, HTTP_TIMEOUT
+
+class HttpError(Exception):
+    """
+    Error HTTP devuelto por el servidor (código de estado >= 400).
+
+    Atributos:
+        status (int): Código de estado HTTP.
+        url (str): URL solicitada.
+        headers (dict): Cabeceras de la respuesta.
+    """
+
+    def __init__(self, status, url, headers=None):
+        super().__init__(f"HTTP {status} en {url}")
+        self.status = status
+        self.url = url
+        self.headers = headers or {}
+
+class HttpResponse:
+    """
+    Respuesta HTTP ya descargada y descomprimida.
+
+    Atributos:
+        url (str): URL solicitada.
+        status (int): Código de estado HTTP.
+        headers (dict): Cabeceras de la respuesta.
+        text (str): Cuerpo de la respuesta decodificado.
+        elapsed (float): Segundos que tardó la petición.
+    """
+
+    __slots__ = ("url", "status", "headers", "text", "elapsed")
+
+    def __init__(self, url, status, headers, text, elapsed):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.text = text
+        self.elapsed = elapsed
+
+    def raise_for_status(self):
+        """Lanza `HttpError` si el código de estado indica un error."""
+        if self.status >= 400:
+            raise HttpError(self.status, self.url, self.headers)
+
+class HttpClient:
+    """
+    Cliente HTTP asíncrono compartido por todas las peticiones del `Scraper`.
+
+    Mantiene un pool de conexiones keep-alive con un límite global y otro por host, caché de DNS
+    y descompresión transparente de gzip/deflate/brotli. Si se pide `http2=True` y `httpx` (con `h2`)
+    está instalado, las peticiones se multiplexan sobre HTTP/2.
+
+    Todas las peticiones pasan por un `RequestScheduler` (src/rate_limiter.py), que limita el ritmo y la
+    concurrencia por host y reintenta los fallos transitorios (429, 5xx y errores de red). Si se indica
+    un `HtmlArchive` (src/html_archive.py), cada respuesta correcta (2xx) se guarda en él.
+
+    Atributos:
+        pool_size (int): Número máximo de conexiones abiertas.
+        per_host (int): Número máximo de conexiones por host.
+        http2 (bool): Indica si se usa HTTP/2.
+        counters (dict): Contadores de peticiones, conexiones creadas/reutilizadas, DNS y bytes recibidos.
+        scheduler (RequestScheduler): Control de ritmo y reintentos de las peticiones.
+        archive (HtmlArchive | None): Archivo donde se guarda el HTML de las respuestas (None si está desactivado).
+    """
+
+    def __init__(self, headers=HEADERS, pool_size=HTTP_POOL_SIZE, per_host=HTTP_POOL_PER_HOST,
+                 keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT, dns_ttl=HTTP_DNS_TTL, timeout=HTTP_TIMEOUT, http2=False,
+                 scheduler=None, archive=None):
+        self.headers = {"Accept-Encoding": "gzip, deflate, br", **headers}
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self.http2 = http2 and self._http2_available()
+        self.counters = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "bytes_received": 0,
+        }
+        self.scheduler = scheduler or RequestScheduler()
+        self.archive = archive
+        self._session = None
+        self._host_limits = {}  # host -> Semaphore (solo HTTP/2, aiohttp ya limita por host)
+
+    @staticmethod
+    def _http2_available():
+        """Comprueba si `httpx` y `h2` están instalados."""
+        try:
+            import httpx  # noqa: F401
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("HTTP/2 no disponible (falta 'httpx[http2]'); se usará HTTP/1.1")
+            return False
+
+    def _trace_config(self):
+        """Crea los hooks de aiohttp que alimentan los contadores de reutilización."""
+        trace = aiohttp.TraceConfig()
+
+        async def on_create(session, context, params):
+            self.counters["connections_created"] += 1
+
+        async def on_reuse(session, context, params):
+            self.counters["connections_reused"] += 1
+
+        async def on_dns_hit(session, context, params):
+            self.counters["dns_cache_hits"] += 1
+
+        async def on_dns_miss(session, context, params):
+            self.counters["dns_cache_misses"] += 1
+
+        trace.on_connection_create_end.append(on_create)
+        trace.on_connection_reuseconn.append(on_reuse)
+        trace.on_dns_cache_hit.append(on_dns_hit)
+        trace.on_dns_cache_miss.append(on_dns_miss)
+        return trace
+
+    def _open(self):
+        """Crea la sesión subyacente en el bucle de eventos en curso."""
+        if self.http2:
+            import httpx
+            self._session = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.keepalive_timeout,
+                ),
+            )
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                auto_decompress=True,
+                trace_configs=[self._trace_config()],
+            )
+
+    async def get(self, url, headers=None):
+        """
+        Realiza una petición GET (con control de ritmo y reintentos) y devuelve la respuesta completa.
+
+        Args:
+            url (str): URL a solicitar.
+            headers (dict, opcional): Cabeceras adicionales para esta petición.
+
+        Returns:
+            HttpResponse: La respuesta descargada (si se agotan los reintentos, la última recibida).
+        """
+        response = await self.scheduler.run(url, lambda: self._get_once(url, headers))
+        if self.archive is not None and 200 <= response.status < 300:
+            self.archive.append(url, response.status, response.text)
+        return response
+
+    async def _get_once(self, url, headers=None):
+        """Realiza un único intento de petición GET."""
+        if self._session is None:
+            self._open()
+        self.counters["requests"] += 1
+        start = time.perf_counter()
+        if self.http2:
+            host = urlsplit(url).hostname
+            limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host))
+            async with limit:
+                response = await self._session.get(url, headers=headers)
+            self.counters["bytes_received"] += len(response.content)
+            elapsed = time.perf_counter() - start
+            self._record(elapsed, response.status_code, len(response.content))
+            return HttpResponse(url, response.status_code, dict(response.headers), response.text, elapsed)
+
+        async with self._session.get(url, headers=headers) as response:
+            body = await response.read()
+            self.counters["bytes_received"] += len(body)
+            text = body.decode(response.get_encoding(), errors="replace")
+            elapsed = time.perf_counter() - start
+            self._record(elapsed, response.status, len(body))
+            return HttpResponse(url, response.status, dict(response.headers), text, elapsed)
+
+    @staticmethod
+    def _record(elapsed, status, size):
+        """Registra la latencia, el código de estado y los bytes de una petición en la telemetría."""
+        metrics.observe("http_request_seconds", elapsed)
+        metrics.inc("http_requests_total", status=status)
+        metrics.inc("http_bytes_total", size)
+
+    async def close(self):
+        """Cierra el pool de conexiones."""
+        if self._session is None:
+            return
+        if self.http2:
+            await self._session.aclose()
+        else:
+            await self._session.close()
+        self._session = None
@@ -3,38 +3,330 @@ import os
 # Añade el directorio raíz al sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import asyncio
-from scraper import Scraper
-from src.utils.logger import logger
+# Al arrancar solo se importa lo necesario para analizar la línea de comandos: cada subcomando importa
+# sus módulos (scraper, SQLAlchemy, aiohttp, pyarrow…) al ejecutarse, de modo que `--help` y los
+# comandos ligeros arrancan en decenas de milisegundos.
+import argparse
+from src.utils.constants import LOAD_MODE, METRICS_HOST, METRICS_PORT, METRICS_SUMMARY_PATH, SQL_PROFILE_PATH, SEARCH_PAGE_SIZE, \
+    WORKER_CONCURRENCY, COORDINATOR_SEED_PAGES, EXPORT_BATCH_SIZE, DB_WRITERS, BULK_BATCH_SIZE, DEAD_LETTER_BATCH_SIZE
 
-async def main():
+# Carpeta de los benchmarks (subcomando `bench`)
+BENCHMARKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+
+async def run_pipeline(scpr, mode=None, writers=DB_WRITERS, batch_size=BULK_BATCH_SIZE):
     """
-    Función principal que crea una instancia de Scraper y ejecuta el flujo principal de scraping.
+    Ejecuta el pipeline en streaming con el `Scraper` indicado y guarda las citas en la base de datos.
+
+    1. Ejecuta el pipeline: descarga (o lee del archivo) las páginas, extrae las citas, añade la
+       información de cada autor y guarda las citas en la base de datos a medida que se obtienen.
+    2. Guarda el resumen JSON de la telemetría en `METRICS_SUMMARY_PATH` (y, si `METRICS_PORT` no es 0,
+       expone las métricas en formato Prometheus en `/metrics` mientras dura la ejecución).
+    3. Si `SQL_PROFILE` está activado, muestra el informe del perfilador SQL y lo guarda en `SQL_PROFILE_PATH`.
 
-    1. Crea una instancia de la clase Scraper.
-    2. Obtiene el HTML de la página web.
-    3. Extrae las citas de la página web.
-    4. Muestra las citas en la salida estándar.
+    Args:
+        scpr (Scraper): El scraper (con red o en modo replay).
+        mode (str, opcional): Modo de escritura, "bulk" o "copy" (por defecto, la variable de entorno `LOAD_MODE`).
+        writers (int): Sesiones que escriben en paralelo en el modo "bulk" (1 = una sola sesión).
+        batch_size (int): Citas por transacción en el modo "bulk".
     """
+    from pipeline import QuotePipeline
+    from database import get_engine, dispose_engine
+    from src.utils.logger import logger
+    from src.utils.metrics import metrics
+
+    metrics_server = await metrics.serve(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+    profiler = None
+    if os.getenv('SQL_PROFILE'):
+        from sql_profiler import SqlProfiler
+        profiler = SqlProfiler(get_engine()).attach()
     try:
-        # Crear una instancia de la clase Scraper
-        scpr = Scraper()
-        
-        # Obtener el HTML de la página web y almacenarlo en el atributo 'soup'
-        scpr.fetch_html()
-                
-        # Extraer una lista de citas desde la página web
-        quotes = scpr.get_quotes()
-        
-        # Mostrar las citas contenidas en la lista 'quotes'
-        # scpr.display_quotes(quotes)
-        await scpr.save_quotes_to_db(quotes)
-        
-    
+        # Descargar, extraer y guardar las citas en streaming
+        # El modo de escritura se elige con --mode o con la variable de entorno LOAD_MODE ("bulk" o "copy")
+        if (mode or os.getenv('LOAD_MODE', LOAD_MODE)) == "copy":
+            from copy_loader import CopyLoader
+            writer = CopyLoader()
+        else:
+            # Las citas que no se pueden guardar van a dead letters y el lote sigue adelante
+            from dimension_cache import DimensionCache
+            from dead_letters import DeadLetterStore
+            if writers > 1:
+                from parallel_writer import ParallelWriter
+                writer = ParallelWriter(writers=writers, batch_size=batch_size, cache=DimensionCache(),
+                                        dead_letters=DeadLetterStore())
+            else:
+                from bulk_writer import BulkWriter
+                writer = BulkWriter(batch_size=batch_size, cache=DimensionCache(), dead_letters=DeadLetterStore())
+        await QuotePipeline(scpr, writer=writer).run()
+
+        # Guardar el estado del crawl solo si todo el pipeline terminó correctamente
+        if scpr.crawl_state:
+            scpr.crawl_state.commit()
+        # Crawl completo: la siguiente ejecución ya no tiene nada que reanudar
+        if scpr.frontier:
+            scpr.frontier.finish()
+
     except Exception as e:
         # Manejar cualquier excepción inesperada que ocurra durante el flujo principal
         logger.error(f"Ocurrió un error durante el flujo principal: {e}")
+    finally:
+        # Cerrar el pool de conexiones HTTP
+        await scpr.close()
+        if metrics_server:
+            await metrics_server.cleanup()
+        try:
+            metrics.write_summary(METRICS_SUMMARY_PATH)
+        except OSError as e:
+            logger.error(f"Error al guardar el resumen de métricas: {e}")
+        if profiler:
+            profiler.detach()
+            print(profiler.format_report())
+            try:
+                profiler.write_report(SQL_PROFILE_PATH)
+            except OSError:
+                pass  # Ya registrado por el perfilador
+        await dispose_engine()
+
+async def crawl(args):
+    """
+    Subcomando `crawl` (y ejecución sin subcomando): scraping completo de la web en la base de datos.
+
+    Args:
+        args (argparse.Namespace): Modo de escritura, escritores, tamaño de lote y, opcionalmente, el archivo donde guardar el HTML.
+    """
+    from scraper import Scraper
+
+    await run_pipeline(Scraper(archive_path=args.archive), args.mode, args.writers, args.batch_size)
+
+async def load(args):
+    """
+    Subcomando `load`: reprocesa el HTML archivado y lo carga en la base de datos, sin red.
+
+    Args:
+        args (argparse.Namespace): Ruta del archivo HTML, modo de escritura, escritores y tamaño de lote.
+    """
+    from scraper import Scraper
+
+    await run_pipeline(Scraper(archive_path=args.archive, replay=True), args.mode, args.writers, args.batch_size)
+
+async def search(args):
+    """
+    Subcomando `search`: busca citas en la base de datos y muestra una página de resultados.
+
+    Args:
+        args (argparse.Namespace): Texto, etiquetas, autor, tamaño de página, cursor y formato de salida.
+    """
+    import json
+    from search import QuoteSearch
+    from database import dispose_engine
+
+    try:
+        page = await QuoteSearch().search(args.text, args.tag, args.author, args.limit, args.after)
+    finally:
+        await dispose_engine()
+    if args.json:
+        for hit in page.hits:
+            print(json.dumps(hit._asdict(), ensure_ascii=False))
+        return
+    for hit in page.hits:
+        print(f"[{hit.id}] {hit.citation}\n    — {hit.author}" + (f" ({hit.tags})" if hit.tags else ""))
+    if not page.hits:
+        print("No se han encontrado citas.")
+    elif page.next_cursor is not None:
+        print(f"\nSiguiente página: --after {page.next_cursor}")
+
+async def worker(args):
+    """
+    Subcomando `worker`: procesa trabajos de la cola del crawl distribuido hasta que se vacía.
+
+    Args:
+        args (argparse.Namespace): Trabajos a la vez, identificador del trabajador y si debe esperar más trabajos.
+    """
+    from scraper import Scraper
+    from crawl_worker import CrawlWorker
+    from database import dispose_engine
+    from src.utils.logger import logger
+    from src.utils.metrics import metrics
+
+    scpr = Scraper()
+    metrics_server = await metrics.serve(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+    try:
+        stats = await CrawlWorker(scpr, concurrency=args.concurrency, worker_id=args.worker_id, forever=args.forever).run()
+        print(f"Trabajos terminados: {stats['done']}, fallidos: {stats['failed']}, citas: {stats['quotes']}, autores: {stats['authors']}")
+    finally:
+        await scpr.close()
+        if metrics_server:
+            await metrics_server.cleanup()
+        try:
+            metrics.write_summary(METRICS_SUMMARY_PATH)
+        except OSError as e:
+            logger.error(f"Error al guardar el resumen de métricas: {e}")
+        await dispose_engine()
+
+async def coordinator(args):
+    """
+    Subcomando `coordinator`: siembra la cola del crawl distribuido y, con `--wait`, espera a que se vacíe.
+
+    Args:
+        args (argparse.Namespace): Páginas que se siembran, si se vacía antes la cola y si se espera.
+    """
+    from work_queue import WorkQueue
+    from crawl_worker import coordinate
+    from database import dispose_engine
+
+    try:
+        await coordinate(WorkQueue(), pages=args.pages, reset=args.reset, wait=args.wait)
+    finally:
+        await dispose_engine()
+
+async def export(args):
+    """
+    Subcomando `export`: exporta el corpus de citas a Parquet, JSONL o CSV (en streaming).
+
+    Args:
+        args (argparse.Namespace): Fichero de salida, formato, nombre de la exportación incremental y tamaño de lote.
+    """
+    from exporter import QuoteExporter
+    from database import dispose_engine
+
+    try:
+        stats = await QuoteExporter(batch_size=args.batch_size).export(args.path, args.format, args.incremental)
+    finally:
+        await dispose_engine()
+    if args.path != "-":
+        print(f"Exportadas {stats['rows']} citas a {args.path} ({stats['format']}) en {stats['seconds']} s "
+              f"({stats['rows_per_second']} filas/s, {stats['bytes']} bytes)")
+
+async def dead_letters(args):
+    """
+    Subcomando `dead-letters`: muestra las citas que no se han podido guardar o, con `--replay`, las reprocesa.
+
+    Args:
+        args (argparse.Namespace): Si se reprocesan, máximo de citas y tamaño de lote.
+    """
+    from dead_letters import DeadLetterStore
+    from database import dispose_engine
+
+    store = DeadLetterStore(batch_size=args.batch_size)
+    try:
+        if args.replay:
+            stats = await store.replay(limit=args.limit)
+            print(f"Reprocesadas {stats['replayed']} citas: {stats['saved']} guardadas, {stats['failed']} siguen fallando.")
+            return
+        total = await store.count()
+        rows = await store.latest(args.limit or 20)
+    finally:
+        await dispose_engine()
+    print(f"{total} citas en dead letters.")
+    for row in rows:
+        print(f"[{row.id}] {row.created_at:%Y-%m-%d %H:%M:%S} {row.error}\n    {row.payload[:200]}")
+
+def benchmark_names():
+    """Benchmarks disponibles: `benchmarks/<nombre>_benchmark.py`."""
+    try:
+        files = os.listdir(BENCHMARKS_DIR)
+    except OSError:
+        return []
+    return sorted(name[:-len("_benchmark.py")] for name in files if name.endswith("_benchmark.py"))
+
+def bench(args):
+    """
+    Subcomando `bench`: ejecuta un benchmark de `benchmarks/` con el resto de argumentos.
+
+    Args:
+        args (argparse.Namespace): Nombre del benchmark y sus argumentos.
+    """
+    import importlib
+
+    sys.path.append(BENCHMARKS_DIR)
+    importlib.import_module(f"{args.name}_benchmark").main(args.arguments)
+
+# Subcomandos asíncronos (todos salvo `bench`) y su función
+COMMANDS = {"crawl": crawl, "load": load, "search": search, "worker": worker, "coordinator": coordinator, "export": export,
+            "dead-letters": dead_letters}
+
+def add_writer_arguments(parser):
+    """Opciones de la escritura en la base de datos comunes a `crawl` y `load`."""
+    parser.add_argument("--writers", type=int, default=DB_WRITERS,
+                        help="Sesiones que escriben en paralelo en el modo bulk (por defecto, DB_WRITERS).")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help="Citas por transacción en el modo bulk (por defecto, BULK_BATCH_SIZE).")
+
+def parse_args(argv=None):
+    """
+    Analiza la línea de comandos. Sin subcomando se ejecuta el scraping completo (`crawl`).
+
+    Args:
+        argv (List[str], opcional): Argumentos (por defecto, los del proceso).
+
+    Returns:
+        argparse.Namespace: Los argumentos; `command` es "crawl", "load", "search", "worker", "coordinator",
+        "export", "dead-letters" o "bench".
+    """
+    parser = argparse.ArgumentParser(description="Scraping de quotes.toscrape.com y búsqueda de las citas guardadas.")
+    commands = parser.add_subparsers(dest="command")
+    scraping = commands.add_parser("crawl", help="Scraping completo de la web en la base de datos (por defecto).")
+    scraping.add_argument("--mode", choices=["bulk", "copy"], default=None,
+                          help="Modo de escritura (por defecto, la variable de entorno LOAD_MODE).")
+    scraping.add_argument("--archive", default=None, help="Directorio donde archivar el HTML (por defecto, ARCHIVE_PATH).")
+    add_writer_arguments(scraping)
+    loader = commands.add_parser("load", help="Cargar en la base de datos el HTML archivado, sin red.")
+    loader.add_argument("archive", nargs="?", default=None, help="Directorio del archivo HTML (por defecto, ARCHIVE_PATH).")
+    loader.add_argument("--mode", choices=["bulk", "copy"], default=None,
+                        help="Modo de escritura (por defecto, la variable de entorno LOAD_MODE).")
+    add_writer_arguments(loader)
+    finder = commands.add_parser("search", help="Buscar citas por texto, etiquetas y autor.")
+    finder.add_argument("text", nargs="?", default=None,
+                        help='Palabras a buscar en el texto (admite "frases", or y -excluir).')
+    finder.add_argument("--tag", action="append", default=[], help="Etiqueta que debe tener la cita (repetible).")
+    finder.add_argument("--author", default=None, help="Nombre exacto del autor.")
+    finder.add_argument("--limit", type=int, default=SEARCH_PAGE_SIZE, help="Resultados por página.")
+    finder.add_argument("--after", type=int, default=None, help="Cursor de la página anterior.")
+    finder.add_argument("--json", action="store_true", help="Un resultado JSON por línea.")
+    crawler = commands.add_parser("worker", help="Procesar trabajos de la cola del crawl distribuido.")
+    crawler.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="Trabajos en curso a la vez.")
+    crawler.add_argument("--worker-id", default=None, help="Identificador del trabajador (por defecto máquina-pid-aleatorio).")
+    crawler.add_argument("--forever", action="store_true", help="Seguir esperando trabajos cuando la cola se vacía.")
+    seeder = commands.add_parser("coordinator", help="Sembrar la cola del crawl distribuido.")
+    seeder.add_argument("--pages", type=int, default=COORDINATOR_SEED_PAGES, help="Páginas del listado que se siembran.")
+    seeder.add_argument("--reset", action="store_true", help="Borrar antes todos los trabajos (repetir un crawl).")
+    seeder.add_argument("--wait", action="store_true", help="Esperar a que los trabajadores vacíen la cola.")
+    exporter = commands.add_parser("export", help="Exportar las citas a Parquet, JSONL o CSV.")
+    exporter.add_argument("path", help='Fichero de salida ("-" para la salida estándar en JSONL o CSV).')
+    exporter.add_argument("--format", choices=["parquet", "jsonl", "csv"], default=None,
+                          help="Formato (por defecto, según la extensión del fichero).")
+    exporter.add_argument("--incremental", metavar="NOMBRE", default=None,
+                          help="Exportar solo las citas nuevas o modificadas desde la anterior exportación con este nombre.")
+    exporter.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Filas por lote.")
+    failures = commands.add_parser("dead-letters", help="Ver o reprocesar las citas que no se han podido guardar.")
+    failures.add_argument("--replay", action="store_true", help="Reprocesar las citas (las que vuelven a fallar se quedan).")
+    failures.add_argument("--limit", type=int, default=None,
+                          help="Máximo de citas que se muestran (20 por defecto) o se reprocesan (todas por defecto).")
+    failures.add_argument("--batch-size", type=int, default=DEAD_LETTER_BATCH_SIZE, help="Citas por transacción al reprocesar.")
+    benchmark = commands.add_parser("bench", help="Ejecutar un benchmark de benchmarks/.")
+    benchmark.add_argument("name", choices=benchmark_names(), help="Benchmark.")
+    benchmark.add_argument("arguments", nargs=argparse.REMAINDER, help="Argumentos del benchmark (véase `bench NOMBRE --help`).")
+    arguments = parser.parse_args(argv)
+    if arguments.command is None:
+        arguments = parser.parse_args(["crawl"])
+    return arguments
+
+def run(argv=None):
+    """
+    Punto de entrada de la línea de comandos: analiza los argumentos y ejecuta el subcomando.
+
+    Las variables del archivo .env ya se han cargado al importar las constantes (`src/utils/environment.py`).
+
+    Args:
+        argv (List[str], opcional): Argumentos (por defecto, los del proceso).
+    """
+    arguments = parse_args(argv)
+    if arguments.command == "bench":
+        bench(arguments)
+        return
+    import asyncio
+
+    asyncio.run(COMMANDS[arguments.command](arguments))
 
 # Ejecutar la función principal si el script se ejecuta directamente
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
@@ -1,21 +1,22 @@
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, ForeignKey, UniqueConstraint, Index, Computed, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Birthdate(Base):
     __tablename__ = 'birthdate'
     id = Column(Integer, primary_key=True)
-    birthdate = Column(Date, nullable=False)
+    birthdate = Column(Date, nullable=False, unique=True)
 
 class Birthplace(Base):
     __tablename__ = 'birthplace'
     id = Column(Integer, primary_key=True)
-    birthplace = Column(String(255), nullable=False)
+    birthplace = Column(String(255), nullable=False, unique=True)
 
 class Author(Base):
     __tablename__ = 'author'
     id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, unique=True)
     birthdate_id = Column(Integer, ForeignKey('birthdate.id'))
     birthplace_id = Column(Integer, ForeignKey('birthplace.id'))
     description = Column(Text)
@@ -29,13 +30,81 @@ class Tag(Base):
 
 class Quote(Base):
     __tablename__ = 'quotes'
+    __table_args__ = (
+        Index('ix_quotes_author_id', 'author_id', 'id'),
+        Index('ix_quotes_search_vector', 'search_vector', postgresql_using='gin'),
+    )
     id = Column(Integer, primary_key=True)
     quote = Column(Text, nullable=False)
+    content_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 del texto: clave natural de la cita
     author_id = Column(Integer, ForeignKey('author.id'))
+    # Texto normalizado para la búsqueda de texto completo (columna generada por PostgreSQL)
+    search_vector = Column(TSVECTOR, Computed("to_tsvector('english', quote)", persisted=True))
     author = relationship('Author')
 
 class QuoteTag(Base):
     __tablename__ = 'quote_tags'
+    __table_args__ = (
+        UniqueConstraint('quote_id', 'tag_id'),
+        Index('ix_quote_tags_tag_id', 'tag_id', 'quote_id'),
+    )
     id = Column(Integer, primary_key=True)
     quote_id = Column(Integer, ForeignKey('quotes.id'))
     tag_id = Column(Integer, ForeignKey('tags.id'))
+
+class QuoteDetail(Base):
+    # Detalles materializados de cada cita (solo lectura): los mantienen los triggers definidos en initdb/init.sql
+    __tablename__ = 'quote_details'
+    quote_id = Column(Integer, primary_key=True)
+    citation = Column(Text, nullable=False)
+    author = Column(String(255), nullable=False, index=True)
+    tags = Column(Text)
+    tag_list = Column(ARRAY(Text))
+    txid = Column(BigInteger, nullable=False, index=True, server_default=text("pg_current_xact_id()::text::BIGINT"))
+
+class ExportState(Base):
+    # Marca de agua de cada exportación incremental (ver src/exporter.py)
+    __tablename__ = 'export_state'
+    name = Column(String(255), primary_key=True)
+    since_txid = Column(BigInteger, nullable=False)
+    exported_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    rows = Column(BigInteger, nullable=False, server_default='0')
+
+class DeadLetter(Base):
+    # Citas que no se han podido guardar, con sus datos en bruto (ver src/dead_letters.py)
+    __tablename__ = 'dead_letters'
+    id = Column(BigInteger, primary_key=True)
+    payload = Column(Text, nullable=False)
+    error = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class CrawlJob(Base):
+    # Cola de trabajos del crawl distribuido (ver src/work_queue.py)
+    __tablename__ = 'crawl_jobs'
+    __table_args__ = (
+        UniqueConstraint('kind', 'url'),
+        Index('ix_crawl_jobs_pending', 'id', postgresql_where=text("status = 'pending'")),
+        Index('ix_crawl_jobs_lease', 'lease_expires_at', postgresql_where=text("status = 'running'")),
+    )
+    id = Column(BigInteger, primary_key=True)
+    kind = Column(String(10), nullable=False)
+    url = Column(Text, nullable=False)
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'"))
+    status = Column(String(10), nullable=False, server_default='pending')
+    attempts = Column(Integer, nullable=False, server_default='0')
+    worker_id = Column(String(255))
+    lease_expires_at = Column(DateTime(timezone=True))
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+class CrawlWorkerRecord(Base):
+    # Trabajadores del crawl distribuido y su último heartbeat
+    __tablename__ = 'crawl_workers'
+    worker_id = Column(String(255), primary_key=True)
+    host = Column(String(255), nullable=False)
+    pid = Column(Integer, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    jobs_done = Column(Integer, nullable=False, server_default='0')
@@ -0,0 +1,131 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import zlib
+from bulk_writer import BulkWriter
+from database import SessionLocal
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import DB_WRITERS, BULK_BATCH_SIZE
+
+# Marca de fin de flujo para los escritores de cada partición
+_DONE = object()
+
+async def _iterate(quotes):
+    """Recorre una lista de citas como un iterable asíncrono."""
+    for quote in quotes:
+        yield quote
+
+class ParallelWriter:
+    """
+    Escritura en paralelo: `writers` sesiones del pool escriben a la vez, cada una su partición de citas.
+
+    Cada cita se asigna a una partición por el hash de su autor, de modo que las filas de un mismo autor
+    (el autor, sus citas y sus `quote_tags`) las escribe siempre la misma sesión y dos transacciones
+    nunca compiten por ellas. Las dimensiones compartidas (fechas, lugares y etiquetas) se insertan en
+    orden (`BulkWriter._resolve`): una transacción puede esperar a otra que inserta la misma etiqueta,
+    pero no se producen interbloqueos.
+
+    Cada partición tiene su cola acotada, su `BulkWriter` (con una copia de la `DimensionCache`: los IDs
+    pendientes son de cada transacción) y su sesión, y agrupa `batch_size` citas por transacción. Así el
+    rendimiento crece con el número de conexiones en lugar de depender de la latencia de cada commit.
+
+    Atributos:
+        writers (int): Sesiones que escriben a la vez.
+        batch_size (int): Citas por transacción en cada partición.
+        cache (DimensionCache | None): Caché de dimensiones ya precargada; cada partición usa una copia.
+        dead_letters (DeadLetterStore | None): Dónde guardar las citas que fallan (ver `BulkWriter`).
+        session_factory (Callable): Fábrica de sesiones asíncronas de SQLAlchemy.
+        queue_size (int): Capacidad de la cola de cada partición (por defecto un lote, para que el reparto no
+            se detenga mientras la partición confirma el lote anterior).
+        stats (List[int]): Citas guardadas por cada partición.
+    """
+
+    def __init__(self, writers=DB_WRITERS, batch_size=BULK_BATCH_SIZE, cache=None, session_factory=SessionLocal,
+                 queue_size=None, dead_letters=None):
+        self.writers = max(1, int(writers))
+        self.batch_size = max(1, int(batch_size))
+        self.cache = cache
+        self.dead_letters = dead_letters
+        self.session_factory = session_factory
+        self.queue_size = max(1, int(queue_size or self.batch_size))
+        self.stats = [0] * self.writers
+
+    def partition(self, quote):
+        """
+        Partición de una cita, estable entre ejecuciones y procesos.
+
+        Args:
+            quote (Quote): La cita.
+
+        Returns:
+            int: Índice de la partición (de 0 a `writers - 1`).
+        """
+        return zlib.crc32(quote.author.encode("utf-8")) % self.writers
+
+    async def _write_partition(self, index, queue, on_saved):
+        """Escribe las citas de una partición en su propia sesión, en transacciones de `batch_size` citas."""
+        writer = BulkWriter(batch_size=self.batch_size, cache=self.cache.copy() if self.cache else None,
+                            dead_letters=self.dead_letters)
+        async with self.session_factory() as session:
+            batch = []
+            while True:
+                quote = await queue.get()
+                if quote is not _DONE:
+                    batch.append(quote)
+                if batch and (quote is _DONE or len(batch) >= self.batch_size):
+                    with metrics.timer("db_writer_batch_seconds", partition=str(index)):
+                        written = await writer.save(session, batch)
+                    self.stats[index] += written
+                    if on_saved:
+                        on_saved(batch, written)
+                    batch = []
+                if quote is _DONE:
+                    return
+
+    async def consume(self, quotes, on_saved=None):
+        """
+        Guarda las citas de un iterable asíncrono a medida que llegan, repartiéndolas entre las particiones.
+
+        Si una partición falla, las demás se cancelan y la excepción se propaga; las transacciones ya
+        confirmadas se conservan.
+
+        Args:
+            quotes (AsyncIterable[Quote]): Citas a guardar.
+            on_saved (Callable[[List[Quote], int], None], opcional): Se llama tras confirmar cada lote, con
+                sus citas y el número de citas escritas.
+
+        Returns:
+            int: Número de citas guardadas.
+        """
+        self.stats = [0] * self.writers
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.writers)]
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index, queue in enumerate(queues):
+                    group.create_task(self._write_partition(index, queue, on_saved))
+                async for quote in quotes:
+                    await queues[self.partition(quote)].put(quote)
+                for queue in queues:
+                    await queue.put(_DONE)
+        except ExceptionGroup as group_error:
+            error = group_error.exceptions[0]
+            logger.error(f"Error en la escritura en paralelo de las citas: {error}")
+            raise error
+        return sum(self.stats)
+
+    async def save(self, session, quotes):
+        """
+        Guarda una lista de citas en paralelo (misma interfaz que `BulkWriter.save`).
+
+        Args:
+            session (AsyncSession): Sesión del llamador. No se usa: cada partición escribe con su propia sesión.
+            quotes (List[Quote]): Citas a guardar.
+
+        Returns:
+            int: Número de citas guardadas.
+        """
+        return await self.consume(_iterate(quotes))
@@ -0,0 +1,165 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from extractors import get_extractor
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import PARSE_WORKERS, PARSE_BATCH_SIZE, PARSE_BATCH_DELAY
+
+# Resultado del análisis de una página del listado: datos simples y serializables (pickle)
+PageRecord = namedtuple("PageRecord", ["has_data", "has_next", "header", "entries"])
+
+_extractor = None  # Motor de análisis de cada proceso trabajador
+
+def _init_worker(parser):
+    """Crea el motor de análisis de un proceso trabajador."""
+    global _extractor
+    _extractor = get_extractor(parser)
+
+def page_record(extractor, html):
+    """
+    Analiza una página del listado y devuelve su `PageRecord`, liberando el árbol al terminar.
+
+    Args:
+        extractor (QuoteExtractor): Motor de análisis.
+        html (str): HTML de la página.
+
+    Returns:
+        PageRecord: Los datos de la página.
+    """
+    doc = extractor.parse(html)
+    try:
+        return PageRecord(extractor.has_data(doc), extractor.has_next(doc), extractor.header(doc), extractor.quotes(doc))
+    finally:
+        extractor.release(doc)
+
+def _parse_batch(tasks):
+    """Analiza un lote de páginas en un proceso trabajador. Cada tarea es ("page" | "author", html)."""
+    return [page_record(_extractor, html) if kind == "page" else _extractor.author_details(html) for kind, html in tasks]
+
+class ParsePool:
+    """
+    Análisis HTML fuera del bucle de eventos, en un pool de procesos (`ProcessPoolExecutor`).
+
+    Cada petición de análisis recibe el HTML en bruto y devuelve datos simples (`PageRecord` para las
+    páginas del listado, diccionario para las páginas "about"), de modo que solo viajan entre procesos
+    cadenas y tuplas. Las páginas pequeñas se agrupan en lotes de hasta `batch_size` (o las que lleguen
+    en `batch_delay` segundos) para repartir el coste de cada envío al pool.
+
+    Con `workers=0` el análisis se hace en el propio bucle de eventos, sin procesos adicionales.
+
+    Atributos:
+        extractor (QuoteExtractor): Motor de análisis (su nombre se usa para crearlo en los trabajadores).
+        workers (int): Número de procesos trabajadores (0 = en el proceso actual).
+        batch_size (int): Máximo de páginas por envío al pool.
+        batch_delay (float): Segundos máximos que una página espera a completar su lote.
+    """
+
+    def __init__(self, extractor, workers=PARSE_WORKERS, batch_size=PARSE_BATCH_SIZE, batch_delay=PARSE_BATCH_DELAY):
+        self.extractor = extractor
+        self.workers = max(0, int(workers))
+        self.batch_size = max(1, int(batch_size))
+        self.batch_delay = batch_delay
+        self._executor = None
+        self._batch = []  # (tipo, html, future) pendientes de enviar
+        self._timer = None
+
+    def _open(self):
+        """Arranca los procesos trabajadores (con "spawn", seguro junto a un bucle de eventos en marcha)."""
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.extractor.name,),
+        )
+
+    async def page(self, html):
+        """
+        Analiza una página del listado.
+
+        Args:
+            html (str): HTML de la página.
+
+        Returns:
+            PageRecord: Los datos de la página.
+        """
+        with metrics.timer("parse_seconds", kind="page"):
+            if not self.workers:
+                record = page_record(self.extractor, html)
+            else:
+                record = await self._submit("page", html)
+        metrics.inc("pages_parsed_total")
+        return record
+
+    async def author(self, html):
+        """
+        Analiza una página "about".
+
+        Args:
+            html (str): HTML de la página.
+
+        Returns:
+            dict: La información del autor.
+        """
+        with metrics.timer("parse_seconds", kind="author"):
+            if not self.workers:
+                return self.extractor.author_details(html)
+            return await self._submit("author", html)
+
+    def _submit(self, kind, html):
+        """Añade un análisis al lote en curso y devuelve el future de su resultado."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((kind, html, future))
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_delay, self._flush)
+        return future
+
+    def _flush(self):
+        """Envía el lote en curso al pool."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        if self._executor is None:
+            self._open()
+        loop = asyncio.get_running_loop()
+        result = loop.run_in_executor(self._executor, _parse_batch, [(kind, html) for kind, html, _ in batch])
+        result.add_done_callback(lambda done: self._deliver(batch, done))
+
+    @staticmethod
+    def _deliver(batch, done):
+        """Reparte los resultados (o el error) de un lote entre sus futures."""
+        if done.cancelled():
+            for _, _, future in batch:
+                future.cancel()
+            return
+        error = done.exception()
+        if error is not None:
+            logger.error(f"Error al analizar un lote de {len(batch)} páginas: {error}")
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
+
+    def close(self):
+        """Detiene los procesos trabajadores."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,184 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import PIPELINE_QUEUE_SIZE, MAX_CONCURRENCY, BOOK, SMILE, CELEBRATION, PASTEL_YELLOW, GREEN, RED, RESET
+
+from database import SessionLocal
+from bulk_writer import BulkWriter
+
+# Marca de fin de flujo que cada etapa envía a la siguiente
+_DONE = object()
+
+class QuotePipeline:
+    """
+    Pipeline en streaming descarga → análisis → enriquecimiento → persistencia por lotes.
+
+    Cada etapa se comunica con la siguiente mediante una cola acotada, de modo que una etapa lenta
+    frena a las anteriores (backpressure) y la memoria se mantiene constante. Cada árbol HTML
+    se libera en cuanto se analiza (en el `ParsePool` del scraper), y la base de datos empieza a escribir mientras
+    el crawl sigue en curso. Si una etapa falla, el resto se cancela.
+
+    Cada etapa acumula en la telemetría (`src/utils/metrics.py`) el tiempo que pasa esperando a la
+    anterior (`pipeline_idle_seconds_total`): la etapa que menos espera es el cuello de botella.
+
+    Si el `Scraper` tiene frontera persistente (`frontier`), cada página se marca como terminada junto
+    con sus citas extraídas, las citas se eliminan del checkpoint al confirmarse en la base de datos (o al
+    descartarse) y, al reanudar un crawl interrumpido, las citas que quedaron en el checkpoint se procesan
+    primero. Si tiene re-crawl incremental (`crawl_state`), el estado de una página solo se guarda cuando
+    todas sus citas se han confirmado en la base de datos.
+
+    Atributos:
+        scraper (Scraper): Scraper que aporta la descarga, el análisis y la información de autores.
+        queue_size (int): Capacidad de cada cola entre etapas.
+        enrich_workers (int): Número de tareas que descargan la información de autores en paralelo.
+        session_factory (Callable): Fábrica de sesiones asíncronas de SQLAlchemy.
+        writer (BulkWriter | ParallelWriter | CopyLoader): Escritor usado en la etapa de persistencia.
+        stats (dict): Contadores de páginas, citas extraídas, citas guardadas, citas en dead letters y errores.
+    """
+
+    def __init__(self, scraper, queue_size=PIPELINE_QUEUE_SIZE, enrich_workers=MAX_CONCURRENCY, session_factory=SessionLocal, writer=None):
+        self.scraper = scraper
+        self.writer = writer or BulkWriter()
+        self.queue_size = queue_size
+        self.enrich_workers = max(1, int(enrich_workers))
+        self.session_factory = session_factory
+        self.stats = {"pages": 0, "quotes": 0, "saved": 0, "dead_letters": 0, "errors": 0}
+
+    @staticmethod
+    async def _get(queue, stage):
+        """Recibe el siguiente elemento de una cola, registrando el tiempo de espera de la etapa."""
+        start = time.perf_counter()
+        item = await queue.get()
+        metrics.inc("pipeline_idle_seconds_total", time.perf_counter() - start, stage=stage)
+        return item
+
+    async def _fetch_stage(self, pages):
+        """Descarga las páginas del listado y las envía, en orden, a la etapa de análisis."""
+        async for page, soup in self.scraper.crawl_pages():
+            await pages.put((page, soup))
+            self.stats["pages"] += 1
+        await pages.put(_DONE)
+
+    async def _parse_stage(self, pages, entries):
+        """Extrae las citas de cada página analizada y las envía a la etapa de enriquecimiento."""
+        frontier = self.scraper.frontier
+        if frontier:
+            # Citas extraídas en una ejecución interrumpida que no llegaron a la base de datos
+            for entry in frontier.pending_entries():
+                await entries.put(entry)
+        while True:
+            item = await self._get(pages, "parse")
+            if item is _DONE:
+                break
+            page, soup = item
+            try:
+                page_entries = self.scraper.extract_entries(soup)
+            except AttributeError as e:
+                logger.error(f"Error al procesar las citas: {e}")
+                self.stats["errors"] += 1
+                metrics.inc("pipeline_errors_total", stage="parse")
+                continue
+            if frontier:
+                frontier.complete(self.scraper.page_url(page), page_entries)
+            if self.scraper.crawl_state:
+                self.scraper.crawl_state.extracted(self.scraper.page_url(page), page_entries)
+            for entry in page_entries:
+                await entries.put(entry)
+        for _ in range(self.enrich_workers):
+            await entries.put(_DONE)
+
+    async def _enrich_stage(self, entries, quotes):
+        """Añade la información del autor (cacheada) a cada cita y construye el objeto `Quote`."""
+        while True:
+            entry = await self._get(entries, "enrich")
+            if entry is _DONE:
+                break
+            about_content = await self.scraper.fetch_about_content(entry[3]) if entry[3] else {}
+            try:
+                quote = self.scraper.build_quote(entry, about_content)
+            except Exception as e:
+                logger.error(f"Error al construir la cita: {e}")
+                self.stats["errors"] += 1
+                metrics.inc("pipeline_errors_total", stage="enrich")
+                if self.scraper.frontier:
+                    self.scraper.frontier.dropped([entry])  # No debe quedar pendiente al reanudar
+                continue
+            self.stats["quotes"] += 1
+            await quotes.put(quote)
+
+    async def _drain(self, quotes):
+        """Recorre como iterable asíncrono las citas de la cola hasta la marca de fin."""
+        while True:
+            quote = await self._get(quotes, "write")
+            if quote is _DONE:
+                return
+            yield quote
+
+    def _saved(self, batch, written):
+        """
+        Registra un lote confirmado en la base de datos: lo elimina del checkpoint de la frontera y deja
+        pendiente de guardar el estado de las páginas con todas sus citas confirmadas.
+        """
+        print(f"\n{BOOK} {PASTEL_YELLOW} Lote de {len(batch)} citas ·································································································{RESET}\n")
+        self.stats["saved"] += written
+        if self.scraper.frontier:
+            self.scraper.frontier.persisted(batch)
+        if self.scraper.crawl_state:
+            self.scraper.crawl_state.persisted(batch)
+
+    async def _write_stage(self, quotes):
+        """Guarda las citas en la base de datos por lotes a medida que llegan."""
+        async with self.session_factory() as session:
+            if getattr(self.writer, "cache", None):
+                await self.writer.cache.warm(session)  # Precarga los IDs de las dimensiones existentes
+        if hasattr(self.writer, "consume"):
+            # Escritura en paralelo (`ParallelWriter`): cada partición usa su propia sesión
+            await self.writer.consume(self._drain(quotes), on_saved=self._saved)
+            return
+        async with self.session_factory() as session:
+            batch = []
+            while True:
+                quote = await self._get(quotes, "write")
+                if quote is not _DONE:
+                    batch.append(quote)
+                if batch and (quote is _DONE or len(batch) >= self.writer.batch_size):
+                    self._saved(batch, await self.writer.save(session, batch))
+                    batch = []
+                if quote is _DONE:
+                    break
+
+    async def _enrich_all(self, entries, quotes):
+        """Ejecuta los trabajadores de enriquecimiento y avisa a la escritura cuando terminan todos."""
+        await asyncio.gather(*(self._enrich_stage(entries, quotes) for _ in range(self.enrich_workers)))
+        await quotes.put(_DONE)
+
+    async def run(self):
+        """
+        Ejecuta el pipeline completo hasta agotar el listado.
+
+        Returns:
+            dict: Los contadores de la ejecución (`stats`).
+        """
+        pages = asyncio.Queue(maxsize=self.queue_size)
+        entries = asyncio.Queue(maxsize=self.queue_size)
+        quotes = asyncio.Queue(maxsize=self.queue_size)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._fetch_stage(pages))
+            group.create_task(self._parse_stage(pages, entries))
+            group.create_task(self._enrich_all(entries, quotes))
+            group.create_task(self._write_stage(quotes))
+
+        print(f"\n\n{SMILE} {GREEN} Se han insertado {self.stats['saved']} citas correctamente en la base de datos. {CELEBRATION} {RESET}\n\n")
+        dead_letters = getattr(self.writer, "dead_letters", None)
+        if dead_letters and dead_letters.failed:
+            self.stats["dead_letters"] = dead_letters.failed
+            print(f"{RED}{dead_letters.failed} citas no se han podido guardar y están en dead letters "
+                  f"(python src/main.py dead-letters --replay para reprocesarlas).{RESET}\n")
+        return self.stats
@@ -4,23 +4,92 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import re  # Importa el módulo 're' para trabajar con expresiones regulares.
+import hashlib  # Importa 'hashlib' para calcular el hash del texto de la cita.
+import weakref  # Importa 'weakref' para compartir los registros de autor mientras alguna cita los use.
 from datetime import datetime  # Importa la clase datetime para manejar fechas y horas.
 from sqlalchemy.ext.asyncio import AsyncSession  # Importa 'AsyncSession' para manejar sesiones asíncronas de SQLAlchemy.
 from sqlalchemy.future import select  # Importa 'select' para realizar consultas de SQLAlchemy.
+from sqlalchemy.dialects.postgresql import insert  # Importa 'insert' de PostgreSQL para los upserts (ON CONFLICT).
 from models import Author, Quote as DBQuote, Tag, QuoteTag, Birthdate, Birthplace  # Importa modelos de la base de datos desde el módulo 'models'.
+from sql_profiler import operation  # Importa 'operation' para agrupar las sentencias de cada cita en el perfilador SQL.
 from src.utils.logger import logger  # Importa el objeto 'logger' del módulo 'logger' para registrar mensajes de error.
 from src.utils.constants import SEPARATOR, PASTEL_YELLOW, PASTEL_PINK, WHITE, RED, RESET  # Importa constantes de formato desde el módulo 'constants'.
 
+class AuthorRecord:
+    '''
+    Datos de un autor compartidos por todas sus citas.
+
+    Los registros se reutilizan por nombre (`AuthorRecord.intern`) mientras alguna cita los referencie,
+    de modo que el nombre, la fecha, el lugar y la descripción (que puede ocupar varios kilobytes) se
+    guardan una sola vez por autor y no una vez por cita. Si el mismo autor llega con datos distintos,
+    se conservan los de la primera cita, igual que al escribir en la base de datos; los datos que le
+    faltaban (p. ej. si falló la descarga de su página "about") se completan con los de las siguientes.
+
+    Atributos:
+        name (str): El nombre del autor, ya limpio.
+        birthdate (datetime.date | None): La fecha de nacimiento.
+        birthplace (str | None): El lugar de nacimiento.
+        description (str | None): La descripción del autor.
+    '''
+
+    __slots__ = ("name", "birthdate", "birthplace", "description", "__weakref__")
+
+    _registry = weakref.WeakValueDictionary()  # Nombre -> registro compartido
+
+    def __init__(self, name, birthdate, birthplace, description):
+        self.name = name
+        self.birthdate = birthdate
+        self.birthplace = birthplace
+        self.description = description
+
+    @classmethod
+    def intern(cls, name, birthdate, birthplace, description):
+        '''
+        Devuelve el registro compartido de un autor, creándolo si no existe o completando los datos que le falten.
+
+        Args:
+            name (str): El nombre del autor, ya limpio.
+            birthdate (str | None): La fecha de nacimiento en formato 'Month day, Year'.
+            birthplace (str | None): El lugar de nacimiento.
+            description (str | None): La descripción del autor.
+
+        Returns:
+            AuthorRecord: El registro del autor.
+        '''
+        record = cls._registry.get(name)
+        if record is None:
+            record = cls(
+                sys.intern(name),
+                Quote.convert_birthdate(birthdate),  # Solo se convierte una vez por autor
+                sys.intern(str(birthplace)) if birthplace is not None else None,
+                str(description) if description is not None else None,
+            )
+            cls._registry[name] = record
+            return record
+        # El registro ya existe: solo se rellenan los datos que le faltan
+        if record.birthdate is None and birthdate is not None:
+            record.birthdate = Quote.convert_birthdate(birthdate)
+        if record.birthplace is None and birthplace is not None:
+            record.birthplace = sys.intern(str(birthplace))
+        if record.description is None and description is not None:
+            record.description = str(description)
+        return record
+
 class Quote:
     '''
     Representa una cita con un texto, autor y etiquetas asociadas.
     La clase `Quote` permite almacenar y mostrar una cita. Además, incluye un método estático para limpiar el nombre del autor
     eliminando caracteres no alfabéticos y capitalizando adecuadamente el nombre.
 
+    Para ocupar poca memoria con corpus grandes, la clase usa `__slots__`, los datos del autor se guardan en un
+    `AuthorRecord` compartido por todas sus citas y las etiquetas son una tupla de cadenas internadas.
+    `author`, `birthdate`, `birthplace` y `description` se leen del registro del autor.
+
     Atributos:
         text (str): El texto de la cita.
+        author_record (AuthorRecord): Los datos compartidos del autor.
         author (str): El autor de la cita, procesado para eliminar caracteres no alfabéticos y formateado.
-        tags (list of str): Etiquetas asociadas con la cita.
+        tags (tuple of str): Etiquetas asociadas con la cita.
 
     Métodos:
         clean_author(author):
@@ -29,24 +98,24 @@ class Quote:
             Imprime la cita, el autor y las etiquetas en un formato estilizado.
     '''
 
+    __slots__ = ("text", "author_record", "tags")
+
     def __init__(self, text, author, birthdate, tag_list, birthplace, description):
         '''
         Inicializa una instancia de la clase Quote.
         Args:
             text (str): El texto de la cita.
             author (str): El autor de la cita.
-            birthdate (str): La fecha de nacimiento del autor en formato 'Month day, Year'.
+            birthdate (str | None): La fecha de nacimiento del autor en formato 'Month day, Year'.
             tag_list (list of str): Etiquetas asociadas con la cita.
-            birthplace (str): El lugar de nacimiento del autor.
-            description (str): Una descripción adicional del autor.
+            birthplace (str | None): El lugar de nacimiento del autor.
+            description (str | None): Una descripción adicional del autor.
         '''
         try:
             self.text = str(text)  # Convierte y asigna el texto de la cita a un atributo de instancia.
-            self.author = self.clean_author(author)  # Limpia y asigna el nombre del autor usando el método estático.
-            self.birthdate = self.convert_birthdate(birthdate)  # Convierte la fecha de nacimiento desde 'Month day, Year' a 'dd-mm-yyyy'.
-            self.birthplace = str(birthplace)  # Convierte y asigna el lugar de nacimiento.
-            self.description = str(description)  # Convierte y asigna la descripción.
-            self.tags = list(tag_list)  # Convierte y asigna la lista de etiquetas.
+            # Limpia el nombre del autor y obtiene su registro compartido (la fecha se convierte a datetime.date una vez por autor).
+            self.author_record = AuthorRecord.intern(self.clean_author(author), birthdate, birthplace, description)
+            self.tags = tuple(sys.intern(str(tag)) for tag in tag_list)  # Guarda las etiquetas como tupla de cadenas internadas.
         except Exception as e:  
             logger.error(f"Error al inicializar Quote: {e}")  
             raise  # Lanza nuevamente la excepción para que sea manejada en un nivel superior.
@@ -70,24 +139,58 @@ class Quote:
             logger.error(f"Error al limpiar el nombre del autor: {e}")  
             return (f"{RED}Error{RESET}")  
 
+    @property
+    def author(self):
+        '''El nombre del autor.'''
+        return self.author_record.name
+
+    @property
+    def birthdate(self):
+        '''La fecha de nacimiento del autor (datetime.date o None).'''
+        return self.author_record.birthdate
+
+    @property
+    def birthplace(self):
+        '''El lugar de nacimiento del autor.'''
+        return self.author_record.birthplace
+
+    @property
+    def description(self):
+        '''La descripción del autor.'''
+        return self.author_record.description
+
+    @property
+    def content_hash(self):
+        '''
+        Hash SHA-256 (hexadecimal) del texto de la cita, usado como clave natural en la base de datos.
+
+        Returns:
+            str: El hash del texto de la cita.
+        '''
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
     @staticmethod
     def convert_birthdate(birthdate_str):
         '''
         Convierte una fecha de nacimiento desde el formato 'Month day, Year' a un objeto datetime.date.
+        Si la fecha falta o no tiene el formato esperado (p. ej. "No birth date found"), devuelve None
+        para que la cita se pueda guardar igualmente sin fecha.
         
         Args:
-            birthdate_str (str): La fecha de nacimiento en formato 'Month day, Year'.
+            birthdate_str (str | None): La fecha de nacimiento en formato 'Month day, Year'.
 
         Returns:
-            datetime.date: La fecha de nacimiento convertida.
+            datetime.date | None: La fecha de nacimiento convertida, o None si no se puede convertir.
         '''
+        if birthdate_str is None:
+            return None
         try:
             # Convertir la cadena de fecha a un objeto datetime.date
             birthdate_obj = datetime.strptime(birthdate_str, '%B %d, %Y').date()
             return birthdate_obj
         except ValueError as ve:  # Captura excepciones de tipo ValueError que pueden ocurrir si el formato de la fecha es incorrecto.
-            logger.error(f"Error al analizar la fecha de nacimiento: {birthdate_str} - {ve}")  
-            raise  # Lanza la excepción para ser manejada en un nivel superior.
+            logger.warning(f"Fecha de nacimiento no válida, se guarda sin fecha: {birthdate_str} - {ve}")
+            return None
 
     def display(self):
         '''
@@ -103,103 +206,131 @@ class Quote:
         except Exception as e:  # Captura cualquier excepción que ocurra durante la visualización.
             logger.error(f"Error al mostrar la cita: {e}")  
 
-    async def _insert_birthdate(self, session: AsyncSession):
-        """Inserta la fecha de nacimiento en la base de datos."""
+    @staticmethod
+    async def _upsert(session: AsyncSession, model, column, values):
+        """
+        Inserta una fila si no existe su clave natural y devuelve su ID (INSERT … ON CONFLICT DO NOTHING).
+
+        Args:
+            session (AsyncSession): Sesión activa.
+            model: Modelo de la tabla.
+            column (str): Columna con restricción UNIQUE que identifica la fila.
+            values (dict): Columnas a insertar.
+
+        Returns:
+            int: El ID de la fila nueva o existente.
+        """
+        key = getattr(model, column)
+        result = await session.execute(
+            insert(model).values(**values).on_conflict_do_nothing(index_elements=[key]).returning(model.id)
+        )
+        row_id = result.scalar()
+        if row_id is None:  # La fila ya existía: se busca por su clave única (índice, O(log n)).
+            result = await session.execute(select(model.id).where(key == values[column]))
+            row_id = result.scalar_one()
+        return row_id
+
+    async def _insert_birthdate(self, session: AsyncSession, cache=None):
+        """Inserta la fecha de nacimiento en la base de datos si no existe y devuelve su ID."""
         try:
             # El atributo self.birthdate ya es un objeto datetime.date
-            result = await session.execute(
-                select(Birthdate).filter_by(birthdate=self.birthdate)  # Realiza una consulta para obtener la fecha de nacimiento.
-            )
-            bdate = result.scalars().first()  # Obtiene el primer resultado de la consulta.
-            if not bdate:  # Si no existe la fecha de nacimiento, crea una nueva instancia.
-                bdate = Birthdate(birthdate=self.birthdate)
-                session.add(bdate)  # Agrega la nueva fecha de nacimiento a la sesión.
-                await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
-            return bdate  # Devuelve la fecha de nacimiento.
+            if self.birthdate is None:
+                return None  # Fecha desconocida: el autor se guarda sin ella
+            bdate_id = cache.get("birthdate", self.birthdate) if cache else None  # Busca primero en la caché de dimensiones.
+            if bdate_id is None:
+                bdate_id = await self._upsert(session, Birthdate, "birthdate", {"birthdate": self.birthdate})
+                if cache:
+                    cache.put("birthdate", self.birthdate, bdate_id)  # Guarda el ID para las siguientes citas.
+            return bdate_id  # Devuelve el ID de la fecha de nacimiento.
         except Exception as e:  
             logger.error(f"Error al manejar la fecha de nacimiento: {e}")  
             raise  # Lanza nuevamente la excepción para ser manejada en un nivel superior.
 
-    async def _insert_birthplace(self, session: AsyncSession):
-        """Inserta el lugar de nacimiento en la base de datos."""
+    async def _insert_birthplace(self, session: AsyncSession, cache=None):
+        """Inserta el lugar de nacimiento en la base de datos si no existe y devuelve su ID."""
         try:
-            result = await session.execute(
-                select(Birthplace).filter_by(birthplace=self.birthplace)  # Realiza una consulta para obtener el lugar de nacimiento.
-            )
-            place = result.scalars().first()  # Obtiene el primer resultado de la consulta.
-            if not place:  # Si no existe el lugar de nacimiento, crea una nueva instancia.
-                place = Birthplace(birthplace=self.birthplace)
-                session.add(place)  # Agrega el nuevo lugar de nacimiento a la sesión.
-                await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
-            return place  # Devuelve el lugar de nacimiento.
+            if self.birthplace is None:
+                return None  # Lugar desconocido: el autor se guarda sin él
+            place_id = cache.get("birthplace", self.birthplace) if cache else None  # Busca primero en la caché de dimensiones.
+            if place_id is None:
+                place_id = await self._upsert(session, Birthplace, "birthplace", {"birthplace": self.birthplace})
+                if cache:
+                    cache.put("birthplace", self.birthplace, place_id)  # Guarda el ID para las siguientes citas.
+            return place_id  # Devuelve el ID del lugar de nacimiento.
         except Exception as e:  
             logger.error(f"Error al manejar el lugar de nacimiento: {e}")  
             raise  # Lanza nuevamente la excepción para ser manejada en un nivel superior.
 
-    async def _insert_author(self, session: AsyncSession):
-        """Inserta el autor en la base de datos."""
-        bdate = await self._insert_birthdate(session)  # Inserta la fecha de nacimiento.
-        place = await self._insert_birthplace(session)  # Inserta el lugar de nacimiento.
+    async def _insert_author(self, session: AsyncSession, cache=None):
+        """Inserta el autor en la base de datos si no existe y devuelve su ID."""
+        author_id = cache.get("author", self.author) if cache else None  # Busca primero en la caché de dimensiones.
+        if author_id is not None:
+            return author_id
+        bdate_id = await self._insert_birthdate(session, cache)  # Inserta la fecha de nacimiento.
+        place_id = await self._insert_birthplace(session, cache)  # Inserta el lugar de nacimiento.
+        author_id = await self._upsert(session, Author, "name", {
+            "name": self.author, "birthdate_id": bdate_id, "birthplace_id": place_id, "description": self.description
+        })
+        if cache:
+            cache.put("author", self.author, author_id)  # Guarda el ID para las siguientes citas.
+        return author_id  # Devuelve el ID del autor.
 
-        result = await session.execute(
-            select(Author).filter_by(name=self.author)  # Realiza una consulta para obtener el autor.
-        )
-        author = result.scalars().first()  # Obtiene el primer resultado de la consulta.
-        if not author:  # Si no existe el autor, crea una nueva instancia de Author.
-            author = Author(name=self.author, birthdate_id=bdate.id, birthplace_id=place.id, description=self.description)
-            session.add(author)  # Agrega el nuevo autor a la sesión.
-            await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
-        return author  # Devuelve el autor.
-
-    async def _insert_tags(self, session: AsyncSession):
-        """Inserta las etiquetas en la base de datos."""
+    async def _insert_tags(self, session: AsyncSession, cache=None):
+        """Inserta las etiquetas que no existan en la base de datos y devuelve sus IDs."""
         try:
             tag_ids = []  # Lista para almacenar los IDs de las etiquetas.
-            for my_tag in self.tags:  # Itera sobre cada etiqueta en la lista de etiquetas.
-                result = await session.execute(
-                    select(Tag).filter_by(tag=my_tag)  # Realiza una consulta para obtener la etiqueta.
-                )
-                tag = result.scalars().first()  # Obtiene el primer resultado de la consulta.
-                if not tag:  # Si no existe la etiqueta, crea una nueva instancia.
-                    tag = Tag(tag=my_tag)
-                    session.add(tag)  # Agrega la nueva etiqueta a la sesión.
-                    await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
-                tag_ids.append(tag.id)  # Agrega el ID de la etiqueta a la lista.
+            for my_tag in dict.fromkeys(self.tags):  # Itera sobre cada etiqueta (sin repetidas).
+                tag_id = cache.get("tag", my_tag) if cache else None  # Busca primero en la caché de dimensiones.
+                if tag_id is None:
+                    tag_id = await self._upsert(session, Tag, "tag", {"tag": my_tag})
+                    if cache:
+                        cache.put("tag", my_tag, tag_id)  # Guarda el ID para las siguientes citas.
+                tag_ids.append(tag_id)  # Agrega el ID de la etiqueta a la lista.
             return tag_ids  # Devuelve la lista de IDs de las etiquetas.
         except Exception as e:  
             logger.error(f"Error al manejar las etiquetas: {e}")  
             raise  # Lanza nuevamente la excepción para ser manejada en un nivel superior.
 
-    async def _insert_quote(self, session: AsyncSession):
-        """Guarda la cita en la base de datos."""
+    async def _insert_quote(self, session: AsyncSession, cache=None):
+        """Guarda la cita en la base de datos si no existe (por el hash de su texto) y devuelve su ID."""
         try:
-            author = await self._insert_author(session)  # Inserta el autor.
-            db_quote = DBQuote(quote=self.text, author_id=author.id)  # Crea una nueva instancia de DBQuote con el texto y el ID del autor.
-            session.add(db_quote)  # Agrega la nueva cita a la sesión.
-            await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
+            author_id = await self._insert_author(session, cache)  # Inserta el autor.
+            return await self._upsert(session, DBQuote, "content_hash", {
+                "quote": self.text, "content_hash": self.content_hash, "author_id": author_id
+            })
         except Exception as e:  
             logger.error(f"Error al guardar la cita en la base de datos: {e}, {type(e)}")  
-            await session.rollback()  # Realiza un rollback de la sesión para deshacer cualquier cambio realizado.
+            raise  # Lanza nuevamente la excepción para ser manejada en un nivel superior.
 
-    async def save(self, session: AsyncSession):
-        """Guarda la cita en la base de datos, incluyendo etiquetas."""
-        try:
-            await self._insert_quote(session)  # Guarda la cita en la base de datos.
-            tag_ids = await self._insert_tags(session)  # Inserta las etiquetas y obtiene sus IDs.
+    async def save(self, session: AsyncSession, cache=None, commit=True):
+        """
+        Guarda la cita en la base de datos, incluyendo etiquetas.
+        Es idempotente: volver a guardar una cita ya existente no crea filas duplicadas.
 
-            # Obtener la cita recién insertada
-            result = await session.execute(
-                select(DBQuote).filter_by(quote=self.text)  # Realiza una consulta para obtener la cita.
-            )
-            quote = result.scalars().first()  # Obtiene el primer resultado de la consulta.
+        Args:
+            session (AsyncSession): Sesión asíncrona de SQLAlchemy.
+            cache (DimensionCache, opcional): Caché de IDs de dimensiones compartida por todas las citas de la ejecución.
+            commit (bool): Si es False, la cita se escribe en la transacción (o savepoint) del llamador, sin commit
+                ni rollback, y los errores se propagan para que el llamador deshaga solo esta cita.
+        """
+        with operation("Quote.save"):  # Sentencias agrupadas por cita en el perfilador SQL
+            try:
+                if cache:
+                    cache.bind(session)  # Mantiene la caché coherente con los commits y rollbacks de la sesión.
+                quote_id = await self._insert_quote(session, cache)  # Guarda la cita (o recupera la existente) y obtiene su ID.
+                tag_ids = await self._insert_tags(session, cache)  # Inserta las etiquetas y obtiene sus IDs.
 
-            # Asociar las etiquetas con la cita
-            for tag_id in tag_ids:  # Itera sobre cada ID de etiqueta.
-                quote_tags = QuoteTag(quote_id=quote.id, tag_id=tag_id)  # Crea una instancia de QuoteTag para asociar la etiqueta con la cita.
-                session.add(quote_tags)  # Agrega la asociación a la sesión.
+                # Asociar las etiquetas con la cita; las asociaciones que ya existen se ignoran
+                if tag_ids:
+                    await session.execute(
+                        insert(QuoteTag).values([{"quote_id": quote_id, "tag_id": tag_id} for tag_id in tag_ids])
+                        .on_conflict_do_nothing(index_elements=[QuoteTag.quote_id, QuoteTag.tag_id])
+                    )
 
-            await session.flush()  # Realiza un flush de la sesión para sincronizar con la base de datos.
-            await session.commit()  # Realiza un commit de la sesión para persistir los cambios.
-        except Exception as e:  
-            logger.error(f"Error al guardar la cita en la base de datos: {e}")  
-            await session.rollback()  # Realiza un rollback de la sesión para deshacer cualquier cambio realizado.
+                if commit:
+                    await session.commit()  # Realiza un commit de la sesión para persistir los cambios.
+            except Exception as e:  
+                logger.error(f"Error al guardar la cita en la base de datos: {e}")  
+                if not commit:
+                    raise  # El llamador deshace su savepoint
+                await session.rollback()  # Realiza un rollback de la sesión para deshacer cualquier cambio realizado.
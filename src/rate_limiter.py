@@ -0,0 +1,235 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import aiohttp
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import (RATE_LIMIT_PER_HOST, RATE_LIMIT_BURST, AIMD_MIN_CONCURRENCY, AIMD_MAX_CONCURRENCY,
+                                 AIMD_LATENCY_TARGET, RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+
+# Códigos de estado que indican sobrecarga o un fallo transitorio del servidor
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Errores de red que se consideran transitorios
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError, ConnectionError)
+
+def retry_exceptions():
+    """
+    Errores de red que se reintentan: `RETRY_EXCEPTIONS` y, si se usa HTTP/2 (`httpx`, que solo se importa
+    en ese modo), sus errores de transporte (conexión, timeouts, protocolo).
+
+    Returns:
+        tuple: Las clases de excepción.
+    """
+    httpx = sys.modules.get("httpx")
+    return RETRY_EXCEPTIONS + (httpx.TransportError,) if httpx else RETRY_EXCEPTIONS
+
+def retry_after(headers, now=None):
+    """
+    Interpreta la cabecera `Retry-After` (segundos o fecha HTTP).
+
+    Args:
+        headers (dict): Cabeceras de la respuesta.
+        now (float, opcional): Instante actual (epoch) para las fechas HTTP.
+
+    Returns:
+        float | None: Segundos que hay que esperar, o None si no hay cabecera válida.
+    """
+    value = next((v for k, v in (headers or {}).items() if k.lower() == "retry-after"), None)
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - (now or time.time()))
+    except (TypeError, ValueError):
+        return None
+
+class HostThrottle:
+    """
+    Control de tráfico hacia un host: cubo de tokens (ritmo) más límite de concurrencia AIMD.
+
+    - El cubo de tokens limita las peticiones por segundo a `rate`, con ráfagas de hasta `burst`.
+    - El límite de concurrencia crece de forma aditiva (+1 por ventana sin problemas) y se reduce a
+      la mitad (junto con el ritmo) cuando llegan respuestas 429/5xx, errores de red o la latencia
+      media supera `latency_target`. Como mucho se reduce una vez por ventana (una latencia media),
+      para que una ráfaga de errores simultáneos no lo hunda.
+    - `pause(seconds)` detiene todas las peticiones al host (p. ej. por `Retry-After`).
+
+    Atributos:
+        rate (float): Peticiones por segundo permitidas en este momento.
+        max_rate (float): Ritmo máximo configurado (0 = sin límite de ritmo, solo AIMD).
+        limit (float): Peticiones simultáneas permitidas en este momento.
+        latency (float | None): Media móvil exponencial de la latencia (segundos).
+    """
+
+    def __init__(self, rate=RATE_LIMIT_PER_HOST, burst=RATE_LIMIT_BURST, min_concurrency=AIMD_MIN_CONCURRENCY,
+                 max_concurrency=AIMD_MAX_CONCURRENCY, latency_target=AIMD_LATENCY_TARGET):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency))
+        self.latency_target = latency_target
+        self.limit = float(self.max_concurrency)
+        self.latency = None
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    def _refill(self, now):
+        """Añade los tokens generados desde la última actualización."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_time(self, now):
+        """Segundos hasta que se pueda lanzar otra petición (0 si ya se puede)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.max_rate <= 0:
+            return 0.0
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self):
+        """Espera un token y un hueco de concurrencia."""
+        async with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0 and self._in_flight < int(self.limit):
+                    if self.max_rate > 0:
+                        self._tokens -= 1
+                    self._in_flight += 1
+                    return
+                try:
+                    # Se despierta al liberarse un hueco o, como tarde, cuando haya un token nuevo
+                    await asyncio.wait_for(self._condition.wait(), timeout=wait or None)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self):
+        """Libera el hueco de concurrencia de una petición terminada."""
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, elapsed):
+        """Registra una respuesta correcta: actualiza la latencia y aumenta límite y ritmo."""
+        self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+        if self.latency_target and self.latency > self.latency_target:
+            self.on_overload()
+            return
+        # Aumento aditivo: +1 hueco por cada `limit` respuestas correctas (≈ una ventana)
+        self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        if self.max_rate > 0:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / (10 * self.limit))
+
+    def on_overload(self):
+        """Registra una señal de sobrecarga: reduce a la mitad límite y ritmo (una vez por ventana)."""
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        if self.max_rate > 0:
+            self.rate = max(self.max_rate / 100, self.rate / 2)
+        logger.warning(f"Sobrecarga detectada: concurrencia {int(self.limit)}, ritmo {self.rate:.1f} peticiones/s")
+
+    def pause(self, seconds):
+        """Detiene las peticiones al host durante `seconds` segundos."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class RequestScheduler:
+    """
+    Planificador de peticiones salientes: aplica un `HostThrottle` por host y reintenta los fallos
+    transitorios (429, 5xx y errores de red) con espera exponencial con jitter completo, respetando
+    `Retry-After` cuando el servidor lo envía (hasta `max_delay`).
+
+    Atributos:
+        max_attempts (int): Número máximo de intentos por petición.
+        base_delay (float): Espera base (segundos) del primer reintento.
+        max_delay (float): Espera máxima (segundos) entre reintentos.
+        counters (dict): Reintentos, respuestas de sobrecarga y peticiones agotadas.
+    """
+
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+                 **throttle_options):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.counters = {"retries": 0, "throttled": 0, "exhausted": 0}
+        self._throttle_options = throttle_options
+        self._hosts = {}
+
+    def throttle(self, url):
+        """Devuelve el `HostThrottle` del host de una URL."""
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = HostThrottle(**self._throttle_options)
+        return self._hosts[host]
+
+    def backoff(self, attempt):
+        """Espera exponencial con jitter completo para el reintento número `attempt` (desde 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def run(self, url, send):
+        """
+        Ejecuta una petición con control de ritmo y reintentos.
+
+        Args:
+            url (str): URL solicitada (determina el host).
+            send (Callable[[], Awaitable[HttpResponse]]): Corrutina que realiza un único intento.
+
+        Returns:
+            HttpResponse: La primera respuesta no reintentable, o la última si se agotan los intentos.
+        """
+        throttle = self.throttle(url)
+        for attempt in range(1, self.max_attempts + 1):
+            await throttle.acquire()
+            try:
+                response = await send()
+            except retry_exceptions() as e:
+                metrics.inc("http_errors_total", error=type(e).__name__)
+                throttle.on_overload()
+                if attempt == self.max_attempts:
+                    self.counters["exhausted"] += 1
+                    metrics.inc("http_exhausted_total")
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(f"Error de red en {url} ({e!r}); reintento {attempt} en {delay:.2f}s")
+            else:
+                if response.status not in RETRY_STATUSES:
+                    throttle.on_success(response.elapsed)
+                    return response
+                self.counters["throttled"] += 1
+                metrics.inc("http_throttled_total", status=response.status)
+                throttle.on_overload()
+                wait = retry_after(response.headers)
+                if wait is not None:
+                    # Como mucho `max_delay`: un `Retry-After` de una hora no bloquea el host una hora
+                    wait = min(self.max_delay, wait)
+                    throttle.pause(wait)  # El resto de peticiones al host también esperan
+                if attempt == self.max_attempts:
+                    self.counters["exhausted"] += 1
+                    metrics.inc("http_exhausted_total")
+                    return response
+                delay = wait if wait is not None else self.backoff(attempt)
+                logger.warning(f"HTTP {response.status} en {url}; reintento {attempt} en {delay:.2f}s")
+            finally:
+                await throttle.release()
+            self.counters["retries"] += 1
+            metrics.inc("http_retries_total")
+            await asyncio.sleep(delay)
@@ -3,13 +3,22 @@ import os
 # Añade el directorio raíz al sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from bs4 import BeautifulSoup
-import requests
+import asyncio
+import aiohttp
 import re
 from quote import Quote
+from crawler import PageCrawler
+from author_cache import AuthorCache
+from http_client import HttpClient, HttpError
+from extractors import get_extractor, NO_AUTHOR_DETAILS
+from crawl_state import CrawlState, UNCHANGED
+from frontier import CrawlFrontier
+from parse_pool import ParsePool
+from html_archive import HtmlArchive, ReplayClient
 from src.utils.logger import logger
+from src.utils.metrics import metrics
 # from src.utils.loader import Loader
-from src.utils.constants import URL_BASE, URL_PAGE, HEADERS, SEPARATOR, BOOK, WRITING_HAND, TWO_OCLOCK, LIGHT_CYAN, RED, PASTEL_YELLOW, PASTEL_PINK, SMILE, CELEBRATION, GREEN, RESET
+from src.utils.constants import URL_BASE, URL_PAGE, MAX_CONCURRENCY, PARSE_WORKERS, LOAD_MODE, BULK_BATCH_SIZE, SEPARATOR, BOOK, WRITING_HAND, TWO_OCLOCK, LIGHT_CYAN, RED, PASTEL_YELLOW, PASTEL_PINK, SMILE, CELEBRATION, GREEN, RESET
 
 from database import SessionLocal
 
@@ -18,52 +27,134 @@ class Scraper:
     Clase para realizar el scraping de una página web y extraer citas y encabezados.
 
     Atributos:
-        soups (List[BeautifulSoup]): Lista de objetos BeautifulSoup que contienen el HTML de cada página web.
+        soups (List[PageRecord]): Lista de páginas analizadas (indicadores, encabezado y citas de cada página web).
         header_shown (bool): Controla si el encabezado H1 ya ha sido mostrado.
+        concurrency (int): Número máximo de páginas descargándose a la vez.
+        discovery (str): Estrategia para descubrir nuevas páginas ("speculative" o "next").
+        author_cache (AuthorCache): Caché en memoria (y opcionalmente en disco) de los detalles de cada autor.
+        http (HttpClient | ReplayClient): Cliente HTTP con pool de conexiones keep-alive compartido por todas las peticiones
+            (en modo replay, las respuestas se leen del archivo HTML).
+        archive (HtmlArchive | None): Archivo comprimido con el HTML de cada respuesta (None si está desactivado).
+        replay (bool): Indica si las páginas se leen del archivo en lugar de descargarse.
+        extractor (QuoteExtractor): Motor de análisis HTML usado para extraer citas y autores.
+        parse_pool (ParsePool): Análisis del HTML en un pool de procesos (o en el bucle de eventos si `parse_workers=0`).
+        crawl_state (CrawlState | None): Estado persistente por URL para el re-crawl incremental (None si está desactivado).
+        base_url (str): URL raíz de la web a scrapear (por defecto `URL_BASE`).
+        failed_pages (List[int]): Páginas del listado que no se pudieron descargar tras agotar los reintentos.
+        frontier (CrawlFrontier | None): Frontera persistente para reanudar un crawl interrumpido (None si está desactivada).
 
     Métodos:
-        fetch_html(): Obtiene el HTML de las páginas web especificadas en el rango de páginas y almacena cada página en `self.soups`.
+        fetch_html(): Obtiene de forma concurrente el HTML de las páginas del listado y almacena cada página en `self.soups`.
         get_header(): Extrae y muestra el primer encabezado H1 de la página web.
         get_quotes(): Extrae y devuelve una lista de objetos `Quote` que contienen citas, autores y etiquetas.
         display_quotes(quotes_list): Muestra en pantalla las citas contenidas en la lista `quotes_list`.
+        close(): Cierra el cliente HTTP, la caché de autores, el archivo HTML y el pool de análisis.
     """
     
-    def __init__(self):
-        self.soups = []  # Lista para almacenar los objetos BeautifulSoup de todas las páginas
+    def __init__(self, concurrency=MAX_CONCURRENCY, discovery="speculative", author_cache_path=None, http2=False, parser=None,
+                 crawl_state_path=None, base_url=None, scheduler=None, frontier_path=None,
+                 parse_workers=PARSE_WORKERS, archive_path=None, replay=None):
+        self.base_url = base_url or URL_BASE  # URL raíz de la web a scrapear
+        self.soups = []  # Lista para almacenar los documentos analizados de todas las páginas
+        self.failed_pages = []  # Páginas que no se pudieron descargar
+        self.extractor = get_extractor(parser)  # Motor de análisis HTML ("bs4", "bs4-lxml", "lxml" o "selectolax")
+        self.parse_pool = ParsePool(self.extractor, workers=parse_workers)  # Análisis fuera del bucle de eventos
+        archive_path = archive_path or os.getenv('ARCHIVE_PATH')
+        self.replay = bool(os.getenv('REPLAY')) if replay is None else replay  # Reprocesar el archivo sin red
+        if self.replay and not archive_path:
+            logger.error("El modo replay necesita la ruta del archivo HTML (ARCHIVE_PATH)")
+            raise ValueError("Falta la ruta del archivo HTML para el modo replay")
+        self.archive = HtmlArchive(archive_path, readonly=self.replay) if archive_path else None  # HTML de cada respuesta
+        if self.replay:
+            self.http = ReplayClient(self.archive)  # Respuestas servidas desde el archivo, sin red
+        else:
+            self.http = HttpClient(http2=http2, scheduler=scheduler, archive=self.archive)  # Cliente HTTP con pool de conexiones, control de ritmo y reintentos
+        self.concurrency = concurrency  # Número máximo de páginas descargándose a la vez
+        self.discovery = discovery  # Estrategia para descubrir nuevas páginas ("speculative" o "next")
+        # En modo replay los autores se vuelven a analizar desde el archivo (la caché en disco guarda datos ya extraídos)
+        author_cache_path = None if self.replay else author_cache_path or os.getenv('AUTHOR_CACHE_PATH')
+        self.author_cache = AuthorCache(path=author_cache_path)  # Caché de detalles de autor por `about_url`
+        # En modo replay no hay peticiones condicionales: se reprocesan todas las páginas archivadas
+        crawl_state_path = None if self.replay else crawl_state_path or os.getenv('CRAWL_STATE_PATH')
+        self.crawl_state = CrawlState(crawl_state_path) if crawl_state_path else None  # Estado para el re-crawl incremental
+        frontier_path = frontier_path or os.getenv('FRONTIER_PATH')
+        self.frontier = CrawlFrontier(frontier_path) if frontier_path else None  # Frontera para reanudar el crawl
         # self.loader = Loader()  # Instancia del loader para mostrar progreso
 
-    def fetch_html(self):
+    async def crawl_pages(self):
         """
-        Obtiene el HTML de las páginas web especificadas en el rango de páginas y almacena cada página en `self.soups`.
+        Recorre el listado de forma concurrente mediante `PageCrawler` y entrega cada página en orden.\n
+        Muestra el encabezado H1 de la primera página. Si el re-crawl incremental está activado, las páginas
+        que no han cambiado desde la última ejecución no se analizan ni se entregan. Si la frontera persistente
+        está activada, las páginas terminadas en una ejecución interrumpida no se vuelven a descargar.
+
+        Yields:
+            tuple: (número de página, documento analizado de la página)
         """
-        i = 1  # Inicializa el índice
-        while True:
-            try:
-                url_final = f"{URL_BASE}{URL_PAGE}{i}"
-                response = requests.get(url_final, headers=HEADERS)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # Verifica si la página está vacía o no contiene datos relevantes
-                if not self.has_data(soup):
-                    break
-                # if i == 2:
-                #     break
-                
+        async def fetch(url):
+            if self.frontier:
+                if self.frontier.is_done(url):
+                    return UNCHANGED  # Ya procesada antes de que se interrumpiera el crawl
+                self.frontier.start(url)
+            headers = self.crawl_state.conditional_headers(url) if self.crawl_state else None
+            response = await self.http.get(url, headers=headers)
+            response.raise_for_status()
+            if self.crawl_state and self.crawl_state.is_unchanged(url, response):
+                return UNCHANGED
+            soup = await self.parse_pool.page(response.text)  # PageRecord con los datos de la página
+            # Solo se recuerda el estado de las páginas con citas: el final del listado se vuelve a comprobar siempre.
+            # El estado se guarda cuando sus citas llegan a la base de datos (`QuotePipeline`)
+            if self.crawl_state and self.has_data(soup):
+                self.crawl_state.fetched(url, response)
+            if self.frontier and not self.has_data(soup):
+                self.frontier.discard(url)  # Final del listado: no forma parte de la frontera
+            return soup
+
+        crawler = PageCrawler(
+            fetch,
+            lambda soup: soup,  # `fetch` ya devuelve la página analizada
+            lambda soup: soup is UNCHANGED or self.has_data(soup),
+            has_next=lambda soup: soup is UNCHANGED or self.has_next(soup),
+            base_url=self.base_url,
+            concurrency=self.concurrency,
+            discovery=self.discovery,
+        )
+        self.failed_pages = crawler.failed  # Se rellena durante el recorrido
+        async for page, soup in crawler.crawl():
+            if page == 1:
                 # Solo muestra el encabezado H1 de la primera página
-                if i == 1:
+                if soup is not UNCHANGED:
                     self.show_header(soup)
-                    print(f"\n| {LIGHT_CYAN}Scrapeando... {TWO_OCLOCK}{RESET}\n")
+                print(f"\n| {LIGHT_CYAN}Scrapeando... {TWO_OCLOCK}{RESET}\n")
+            if soup is UNCHANGED:
+                continue  # Página sin cambios: no hay nada nuevo que extraer ni guardar
+            yield page, soup
 
-                self.soups.append(soup)  # Almacena el objeto BeautifulSoup en la lista
-                i += 1  # Incrementa el índice
+    def page_url(self, page):
+        """
+        Construye la URL de una página del listado.
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error al obtener la página: {e}")
-                break  # Sal del bucle en caso de un error de solicitud
-            except Exception as e:
-                logger.error(f"Ocurrió un error inesperado: {e}")
-                break  # Sal del bucle en caso de cualquier otro error
+        Args:
+            page (int): Número de página.
+
+        Returns:
+            str: La URL completa de la página.
+        """
+        return f"{self.base_url}{URL_PAGE}{page}"
+
+    async def fetch_html(self):
+        """
+        Obtiene el HTML de todas las páginas del listado de forma concurrente y almacena cada página en `self.soups`.\n
+        Las páginas se descargan fuera de orden mediante `PageCrawler`, pero se almacenan en orden.
+        """
+        try:
+            async for page, soup in self.crawl_pages():
+                self.soups.append(soup)  # Almacena el documento analizado en la lista
+
+        except (aiohttp.ClientError, HttpError) as e:
+            logger.error(f"Error al obtener la página: {e}")
+        except Exception as e:
+            logger.error(f"Ocurrió un error inesperado: {e}")
 
     def has_data(self, soup):
         """
@@ -71,12 +162,24 @@ class Scraper:
         Por ejemplo, verifica si hay un elemento específico que debería estar presente en todas las páginas con datos.
         
         Args:
-            soup (BeautifulSoup): El objeto BeautifulSoup de la página web.
+            soup (PageRecord): La página analizada.
         
         Returns:
             bool: True si la página contiene datos relevantes, False en caso contrario.
         """
-        return bool(soup.find('div', class_='quote'))
+        return soup.has_data
+
+    def has_next(self, soup):
+        """
+        Indica si la página contiene el enlace a la página siguiente.
+
+        Args:
+            soup (PageRecord): La página analizada.
+
+        Returns:
+            bool: True si existe el enlace "next", False en caso contrario.
+        """
+        return soup.has_next
     
     def show_header(self, soup):
         """
@@ -86,11 +189,10 @@ class Scraper:
         Se maneja el caso en el que no se pueda encontrar el H1 con un mensaje de error.
         
         Args:
-            soup (BeautifulSoup): El objeto BeautifulSoup de la página web.
+            soup (PageRecord): La página analizada.
         """
         try:
-            primer_h1 = soup.find('h1')
-            primer_h1_text = primer_h1.text if primer_h1 else 'No H1 found'
+            primer_h1_text = soup.header or 'No H1 found'
             primer_h1_limpio = re.sub(r'[^a-zA-Z\s]', '', primer_h1_text)  # Limpiar el texto
             print(SEPARATOR)
             print(f"                              {BOOK}  {primer_h1_limpio.strip().upper()}  {WRITING_HAND}")  # Imprimir en mayúsculas
@@ -103,86 +205,123 @@ class Scraper:
         except Exception as e:
             logger.error(f"Ocurrió un error inesperado: {e}")
 
-    def get_quotes(self):
+    def extract_entries(self, soup):
         """
-        Extrae citas de todas las páginas web almacenadas en `self.soups` y las devuelve como una lista de objetos `Quote`.
+        Extrae los datos en bruto de cada cita de una página, sin descargar la información del autor.
+        
+        Args:
+            soup (PageRecord): La página analizada.
+        
+        Returns:
+            List[tuple]: Lista de tuplas (texto, autor, etiquetas, about_url).
+        """
+        entries = soup.entries
+        metrics.inc("quotes_extracted_total", len(entries))
+        for text, author, tag_list, about_url in entries:
+            if about_url is None:
+                logger.error(f"Error al procesar 'about': no se encontró el enlace de {author}")
+        return entries
+
+    def build_quote(self, entry, about_content):
+        """
+        Construye un objeto `Quote` a partir de los datos en bruto de una cita y de la información de su autor.
+        
+        Args:
+            entry (tuple): Tupla (texto, autor, etiquetas, about_url) devuelta por `extract_entries`.
+            about_content (dict): Información del autor devuelta por `fetch_about_content`.
+        
+        Returns:
+            Quote: La cita construida.
+        """
+        text, author, tag_list, _ = entry
+        author_birthdate = about_content.get("author_birthdate")
+        author_birthplace = about_content.get("author_birthplace")
+        author_description = about_content.get("author_description") 
+        return Quote(text, author, author_birthdate, tag_list, author_birthplace, author_description)
+
+    async def get_quotes(self):
+        """
+        Extrae citas de todas las páginas web almacenadas en `self.soups` y las devuelve como una lista de objetos `Quote`.\n
+        Los detalles de cada autor se descargan una sola vez gracias a `self.author_cache`, y las descargas de
+        autores distintos se realizan de forma concurrente. Una página o una cita que no se puede procesar se
+        registra y se descarta sin detener la extracción del resto.
         
         Returns:
             List[Quote]: Lista de objetos `Quote` con las citas extraídas.
         """
         quotes_list = []
-        try:
-            for soup in self.soups:
-                quotes = soup.find_all('div', class_='quote')
-                for quote in quotes:
-                    text = quote.find('span', class_='text').text.strip()
-                    author = quote.find('small', class_='author').text.strip()
-                    tags = quote.find_all('a', class_='tag')
-                    tag_list = [tag.text.strip().capitalize() for tag in tags]
-                    
-                    about = quote.find('a', text='(about)')
-                    try:
-                        about_url = about.get('href')
-                        about_content = self.fetch_about_content(about_url)
-                        author_birthdate = about_content.get("author_birthdate")
-                        author_birthplace = about_content.get("author_birthplace")
-                        author_description = about_content.get("author_description") 
-
-                    except AttributeError as e:
-                        logger.error(f"Error al procesar 'about': {e}")
-                    
-                    quotes_list.append(Quote(text, author, author_birthdate, tag_list, author_birthplace, author_description))
+        entries = []  # (texto, autor, etiquetas, about_url) de cada cita
+        for soup in self.soups:
+            # Una página que no se puede procesar se descarta sola; el resto se extrae igualmente
+            try:
+                entries.extend(self.extract_entries(soup))
+            except AttributeError as e:
+                logger.error(f"Error al procesar las citas: {e}")
+                metrics.inc("pipeline_errors_total", stage="parse")
 
-        except AttributeError as e:
-            logger.error(f"Error al procesar las citas: {e}")
-        except Exception as e:
-            logger.error(f"Ocurrió un error inesperado: {e}")
+        # Una única descarga por autor distinto; el resto se sirve desde la caché
+        about_urls = list(dict.fromkeys(entry[3] for entry in entries if entry[3]))
+        about_contents = await asyncio.gather(*(self.fetch_about_content(url) for url in about_urls))
+        about_by_url = dict(zip(about_urls, about_contents))
+
+        for entry in entries:
+            try:
+                quotes_list.append(self.build_quote(entry, about_by_url.get(entry[3], {})))
+            except Exception as e:
+                logger.error(f"Error al construir la cita: {e}")
+                metrics.inc("pipeline_errors_total", stage="enrich")
         return quotes_list
     
 
-    def fetch_about_content(self, about_url):
+    async def fetch_about_content(self, about_url):
         """
-        Realiza una solicitud HTTP para obtener el contenido de la página "about".
+        Obtiene el contenido de la página "about", usando la caché de autores para no repetir descargas.
         
         Args:
             about_url (str): La URL de la página "about".
         
         Returns:
-            dict: Un diccionario con la información del autor o un mensaje de error.
+            dict: Un diccionario con la información del autor. Si la descarga falla (ya agotados los reintentos),
+            los datos del autor quedan vacíos (None) y la cita se guarda sin ellos.
         """
         try:
-            response = requests.get(f"{URL_BASE}{about_url}", headers=HEADERS)
-            response.raise_for_status()
-            about_soup = BeautifulSoup(response.text, "html.parser")
-            about_content = about_soup.find('div', class_='author-details')
-            
-            if about_content:
-                author_title = about_content.find('h3', class_='author-title').text.strip() if about_content.find('h3', class_='author-title') else "No title found"
-                author_birthdate = about_content.find('span', class_='author-born-date').text.strip() if about_content.find('span', class_='author-born-date') else "No birth date found"
-                author_birthplace = about_content.find('span', class_='author-born-location').text.strip() if about_content.find('span', class_='author-born-location') else "No birth location found"
-                author_description = about_content.find('div', class_='author-description').text.strip() if about_content.find('div', class_='author-description') else "No description found"
-
-                return {
-                    "author_title": author_title,
-                    "author_birthdate": author_birthdate,
-                    "author_birthplace": author_birthplace,
-                    "author_description": author_description
-                }
-            else:
-                return {
-                    "author_title": "No title found",
-                    "author_birthdate": "No birth date found",
-                    "author_birthplace": "No birth location found",
-                    "author_description": "No description found"
-                }
+            with metrics.timer("enrich_seconds"):
+                return await self.author_cache.get(about_url, self.download_about_content)
         except Exception as e:
+            metrics.inc("enrich_errors_total")
             logger.error(f"Error al obtener el contenido de la página 'about': {e}")
-            return {
-                "author_title": "Error",
-                "author_birthdate": "Error",
-                "author_birthplace": "Error",
-                "author_description": "Error"
-            }
+            return dict.fromkeys(NO_AUTHOR_DETAILS)
+
+    async def download_about_content(self, about_url):
+        """
+        Realiza una solicitud HTTP para obtener el contenido de la página "about", sin pasar por la caché de autores.\n
+        Los errores se propagan para que la caché no almacene resultados fallidos (y para que los trabajadores
+        del crawl distribuido puedan reintentar el trabajo).
+        
+        Args:
+            about_url (str): La URL de la página "about".
+        
+        Returns:
+            dict: Un diccionario con la información del autor.
+        """
+        url = f"{self.base_url}{about_url}"
+        metrics.inc("author_fetches_total")
+        if self.crawl_state:
+            response = await self.http.get(url, headers=self.crawl_state.conditional_headers(url))
+            response.raise_for_status()
+            if self.crawl_state.is_unchanged(url, response):
+                details = self.crawl_state.payload(url)
+                if details is not None:
+                    return details  # Página sin cambios: se reutilizan los datos ya extraídos
+                response = await self.http.get(url)
+                response.raise_for_status()
+            details = await self.parse_pool.author(response.text)
+            self.crawl_state.record(url, response, details)
+            return details
+
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return await self.parse_pool.author(response.text)
         
     def display_quotes(self, quotes_list):
         """
@@ -194,24 +333,74 @@ class Scraper:
         for quote in quotes_list:
             quote.display()
 
-    async def save_quotes_to_db(self, quotes_list):
-        """Guarda todas las citas en la base de datos."""
+    async def close(self):
+        """Cierra el cliente HTTP, la caché de autores, el estado del crawl, la frontera, el archivo HTML y el pool de análisis."""
+        await self.http.close()
+        if self.archive:
+            self.archive.close()
+        self.parse_pool.close()
+        self.author_cache.close()
+        if self.crawl_state:
+            self.crawl_state.close()
+        if self.frontier:
+            self.frontier.close()  # Guarda el último checkpoint
+
+    async def save_quotes_to_db(self, quotes_list, mode=LOAD_MODE):
+        """
+        Guarda todas las citas en la base de datos.\n
+        Modos disponibles:
+            - "bulk": `ParallelWriter`, escritura por lotes con sentencias multi-fila en `DB_WRITERS` sesiones a la vez (por defecto).
+            - "copy": `CopyLoader`, carga masiva mediante COPY y staging, para recargas completas.
+            - "orm": cita a cita mediante `Quote.save`, con un commit cada `BULK_BATCH_SIZE` citas.
+
+        En los modos "bulk" y "orm" cada cita (o grupo de citas) se escribe en un savepoint: una cita que falla
+        se deshace sola y se guarda en dead letters (`DeadLetterStore`) con sus datos y el error, y el resto
+        del lote se guarda igualmente. El modo "copy" carga cada lote entero o falla.
+
+        Args:
+            quotes_list (List[Quote]): Lista de citas a guardar.
+            mode (str): Modo de escritura ("bulk", "copy" u "orm").
+        """
+        # Los escritores solo se usan en el modo por lotes: se importan aquí y no al importar el scraper
+        from parallel_writer import ParallelWriter
+        from copy_loader import CopyLoader
+        from dimension_cache import DimensionCache
+        from dead_letters import DeadLetterStore
+
         total_quotes = len(quotes_list)
         print(f"{PASTEL_PINK}Total de citas a procesar: {total_quotes}{RESET}")
         
         async with SessionLocal() as session:
             try:
-                for index, quote in enumerate(quotes_list, start=1):
-                    try:
-                        print(f"\n{BOOK} {PASTEL_YELLOW} Cita {index} ·································································································{RESET}\n")
-                        await quote.save(session)
-                    except Exception as e:
-                        print(f"{RED}Error al guardar la cita {index}: {e}{RESET}")
-                        raise
+                if mode == "copy":
+                    total_quotes = await CopyLoader().save(session, quotes_list)
+                else:
+                    # Caché de IDs de dimensiones compartida por toda la ejecución, precargada con una consulta por tabla
+                    cache = DimensionCache()
+                    await cache.warm(session)
+                    dead_letters = DeadLetterStore()
+                    if mode == "bulk":
+                        total_quotes = await ParallelWriter(cache=cache, dead_letters=dead_letters).save(session, quotes_list)
+                    else:
+                        total_quotes = 0
+                        for index, quote in enumerate(quotes_list, start=1):
+                            snapshot = cache.savepoint()
+                            try:
+                                print(f"\n{BOOK} {PASTEL_YELLOW} Cita {index} ·································································································{RESET}\n")
+                                with metrics.timer("db_write_seconds", writer="orm"):
+                                    async with session.begin_nested():  # Un savepoint por cita
+                                        await quote.save(session, cache, commit=False)
+                                metrics.inc("rows_written_total", writer="orm")
+                                total_quotes += 1
+                            except Exception as e:
+                                print(f"{RED}Error al guardar la cita {index}: {e}{RESET}")
+                                cache.rollback_to(snapshot)  # Los IDs obtenidos en el savepoint ya no existen
+                                await dead_letters.add(session, quote, e)
+                            if index % BULK_BATCH_SIZE == 0 or index == len(quotes_list):
+                                await session.commit()
+                    if dead_letters.failed:
+                        print(f"{RED}{dead_letters.failed} citas no se han podido guardar y están en dead letters "
+                              f"(python src/main.py dead-letters --replay para reprocesarlas).{RESET}")
                 print(f"\n\n{SMILE} {GREEN} Se han insertado {total_quotes} citas correctamente en la base de datos. {CELEBRATION} {RESET}\n\n")
             except Exception as e:
                 print(f"{RED}Error al procesar las citas: {e}{RESET}")
-
-
-
-                
\ No newline at end of file
@@ -0,0 +1,155 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import namedtuple
+from sqlalchemy import func, exists
+from sqlalchemy.future import select
+from models import Author, Quote as DBQuote, Tag, QuoteTag, QuoteDetail
+from database import SessionLocal
+from sql_profiler import operation
+from extractors import clean_tag
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import SEARCH_TS_CONFIG, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE
+
+# Una cita encontrada: su ID (el cursor de la paginación), texto, autor y etiquetas separadas por comas
+SearchHit = namedtuple("SearchHit", ["id", "citation", "author", "tags"])
+# Una página de resultados y el cursor de la siguiente (None si es la última)
+SearchPage = namedtuple("SearchPage", ["hits", "next_cursor"])
+
+class QuoteSearch:
+    """
+    Búsqueda de citas por palabras del texto, etiquetas y autor, resuelta con índices.
+
+    - Texto: `quotes.search_vector` (columna generada con `to_tsvector`) con su índice GIN. La consulta
+      admite la sintaxis de `websearch_to_tsquery`: palabras, "frases entre comillas", `or` y `-excluir`.
+    - Etiquetas y autor: se traducen primero a sus IDs (índices UNIQUE de `tags.tag` y `author.name`) y
+      se filtran con los índices `(tag_id, quote_id)` y `(author_id, id)`. Varias etiquetas se combinan con AND.
+    - Paginación por cursor (keyset): los resultados se ordenan por ID de la cita y cada página empieza
+      después del último ID de la anterior, así que pedir la página 1000 cuesta lo mismo que la primera
+      (a diferencia de OFFSET, que recorre y descarta todas las filas anteriores).
+
+    El texto, el autor y las etiquetas de cada resultado se leen de `quote_details`, sin recalcular el join.
+
+    Atributos:
+        session_factory: Fábrica de sesiones asíncronas de SQLAlchemy.
+        config (str): Configuración de texto completo de PostgreSQL (la de la columna generada).
+    """
+
+    def __init__(self, session_factory=SessionLocal, config=SEARCH_TS_CONFIG):
+        self.session_factory = session_factory
+        self.config = config
+
+    @staticmethod
+    def _tags(tags):
+        """
+        Normaliza el filtro de etiquetas (una cadena o una lista) a una tupla sin repeticiones, con el mismo
+        formato con que los extractores guardan las etiquetas ("life" -> "Life").
+        """
+        if not tags:
+            return ()
+        if isinstance(tags, str):
+            tags = (tags,)
+        return tuple(dict.fromkeys(clean_tag(tag) for tag in tags if str(tag).strip()))
+
+    async def _resolve_filters(self, session, tags, author):
+        """
+        Traduce las etiquetas y el autor a sus IDs.
+
+        Returns:
+            Tuple[List[int], int | None] | None: IDs de las etiquetas y del autor, o None si alguno no
+            existe (la búsqueda no puede tener resultados).
+        """
+        tag_ids = []
+        if tags:
+            result = await session.execute(select(Tag.id).where(Tag.tag.in_(tags)))
+            tag_ids = list(result.scalars())
+            if len(tag_ids) < len(tags):
+                logger.warning(f"Alguna de las etiquetas {', '.join(tags)} no existe: la búsqueda no tiene resultados")
+                return None
+        author_id = None
+        if author:
+            author_id = (await session.execute(select(Author.id).where(Author.name == author))).scalar()
+            if author_id is None:
+                logger.warning(f"El autor {author} no existe: la búsqueda no tiene resultados")
+                return None
+        return tag_ids, author_id
+
+    def _statement(self, text, tag_ids, author_id, after, limit):
+        """Construye la consulta de una página de resultados."""
+        stmt = (
+            select(QuoteDetail.quote_id, QuoteDetail.citation, QuoteDetail.author, QuoteDetail.tags)
+            .join(DBQuote, DBQuote.id == QuoteDetail.quote_id)
+        )
+        if text:
+            stmt = stmt.where(DBQuote.search_vector.op("@@")(func.websearch_to_tsquery(self.config, text)))
+        if author_id is not None:
+            stmt = stmt.where(DBQuote.author_id == author_id)
+        for tag_id in tag_ids:
+            stmt = stmt.where(exists().where(QuoteTag.quote_id == DBQuote.id, QuoteTag.tag_id == tag_id))
+        if after is not None:
+            stmt = stmt.where(DBQuote.id > after)
+        # Una fila más de las pedidas para saber si hay página siguiente
+        return stmt.order_by(DBQuote.id).limit(limit + 1)
+
+    async def search(self, text=None, tags=None, author=None, limit=SEARCH_PAGE_SIZE, after=None, session=None):
+        """
+        Busca citas y devuelve una página de resultados.
+
+        Args:
+            text (str, opcional): Palabras a buscar en el texto de la cita (sintaxis de `websearch_to_tsquery`).
+            tags (str | List[str], opcional): Etiqueta o etiquetas que debe tener la cita (todas).
+            author (str, opcional): Nombre exacto del autor.
+            limit (int): Resultados por página (como máximo `SEARCH_MAX_PAGE_SIZE`).
+            after (int, opcional): Cursor devuelto por la página anterior (`next_cursor`).
+            session (AsyncSession, opcional): Sesión a usar; si no se indica, se abre una.
+
+        Returns:
+            SearchPage: Los resultados, ordenados por ID de la cita, y el cursor de la siguiente página.
+        """
+        limit = min(max(1, int(limit)), SEARCH_MAX_PAGE_SIZE)
+        text = text.strip() if text else None
+        tags = self._tags(tags)
+        author = author.strip() if author else None
+        if session is None:
+            async with self.session_factory() as session:
+                return await self.search(text, tags, author, limit, after, session)
+        try:
+            with operation("QuoteSearch.search"), metrics.timer("search_seconds"):
+                filters = await self._resolve_filters(session, tags, author)
+                if filters is None:
+                    return SearchPage([], None)
+                result = await session.execute(self._statement(text, *filters, after, limit))
+                hits = [SearchHit(*row) for row in result.all()]
+        except Exception as e:
+            logger.error(f"Error al buscar citas: {e}")
+            raise
+        metrics.inc("search_requests_total")
+        if len(hits) > limit:
+            return SearchPage(hits[:limit], hits[limit - 1].id)
+        return SearchPage(hits, None)
+
+    async def iterate(self, text=None, tags=None, author=None, page_size=SEARCH_PAGE_SIZE):
+        """
+        Recorre todos los resultados de una búsqueda, página a página.
+
+        Args:
+            text (str, opcional): Palabras a buscar en el texto de la cita.
+            tags (str | List[str], opcional): Etiqueta o etiquetas que debe tener la cita.
+            author (str, opcional): Nombre exacto del autor.
+            page_size (int): Resultados por consulta.
+
+        Yields:
+            SearchHit: Cada cita encontrada, en orden de ID.
+        """
+        after = None
+        async with self.session_factory() as session:
+            while True:
+                page = await self.search(text, tags, author, page_size, after, session)
+                for hit in page.hits:
+                    yield hit
+                if page.next_cursor is None:
+                    return
+                after = page.next_cursor
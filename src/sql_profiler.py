@@ -0,0 +1,263 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from src.utils.logger import logger
+from src.utils.constants import SQL_PROFILE_TOP_N, SQL_N_PLUS_ONE_THRESHOLD
+
+# Operación lógica en curso (p. ej. "Quote.save"); se propaga a los eventos del motor a través de greenlet
+_current_operation = ContextVar("sql_operation", default=None)
+
+# Sin operación lógica en curso
+NO_OPERATION = "(sin operación)"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"\$\d+(?:::[\w ]+(?:\[\])?)?|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_ROWS = re.compile(r"\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))+")
+_IN_LIST = re.compile(r"IN \(\?(?:, \?)*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+def statement_shape(statement):
+    """
+    Normaliza una sentencia SQL a su "forma": sin literales ni parámetros, con las listas VALUES e IN
+    de cualquier longitud reducidas a una sola, para agrupar las ejecuciones de la misma consulta.
+
+    Args:
+        statement (str): La sentencia tal como se envía al driver.
+
+    Returns:
+        str: La forma de la sentencia.
+    """
+    shape = _SPACES.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _ROWS.sub("(?, ...) ...", shape)
+    return _IN_LIST.sub("IN (...)", shape)
+
+@contextmanager
+def operation(name):
+    """
+    Marca un bloque de código (también con `await` dentro) como una operación lógica, p. ej. `Quote.save`.
+
+    El perfilador cuenta las sentencias de cada ejecución de la operación y detecta en ella los patrones
+    N+1. Si el perfilador no está activo, el coste es el de fijar una variable de contexto.
+
+    Args:
+        name (str): Nombre de la operación.
+    """
+    token = _current_operation.set(_Invocation(name))
+    try:
+        yield
+    finally:
+        invocation = _current_operation.get()
+        _current_operation.reset(token)
+        for profiler in SqlProfiler.active:
+            profiler._finish(invocation)
+
+class _Invocation:
+    """Una ejecución de una operación lógica: sentencias por forma y tiempo en la base de datos."""
+
+    __slots__ = ("name", "shapes", "statements", "seconds")
+
+    def __init__(self, name):
+        self.name = name
+        self.shapes = {}
+        self.statements = 0
+        self.seconds = 0.0
+
+class SqlProfiler:
+    """
+    Perfilador de sentencias SQL basado en los eventos del motor de SQLAlchemy (opcional).
+
+    Para cada forma de sentencia (ver `statement_shape`) acumula ejecuciones, tiempo total y máximo
+    y filas afectadas. Para cada operación lógica marcada con `operation(...)` cuenta ejecuciones,
+    sentencias y tiempo, y señala como N+1 las formas que se repiten `n_plus_one_threshold` veces o
+    más dentro de una misma ejecución (p. ej. una consulta por etiqueta dentro de `Quote.save`).
+
+    No depende del logging ni de `echo`: el informe se obtiene con `report()` o `write_report()`.
+
+    Atributos:
+        engine (AsyncEngine | Engine): Motor perfilado.
+        top_n (int): Número de sentencias del informe, ordenadas por tiempo total.
+        n_plus_one_threshold (int): Repeticiones de una forma en una operación que se consideran N+1.
+        active (List[SqlProfiler]): Perfiladores conectados (atributo de clase).
+    """
+
+    active = []
+
+    def __init__(self, engine, top_n=SQL_PROFILE_TOP_N, n_plus_one_threshold=SQL_N_PLUS_ONE_THRESHOLD):
+        self.engine = getattr(engine, "sync_engine", engine)
+        self.top_n = top_n
+        self.n_plus_one_threshold = max(2, int(n_plus_one_threshold))
+        self.started = None
+        self._shapes_cache = {}  # Sentencia -> forma
+        self._statements = {}  # Forma -> [ejecuciones, segundos, máximo, filas, executemany]
+        self._operations = {}  # Operación -> [ejecuciones, sentencias, segundos, máximo de sentencias]
+        self._n_plus_one = {}  # (operación, forma) -> [ejecuciones afectadas, máximo de repeticiones]
+        self._loose = _Invocation(NO_OPERATION)  # Sentencias fuera de cualquier operación
+
+    def attach(self):
+        """Empieza a perfilar las sentencias del motor."""
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+        event.listen(self.engine, "handle_error", self._error)
+        SqlProfiler.active.append(self)
+        self.started = time.time()
+        return self
+
+    def detach(self):
+        """Deja de perfilar las sentencias del motor."""
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+        event.remove(self.engine, "handle_error", self._error)
+        if self in SqlProfiler.active:
+            SqlProfiler.active.remove(self)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_profiler_start", []).append(time.perf_counter())
+
+    def _error(self, exception_context):
+        """Descarta el inicio de una sentencia que ha fallado."""
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("sql_profiler_start"):
+            connection.info["sql_profiler_start"].pop()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("sql_profiler_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        shape = self._shapes_cache.get(statement)
+        if shape is None:
+            shape = self._shapes_cache[statement] = statement_shape(statement)
+        stats = self._statements.get(shape)
+        if stats is None:
+            stats = self._statements[shape] = [0, 0.0, 0.0, 0, executemany]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount and rowcount > 0:
+            stats[3] += rowcount
+        invocation = _current_operation.get() or self._loose
+        invocation.shapes[shape] = invocation.shapes.get(shape, 0) + 1
+        invocation.statements += 1
+        invocation.seconds += elapsed
+
+    def _finish(self, invocation):
+        """Acumula una ejecución terminada de una operación y busca patrones N+1 en ella."""
+        stats = self._operations.get(invocation.name)
+        if stats is None:
+            stats = self._operations[invocation.name] = [0, 0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += invocation.statements
+        stats[2] += invocation.seconds
+        stats[3] = max(stats[3], invocation.statements)
+        for shape, count in invocation.shapes.items():
+            if count >= self.n_plus_one_threshold:
+                flagged = self._n_plus_one.setdefault((invocation.name, shape), [0, 0])
+                flagged[0] += 1
+                flagged[1] = max(flagged[1], count)
+        invocation.shapes.clear()
+
+    def report(self, top_n=None):
+        """
+        Construye el informe del perfilado.
+
+        Args:
+            top_n (int, opcional): Número de sentencias del informe (por defecto `self.top_n`).
+
+        Returns:
+            dict: Totales, sentencias más costosas por tiempo total, estadísticas por operación
+            lógica y patrones N+1 detectados.
+        """
+        top_n = top_n or self.top_n
+        statements = sorted(self._statements.items(), key=lambda item: item[1][1], reverse=True)
+        total_seconds = sum(stats[1] for _, stats in statements)
+        operations = dict(self._operations)
+        if self._loose.statements:
+            operations[NO_OPERATION] = [None, self._loose.statements, self._loose.seconds, None]
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)) if self.started else None,
+            "statements": sum(stats[0] for _, stats in statements),
+            "shapes": len(statements),
+            "db_seconds": round(total_seconds, 6),
+            "top_statements": [
+                {
+                    "statement": shape,
+                    "calls": calls,
+                    "total_ms": round(seconds * 1000, 3),
+                    "mean_ms": round(seconds / calls * 1000, 3),
+                    "max_ms": round(maximum * 1000, 3),
+                    "share": round(seconds / total_seconds, 4) if total_seconds else None,
+                    "rows": rows,
+                    "executemany": executemany,
+                }
+                for shape, (calls, seconds, maximum, rows, executemany) in statements[:top_n]
+            ],
+            "operations": {
+                name: {
+                    "calls": calls,
+                    "statements": count,
+                    "statements_per_call": round(count / calls, 2) if calls else None,
+                    "max_statements": maximum,
+                    "db_ms": round(seconds * 1000, 3),
+                }
+                for name, (calls, count, seconds, maximum) in sorted(operations.items(), key=lambda item: -item[1][2])
+            },
+            "n_plus_one": [
+                {"operation": name, "statement": shape, "calls_affected": affected, "max_repeats": repeats}
+                for (name, shape), (affected, repeats) in sorted(self._n_plus_one.items(), key=lambda item: -item[1][0])
+            ],
+        }
+
+    def format_report(self, top_n=None):
+        """
+        Devuelve el informe en texto, para mostrarlo por pantalla.
+
+        Args:
+            top_n (int, opcional): Número de sentencias del informe.
+
+        Returns:
+            str: El informe.
+        """
+        data = self.report(top_n)
+        lines = [f"Sentencias SQL: {data['statements']} ({data['shapes']} formas), {data['db_seconds'] * 1000:.1f} ms en la base de datos",
+                 "", "Sentencias con más tiempo total:"]
+        for item in data["top_statements"]:
+            statement = item["statement"] if len(item["statement"]) <= 120 else item["statement"][:117] + "..."
+            lines.append(f"  {item['total_ms']:>10.1f} ms  {item['calls']:>7} x  {item['mean_ms']:>8.3f} ms  {statement}")
+        lines += ["", "Operaciones:"]
+        for name, item in data["operations"].items():
+            per_call = f"{item['statements_per_call']} sentencias/llamada" if item["calls"] else ""
+            lines.append(f"  {name}: {item['statements']} sentencias, {item['db_ms']:.1f} ms {per_call}".rstrip())
+        if data["n_plus_one"]:
+            lines += ["", "Posibles N+1:"]
+            for item in data["n_plus_one"]:
+                lines.append(f"  {item['operation']}: hasta {item['max_repeats']} repeticiones en {item['calls_affected']} llamadas de {item['statement'][:120]}")
+        return "\n".join(lines)
+
+    def write_report(self, path):
+        """
+        Guarda el informe en JSON.
+
+        Args:
+            path (str): Ruta del fichero.
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+                f.write("\n")
+        except OSError as e:
+            logger.error(f"Error al guardar el informe del perfilador SQL: {e}")
+            raise
@@ -1,3 +1,9 @@
+import os
+from src.utils.environment import load_environment
+
+# Las constantes configurables se leen de las variables de entorno, incluidas las del archivo .env
+load_environment()
+
 # Definición de colores, estilos e iconos
 ITALIC = "\033[3m"
 RESET = "\033[0m"
@@ -18,8 +24,95 @@ SMILE = "\U0001F600"     # 😀
 
 # Resto de constantes
 
-URL_BASE = 'https://quotes.toscrape.com/'
+# Web a scrapear (la variable de entorno `URL_BASE` permite apuntar a otro servidor, p. ej. el de los benchmarks)
+URL_BASE = os.getenv('URL_BASE', 'https://quotes.toscrape.com/')
 URL_PAGE = 'page/'
+# Número máximo de páginas descargándose a la vez
+MAX_CONCURRENCY = 8
+# Segundos máximos entre checkpoints de la frontera persistente (crawls reanudables)
+FRONTIER_CHECKPOINT_INTERVAL = 2.0
+# Páginas del listado fallidas seguidas (tras agotar los reintentos) que detienen el recorrido
+CRAWL_MAX_CONSECUTIVE_FAILURES = 5
+# Veces que se vuelve a pedir una página del listado fallida (cuando se recupera el servidor o al final del recorrido)
+CRAWL_PAGE_RETRIES = 1
+# Archivo del HTML descargado: tamaño (bytes) de cada segmento y nivel de compresión zstd
+ARCHIVE_SEGMENT_SIZE = 64 * 1024 * 1024
+ARCHIVE_ZSTD_LEVEL = 3
+# Caché de autores: entradas en memoria y tiempo de vida (segundos) de las entradas en disco
+AUTHOR_CACHE_SIZE = 1024
+AUTHOR_CACHE_TTL = 7 * 24 * 60 * 60
+# Motor de análisis HTML por defecto: "bs4", "bs4-lxml", "lxml" o "selectolax"
+PARSER_BACKEND = "bs4"
+# Análisis HTML en un pool de procesos: trabajadores (0 = en el bucle de eventos), páginas por lote y espera máxima (s) del lote
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', 0))
+PARSE_BATCH_SIZE = 8
+PARSE_BATCH_DELAY = 0.002
+# Capacidad de cada cola entre etapas del pipeline (backpressure)
+PIPELINE_QUEUE_SIZE = 64
+# Escritura por lotes: citas por transacción y máximo de parámetros por sentencia (asyncpg admite 32767)
+BULK_BATCH_SIZE = 500
+BULK_MAX_PARAMS = 30000
+# Citas por transacción al reprocesar las dead letters (citas que no se pudieron guardar)
+DEAD_LETTER_BATCH_SIZE = 500
+# Escritura en paralelo (modo "bulk"): sesiones que escriben a la vez, cada una con su partición de autores.
+# Por defecto 2 (1 en una máquina de un núcleo): con más, el benchmark de escritura no mejora y cada sesión
+# ocupa una conexión del pool que necesitan el resto de etapas
+DB_WRITERS = int(os.getenv('DB_WRITERS', min(2, os.cpu_count() or 1)))
+# Pool de conexiones a la base de datos: conexiones fijas y adicionales (debe cubrir DB_WRITERS y el resto de etapas)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+# Modo de escritura por defecto ("bulk" o "copy") y citas por transacción en el modo COPY
+LOAD_MODE = "bulk"
+COPY_BATCH_SIZE = 5000
+# Pool de conexiones HTTP: conexiones totales, por host, keep-alive (s), caché DNS (s) y timeout (s)
+HTTP_POOL_SIZE = 32
+HTTP_POOL_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 30
+HTTP_DNS_TTL = 300
+HTTP_TIMEOUT = 30
+# Control de tráfico por host: peticiones/s y ráfaga del cubo de tokens (0 = sin límite de ritmo),
+# límites de concurrencia AIMD y latencia media (s) a partir de la cual se considera que el servidor está saturado
+RATE_LIMIT_PER_HOST = float(os.getenv('RATE_LIMIT_PER_HOST', 20))
+RATE_LIMIT_BURST = 10
+AIMD_MIN_CONCURRENCY = 1
+AIMD_MAX_CONCURRENCY = HTTP_POOL_PER_HOST
+AIMD_LATENCY_TARGET = 5.0
+# Reintentos de fallos transitorios (429, 5xx, red): intentos totales y espera base/máxima (s) del backoff exponencial
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30
+# Telemetría: prefijo de las métricas, cubetas (s) de los histogramas de latencia y servidor Prometheus (/metrics).
+# Con METRICS_PORT=0 no se arranca el servidor; el resumen JSON se guarda en METRICS_SUMMARY_PATH (por defecto logs/metrics.json)
+METRICS_PREFIX = "scraper"
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_HOST = os.getenv('METRICS_HOST', '0.0.0.0')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+METRICS_SUMMARY_PATH = os.getenv('METRICS_SUMMARY_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs', 'metrics.json'))
+# Perfilador SQL (SQL_PROFILE=1): sentencias del informe, repeticiones de una consulta dentro de una operación
+# que se señalan como N+1 y fichero JSON del informe
+SQL_PROFILE_TOP_N = 20
+SQL_N_PLUS_ONE_THRESHOLD = 3
+SQL_PROFILE_PATH = os.getenv('SQL_PROFILE_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs', 'sql_profile.json'))
+# Búsqueda: configuración de texto completo de PostgreSQL (la misma que la columna generada quotes.search_vector),
+# resultados por página por defecto y máximo
+SEARCH_TS_CONFIG = "english"
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 1000
+# Crawl distribuido (cola de trabajos en PostgreSQL): trabajos en curso por trabajador, duración (s) del lease,
+# intervalo (s) entre heartbeats, espera (s) cuando la cola está vacía, intentos por trabajo, espera base (s) entre
+# reintentos y páginas del listado que siembra el coordinador (las siguientes las añaden los trabajadores)
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', MAX_CONCURRENCY))
+WORKER_LEASE_SECONDS = 60
+WORKER_HEARTBEAT_INTERVAL = 10
+WORKER_POLL_INTERVAL = 0.5
+WORKER_MAX_ATTEMPTS = 5
+WORKER_RETRY_DELAY = 5
+COORDINATOR_SEED_PAGES = 10
+# Exportación del corpus: filas por lote (cursor del servidor y grupo de filas de Parquet) y compresión de Parquet
+EXPORT_BATCH_SIZE = 50000
+EXPORT_PARQUET_COMPRESSION = "zstd"
 # User-Agent para protegernos de baneos
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, como Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -0,0 +1,22 @@
+import os
+
+# Archivo .env de la raíz del proyecto
+ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
+
+_env_loaded = False
+
+def load_environment():
+    """
+    Carga las variables del archivo .env de la raíz del proyecto (sin sobrescribir las ya definidas).
+
+    Se llama antes de leer cualquier variable de entorno de la configuración (`constants.py` y el esquema
+    de `database.py`). Solo lee el archivo la primera vez, y dotenv solo se importa si el archivo existe:
+    sin .env (p. ej. en Docker, con las variables ya definidas) no cuesta nada.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    if os.path.exists(ENV_PATH):
+        from dotenv import load_dotenv
+        load_dotenv(ENV_PATH)
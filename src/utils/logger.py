@@ -1,21 +1,18 @@
 import logging
 import os
+import threading
 from logging.handlers import RotatingFileHandler
 from src.utils.constants import RED_CIRCLE, WHITE, RED, GREEN, YELLOW, PASTEL_YELLOW, RESET
 
-# Ruta de la carpeta de logs
+# Ruta de la carpeta de logs (se crea al configurar el logging, no al importar el módulo)
 src_dir = os.path.dirname(os.path.dirname(__file__))
 log_dir = os.path.join(src_dir, '..', 'logs')
-
-# Crea la carpeta si no existe
-if not os.path.exists(log_dir):
-    try:
-        os.makedirs(log_dir)
-    except OSError as e:
-        raise OSError(f"{RED_CIRCLE} {RED}Error al crear la carpeta de logs: {YELLOW}{e}{RESET}")
-
 log_file = os.path.join(log_dir, 'logs.log')
 
+# El logging se configura una sola vez, la primera vez que se usa un logger de este módulo
+_configured = False
+_configure_lock = threading.Lock()
+
 class ColoredFormatter(logging.Formatter):
     """
     Formatter personalizado para añadir colores a los mensajes de logging.
@@ -34,7 +31,26 @@ class ColoredFormatter(logging.Formatter):
 def setup_logging():
     """
     Configura el sistema de logging con color y rotación de archivos.
+
+    Crea la carpeta de logs y añade los handlers al root logger. Solo actúa la primera vez: las
+    llamadas siguientes no hacen nada.
     """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        _configure()
+        _configured = True
+
+def _configure():
+    """Crea la carpeta de logs y los handlers de archivo y consola."""
+    # Crea la carpeta si no existe
+    if not os.path.exists(log_dir):
+        try:
+            os.makedirs(log_dir)
+        except OSError as e:
+            raise OSError(f"{RED_CIRCLE} {RED}Error al crear la carpeta de logs: {YELLOW}{e}{RESET}")
+
     try:
         # Configuración del archivo de logs con rotación
         file_handler = RotatingFileHandler(
@@ -82,20 +98,39 @@ def setup_logging():
     except Exception as e:
         raise RuntimeError(f"{RED}{RED_CIRCLE} - Error al configurar el logging: {e}{RESET}")
 
+class LazyLogger:
+    """
+    Logger que configura el logging la primera vez que se usa.
+
+    Importar un módulo que registra mensajes no crea la carpeta de logs ni añade handlers: eso ocurre
+    con el primer mensaje (o con cualquier otro uso del logger), así que los comandos que no registran
+    nada arrancan sin ese coste.
+
+    Atributos:
+        name (str): Nombre del logger.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._logger = None
+
+    def __getattr__(self, attribute):
+        if self._logger is None:
+            setup_logging()
+            self._logger = logging.getLogger(self.name)
+        return getattr(self._logger, attribute)
+
 def get_logger(name):
     """
-    Obtiene un logger configurado.
+    Obtiene un logger que configura el logging la primera vez que se usa.
 
     Args:
         name (str): Nombre del logger.
 
     Returns:
-        logging.Logger: Logger configurado.
+        LazyLogger: Logger configurado.
     """
-    return logging.getLogger(name)
-
-# Configura el logging
-setup_logging()
+    return LazyLogger(name)
 
 # Obtén el logger
 logger = get_logger(__name__)
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from src.utils.constants import METRICS_PREFIX, METRICS_LATENCY_BUCKETS
+
+def _escape(value):
+    """Escapa el valor de una etiqueta de Prometheus (barras, comillas y saltos de línea)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class Histogram:
+    """
+    Histograma acumulativo con cubetas fijas (formato Prometheus).
+
+    Atributos:
+        buckets (tuple): Límites superiores de las cubetas (segundos).
+        counts (List[int]): Observaciones por cubeta (la última es +Inf).
+        count (int): Número total de observaciones.
+        sum (float): Suma de todas las observaciones.
+        max (float): Observación máxima.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """Registra una observación."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, fraction):
+        """
+        Estima un percentil por interpolación lineal dentro de su cubeta.
+
+        Args:
+            fraction (float): Percentil entre 0 y 1.
+
+        Returns:
+            float | None: El percentil estimado, o None si no hay observaciones.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+class Metrics:
+    """
+    Registro en memoria de contadores e histogramas de latencia de cada etapa del scraper.
+
+    Cada métrica se identifica por su nombre y sus etiquetas (`stage="parse"`, `status="200"`...).
+    Registrar un valor es una suma en un diccionario (y una búsqueda binaria en los histogramas),
+    de modo que la instrumentación puede quedarse activa en producción.
+
+    Las métricas se exponen en formato de texto de Prometheus (`render()`, servido por `serve()` en
+    `/metrics`) y como resumen JSON al final de la ejecución (`summary()` / `write_summary()`).
+
+    Atributos:
+        prefix (str): Prefijo de los nombres de las métricas.
+        buckets (tuple): Cubetas (segundos) de los histogramas.
+        started (float): Instante (epoch) en que se creó el registro.
+    """
+
+    def __init__(self, prefix=METRICS_PREFIX, buckets=METRICS_LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self._counters = {}  # (nombre, etiquetas) -> valor
+        self._histograms = {}  # (nombre, etiquetas) -> Histogram
+        self._lock = threading.Lock()  # Los hilos del pool de análisis y de SQLAlchemy también registran métricas
+
+    def inc(self, name, value=1, **labels):
+        """
+        Suma `value` a un contador.
+
+        Args:
+            name (str): Nombre del contador (sin prefijo).
+            value (float): Cantidad a sumar.
+            **labels: Etiquetas de la serie.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Registra una observación (en segundos) en un histograma.
+
+        Args:
+            name (str): Nombre del histograma (sin prefijo).
+            value (float): Valor observado.
+            **labels: Etiquetas de la serie.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Mide la duración del bloque `with` (también con `await` dentro) y la registra en un histograma."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        """Borra todas las métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+    @staticmethod
+    def _labels(labels, extra=None):
+        """Formatea las etiquetas de una serie para Prometheus."""
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self):
+        """
+        Devuelve todas las métricas en el formato de texto de Prometheus (versión 0.0.4).
+
+        Returns:
+            str: Las métricas, una serie por línea.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(h.counts), h.count, h.sum)) for key, h in self._histograms.items())
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            full = f"{self.prefix}_{name}"
+            if full not in declared:
+                lines.append(f"# TYPE {full} counter")
+                declared.add(full)
+            lines.append(f"{full}{self._labels(labels)} {value:g}")
+        for (name, labels), (counts, count, total) in histograms:
+            full = f"{self.prefix}_{name}"
+            if full not in declared:
+                lines.append(f"# TYPE {full} histogram")
+                declared.add(full)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{full}_bucket{self._labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{full}_sum{self._labels(labels)} {total:.6f}")
+            lines.append(f"{full}_count{self._labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _series(name, labels):
+        """Nombre legible de una serie para el resumen JSON (p. ej. `stage_seconds{stage=parse}`)."""
+        if not labels:
+            return name
+        return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
+
+    def summary(self):
+        """
+        Resume las métricas de la ejecución.
+
+        Returns:
+            dict: Duración, contadores y, por histograma, número de observaciones, total, media,
+            p50/p95/p99 estimados y máximo (en milisegundos).
+        """
+        with self._lock:
+            counters = {self._series(name, labels): value for (name, labels), value in sorted(self._counters.items())}
+            histograms = {}
+            for (name, labels), h in sorted(self._histograms.items()):
+                histograms[self._series(name, labels)] = {
+                    "count": h.count,
+                    "total_seconds": round(h.sum, 6),
+                    "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else None,
+                    "p50_ms": round(h.quantile(0.50) * 1000, 3) if h.count else None,
+                    "p95_ms": round(h.quantile(0.95) * 1000, 3) if h.count else None,
+                    "p99_ms": round(h.quantile(0.99) * 1000, 3) if h.count else None,
+                    "max_ms": round(h.max * 1000, 3) if h.count else None,
+                }
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.started)),
+            "duration_seconds": round(time.time() - self.started, 3),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def write_summary(self, path):
+        """
+        Guarda el resumen JSON de la ejecución.
+
+        Args:
+            path (str): Ruta del fichero JSON.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+            f.write("\n")
+
+    async def serve(self, host, port):
+        """
+        Arranca un servidor HTTP (aiohttp) en el bucle de eventos en curso que expone `/metrics`.
+
+        Args:
+            host (str): Dirección en la que escuchar.
+            port (int): Puerto.
+
+        Returns:
+            aiohttp.web.AppRunner: El servidor; se detiene con `await runner.cleanup()`.
+        """
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(body=self.render().encode("utf-8"),
+                                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+# Registro compartido por todo el proceso
+metrics = Metrics()
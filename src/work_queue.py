@@ -0,0 +1,284 @@
+import sys
+import os
+# Añade el directorio raíz al sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import socket
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+from sqlalchemy import func, update, delete
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from models import CrawlJob, CrawlWorkerRecord
+from database import SessionLocal
+from src.utils.logger import logger
+from src.utils.metrics import metrics
+from src.utils.constants import WORKER_LEASE_SECONDS, WORKER_MAX_ATTEMPTS, WORKER_RETRY_DELAY
+
+# Tipos y estados de un trabajo
+PAGE = "page"
+AUTHOR = "author"
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Un trabajo reclamado por un trabajador
+Job = namedtuple("Job", ["id", "kind", "url", "payload", "attempts"])
+
+def new_worker_id():
+    """Identificador único de un trabajador: máquina, proceso y sufijo aleatorio."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class WorkQueue:
+    """
+    Cola de trabajos del crawl distribuido en la tabla `crawl_jobs` del esquema `quotes`.
+
+    Cada trabajo es una página del listado (`page`) o la página "about" de un autor (`author`), único
+    por (tipo, URL), de modo que encolar dos veces el mismo trabajo no lo duplica.
+
+    - `claim` reclama trabajos pendientes con `SELECT … FOR UPDATE SKIP LOCKED`: varios trabajadores
+      reclaman a la vez sin esperarse ni recibir el mismo trabajo.
+    - Cada trabajo reclamado tiene un lease de `lease` segundos que el trabajador renueva con `heartbeat`.
+      `reclaim_expired` devuelve a la cola los trabajos cuyo lease ha caducado (trabajador caído).
+    - Un trabajo que falla vuelve a la cola tras una espera creciente, hasta `max_attempts` intentos;
+      después queda como `failed`.
+
+    Los trabajos se procesan al menos una vez (un trabajador lento puede perder su lease y otro repetir
+    el trabajo); las escrituras de citas y autores son upserts, así que repetirlos no duplica filas.
+
+    Atributos:
+        session_factory: Fábrica de sesiones asíncronas de SQLAlchemy.
+        lease (float): Duración (segundos) del lease de un trabajo.
+        max_attempts (int): Intentos de un trabajo antes de marcarlo como fallido.
+        retry_delay (float): Espera base (segundos) antes de reintentar un trabajo fallido.
+    """
+
+    def __init__(self, session_factory=SessionLocal, lease=WORKER_LEASE_SECONDS, max_attempts=WORKER_MAX_ATTEMPTS,
+                 retry_delay=WORKER_RETRY_DELAY):
+        self.session_factory = session_factory
+        self.lease = lease
+        self.max_attempts = max(1, int(max_attempts))
+        self.retry_delay = retry_delay
+
+    def _lease_end(self):
+        """Expresión SQL del fin de un lease que empieza ahora."""
+        return func.now() + timedelta(seconds=self.lease)
+
+    @staticmethod
+    def enqueue_statement(jobs):
+        """
+        Sentencia que encola trabajos, ignorando los que ya existen.
+
+        Args:
+            jobs (List[tuple]): (tipo, URL, payload) de cada trabajo.
+
+        Returns:
+            Insert: La sentencia (None si no hay trabajos).
+        """
+        rows = [{"kind": kind, "url": url, "payload": payload} for kind, url, payload in jobs]
+        if not rows:
+            return None
+        return insert(CrawlJob).values(rows).on_conflict_do_nothing(index_elements=[CrawlJob.kind, CrawlJob.url])
+
+    async def enqueue(self, session, jobs):
+        """
+        Encola trabajos en la transacción de `session` (sin confirmarla).
+
+        Args:
+            session (AsyncSession): Sesión activa.
+            jobs (List[tuple]): (tipo, URL, payload) de cada trabajo.
+
+        Returns:
+            int: Trabajos nuevos.
+        """
+        stmt = self.enqueue_statement(jobs)
+        if stmt is None:
+            return 0
+        result = await session.execute(stmt)
+        return max(0, result.rowcount or 0)
+
+    async def seed(self, jobs, reset=False):
+        """
+        Siembra la cola (coordinador).
+
+        Args:
+            jobs (List[tuple]): (tipo, URL, payload) de cada trabajo.
+            reset (bool): Si es True, borra antes todos los trabajos (también los terminados).
+
+        Returns:
+            int: Trabajos nuevos.
+        """
+        try:
+            async with self.session_factory() as session:
+                if reset:
+                    await session.execute(delete(CrawlJob))
+                added = await self.enqueue(session, jobs)
+                await session.commit()
+        except Exception as e:
+            logger.error(f"Error al sembrar la cola de trabajos: {e}")
+            raise
+        return added
+
+    async def claim(self, session, worker_id, limit):
+        """
+        Reclama hasta `limit` trabajos pendientes para un trabajador y confirma la reclamación.
+
+        Args:
+            session (AsyncSession): Sesión activa.
+            worker_id (str): Trabajador que reclama.
+            limit (int): Máximo de trabajos.
+
+        Returns:
+            List[Job]: Los trabajos reclamados, en orden de llegada.
+        """
+        candidates = (
+            select(CrawlJob.id)
+            .where(CrawlJob.status == PENDING, CrawlJob.available_at <= func.now())
+            .order_by(CrawlJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(CrawlJob)
+            .where(CrawlJob.id.in_(candidates.scalar_subquery()))
+            .values(status=RUNNING, worker_id=worker_id, attempts=CrawlJob.attempts + 1, lease_expires_at=self._lease_end())
+            .returning(CrawlJob.id, CrawlJob.kind, CrawlJob.url, CrawlJob.payload, CrawlJob.attempts)
+        )
+        result = await session.execute(stmt)
+        jobs = sorted((Job(*row) for row in result.all()), key=lambda job: job.id)
+        await session.commit()
+        if jobs:
+            metrics.inc("queue_claimed_total", len(jobs))
+        return jobs
+
+    async def complete(self, session, job, worker_id):
+        """
+        Marca un trabajo como terminado en la transacción de `session` (sin confirmarla).
+
+        Returns:
+            bool: False si el trabajador ya no tenía el trabajo (su lease caducó y otro lo reclamó).
+        """
+        result = await session.execute(
+            update(CrawlJob)
+            .where(CrawlJob.id == job.id, CrawlJob.worker_id == worker_id, CrawlJob.status == RUNNING)
+            .values(status=DONE, lease_expires_at=None, finished_at=func.now(), error=None)
+        )
+        if not result.rowcount:
+            logger.warning(f"El trabajo {job.kind} {job.url} ya no pertenece a {worker_id} (lease caducado)")
+            return False
+        return True
+
+    async def fail(self, session, job, worker_id, error, final=False):
+        """
+        Devuelve a la cola un trabajo fallido (tras una espera creciente) o lo marca como `failed` si ha
+        agotado sus intentos o el error es definitivo, y confirma el cambio.
+
+        Args:
+            session (AsyncSession): Sesión activa.
+            job (Job): El trabajo.
+            worker_id (str): Trabajador que lo tenía.
+            error (Exception | str): El error.
+            final (bool): Si es True, el error no se arregla reintentando (p. ej. un 404): no se reintenta.
+        """
+        final = final or job.attempts >= self.max_attempts
+        values = {"status": FAILED if final else PENDING, "worker_id": None, "lease_expires_at": None,
+                  "error": str(error)[:2000]}
+        if final:
+            values["finished_at"] = func.now()
+        else:
+            values["available_at"] = func.now() + timedelta(seconds=self.retry_delay * job.attempts)
+        await session.execute(
+            update(CrawlJob).where(CrawlJob.id == job.id, CrawlJob.worker_id == worker_id).values(**values)
+        )
+        await session.commit()
+        metrics.inc("queue_failed_total" if final else "queue_retried_total", kind=job.kind)
+
+    async def release(self, session, worker_id):
+        """Devuelve a la cola, sin contar el intento, los trabajos en curso de un trabajador que se detiene."""
+        await session.execute(
+            update(CrawlJob)
+            .where(CrawlJob.worker_id == worker_id, CrawlJob.status == RUNNING)
+            .values(status=PENDING, worker_id=None, lease_expires_at=None, attempts=CrawlJob.attempts - 1)
+        )
+        await session.execute(delete(CrawlWorkerRecord).where(CrawlWorkerRecord.worker_id == worker_id))
+        await session.commit()
+
+    async def register(self, session, worker_id):
+        """Registra un trabajador en `crawl_workers`."""
+        await session.execute(
+            insert(CrawlWorkerRecord)
+            .values(worker_id=worker_id, host=socket.gethostname(), pid=os.getpid())
+            .on_conflict_do_nothing(index_elements=[CrawlWorkerRecord.worker_id])
+        )
+        await session.commit()
+
+    async def heartbeat(self, session, worker_id, jobs_done):
+        """
+        Renueva los leases de los trabajos en curso de un trabajador y su último heartbeat.
+
+        Returns:
+            int: Trabajos cuyo lease se ha renovado.
+        """
+        result = await session.execute(
+            update(CrawlJob)
+            .where(CrawlJob.worker_id == worker_id, CrawlJob.status == RUNNING)
+            .values(lease_expires_at=self._lease_end())
+        )
+        await session.execute(
+            update(CrawlWorkerRecord)
+            .where(CrawlWorkerRecord.worker_id == worker_id)
+            .values(heartbeat_at=func.now(), jobs_done=jobs_done)
+        )
+        await session.commit()
+        return result.rowcount or 0
+
+    async def reclaim_expired(self, session):
+        """
+        Devuelve a la cola los trabajos cuyo lease ha caducado y da de baja a los trabajadores sin
+        heartbeat durante más de un lease.
+
+        Returns:
+            int: Trabajos recuperados.
+        """
+        result = await session.execute(
+            update(CrawlJob)
+            .where(CrawlJob.status == RUNNING, CrawlJob.lease_expires_at < func.now())
+            .values(status=PENDING, worker_id=None, lease_expires_at=None)
+            .returning(CrawlJob.id)
+        )
+        reclaimed = len(result.all())
+        await session.execute(
+            delete(CrawlWorkerRecord).where(CrawlWorkerRecord.heartbeat_at < func.now() - timedelta(seconds=self.lease))
+        )
+        await session.commit()
+        if reclaimed:
+            metrics.inc("queue_reclaimed_total", reclaimed)
+            logger.warning(f"Recuperados {reclaimed} trabajos con el lease caducado")
+        return reclaimed
+
+    async def remaining(self, session):
+        """Trabajos pendientes o en curso."""
+        result = await session.execute(
+            select(func.count()).select_from(CrawlJob).where(CrawlJob.status.in_((PENDING, RUNNING)))
+        )
+        return result.scalar()
+
+    async def stats(self, session=None):
+        """
+        Estado de la cola.
+
+        Returns:
+            dict: Trabajos por tipo y estado ("page.done": 10, ...) y trabajadores vivos.
+        """
+        if session is None:
+            async with self.session_factory() as session:
+                return await self.stats(session)
+        result = await session.execute(
+            select(CrawlJob.kind, CrawlJob.status, func.count()).group_by(CrawlJob.kind, CrawlJob.status)
+        )
+        counts = {f"{kind}.{status}": count for kind, status, count in result.all()}
+        workers = await session.execute(select(func.count()).select_from(CrawlWorkerRecord))
+        counts["workers"] = workers.scalar()
+        return counts
@@ -0,0 +1,96 @@
+import sys
+import os
+# Añade el directorio raíz y src/ al sys.path (los módulos de src/ se importan por su nombre)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "src"))
+
+import asyncio
+import re
+import pytest
+from src.utils.environment import load_environment
+
+# Las pruebas de integración usan su propia base de datos (TEST_DB_NAME, por defecto "quotes_test") en el
+# servidor configurado con las variables DB_* (o el .env): el esquema se vuelve a crear antes de cada prueba.
+load_environment()
+TEST_DB_NAME = os.getenv("TEST_DB_NAME", "quotes_test")
+os.environ["DB_NAME"] = TEST_DB_NAME
+
+INIT_SQL = os.path.join(ROOT, "initdb", "init.sql")
+
+def _connect_options(database):
+    """Parámetros de conexión de asyncpg a partir de las variables DB_*."""
+    return {
+        "host": os.getenv("DB_HOST", "postgres"),
+        "port": int(os.getenv("DB_PORT", "5432")),
+        "user": os.getenv("DB_USER", "postgres"),
+        "password": os.getenv("DB_PASSWORD", "postgres"),
+        "database": database,
+        "timeout": 5,
+    }
+
+def schema_script():
+    """
+    Parte de initdb/init.sql que crea el esquema, sin los comandos de psql ni lo que actúa sobre la base de
+    datos "quotes" (cerrar sus conexiones y comentarla), para ejecutarla en la base de datos de pruebas.
+    """
+    with open(INIT_SQL, encoding="utf-8") as f:
+        script = f.read()
+    script = script.split("\\c quotes", 1)[1]
+    return re.sub(r"COMMENT ON DATABASE quotes\s+IS '[^']*';", "", script)
+
+async def _create_database():
+    """Crea la base de datos de pruebas si no existe."""
+    import asyncpg
+
+    conn = await asyncpg.connect(**_connect_options("postgres"))
+    try:
+        if not await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", TEST_DB_NAME):
+            await conn.execute(f'CREATE DATABASE "{TEST_DB_NAME}"')
+    finally:
+        await conn.close()
+
+async def _load_schema():
+    """Vuelve a crear el esquema "quotes" en la base de datos de pruebas."""
+    import asyncpg
+
+    conn = await asyncpg.connect(**_connect_options(TEST_DB_NAME))
+    try:
+        await conn.execute("SET client_min_messages TO WARNING")
+        await conn.execute(schema_script())
+    finally:
+        await conn.close()
+
+@pytest.fixture(scope="session")
+def database():
+    """Base de datos de pruebas; las pruebas se omiten si PostgreSQL no está disponible."""
+    import asyncpg
+
+    try:
+        asyncio.run(_create_database())
+    except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+        pytest.skip(f"PostgreSQL no disponible ({e}): configure DB_HOST, DB_USER y DB_PASSWORD")
+    return TEST_DB_NAME
+
+@pytest.fixture
+def db(database):
+    """Esquema recién creado para cada prueba."""
+    asyncio.run(_load_schema())
+    return database
+
+@pytest.fixture
+def run():
+    """
+    Ejecuta una corrutina en un bucle de eventos nuevo y cierra después las conexiones del motor, que
+    pertenecen a ese bucle.
+    """
+    from database import dispose_engine
+
+    def runner(coro):
+        async def main():
+            try:
+                return await coro
+            finally:
+                await dispose_engine()
+        return asyncio.run(main())
+    return runner
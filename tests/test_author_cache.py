@@ -0,0 +1,111 @@
+"""Pruebas de `AuthorCache` (src/author_cache.py) con una descarga simulada y un SQLite temporal."""
+
+import asyncio
+import pytest
+
+class FakeLoader:
+    """Descarga simulada de la página "about": cuenta las llamadas y tarda `delay` segundos."""
+
+    def __init__(self, delay=0.02, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    async def __call__(self, key):
+        self.calls.append(key)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"author_title": key, "call": len(self.calls)}
+
+def test_concurrent_lookups_share_one_load():
+    from author_cache import AuthorCache
+
+    cache = AuthorCache()
+    loader = FakeLoader()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get("/author/Ada", loader) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+    assert loader.calls == ["/author/Ada"]
+    assert all(result == {"author_title": "/author/Ada", "call": 1} for result in results)
+    assert (cache.misses, cache.hits) == (1, 9)
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    from author_cache import AuthorCache
+
+    cache = AuthorCache()
+    loader = FakeLoader(delay=0.05)
+
+    async def scenario():
+        owner = asyncio.ensure_future(cache.get("/author/Ada", loader))
+        await asyncio.sleep(0)  # El primero inicia la descarga
+        others = [asyncio.ensure_future(cache.get("/author/Ada", loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return results, await cache.get("/author/Ada", loader)
+
+    results, cached = asyncio.run(scenario())
+    assert loader.calls == ["/author/Ada"]
+    assert results == [{"author_title": "/author/Ada", "call": 1}] * 3
+    assert cached == results[0]
+
+def test_failed_load_reaches_every_waiter_and_is_not_cached():
+    from author_cache import AuthorCache
+
+    cache = AuthorCache()
+    loader = FakeLoader(error=ConnectionError("down"))
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get("/author/Ada", loader) for _ in range(3)), return_exceptions=True)
+        loader.error = None
+        return results, await cache.get("/author/Ada", loader)
+
+    results, retried = asyncio.run(scenario())
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert retried["call"] == 2
+
+def test_memory_is_an_lru_backed_by_disk(tmp_path):
+    from author_cache import AuthorCache
+
+    path = str(tmp_path / "authors.sqlite")
+    cache = AuthorCache(max_size=2, path=path)
+    loader = FakeLoader(delay=0)
+
+    async def scenario():
+        for key in ("/author/A", "/author/B", "/author/A", "/author/C"):
+            await cache.get(key, loader)
+        memory = list(cache._memory)
+        # "B" ya no está en memoria (la menos usada), pero se lee del disco sin descargarla
+        await cache.get("/author/B", loader)
+        return memory
+
+    memory = asyncio.run(scenario())
+    cache.close()
+    assert memory == ["/author/A", "/author/C"]
+    assert loader.calls == ["/author/A", "/author/B", "/author/C"]
+    assert (cache.misses, cache.hits) == (3, 2)
+
+def test_disk_entries_survive_restarts_until_they_expire(tmp_path):
+    from author_cache import AuthorCache
+
+    path = str(tmp_path / "authors.sqlite")
+    loader = FakeLoader(delay=0)
+
+    async def lookup(ttl):
+        cache = AuthorCache(path=path, ttl=ttl)
+        try:
+            return await cache.get("/author/Ada", loader)
+        finally:
+            cache.close()
+
+    first = asyncio.run(lookup(ttl=60))
+    reused = asyncio.run(lookup(ttl=60))
+    expired = asyncio.run(lookup(ttl=-1))
+    assert first == reused == {"author_title": "/author/Ada", "call": 1}
+    assert expired == {"author_title": "/author/Ada", "call": 2}
+    assert len(loader.calls) == 2
@@ -0,0 +1,110 @@
+"""Pruebas de `BulkWriter` (src/bulk_writer.py) sin base de datos: las sentencias se compilan con el dialecto de PostgreSQL."""
+
+import asyncio
+import re
+from sqlalchemy.dialects import postgresql
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+class FakeSession:
+    """
+    Sesión simulada: compila cada sentencia con el dialecto de PostgreSQL y emula los
+    `INSERT … ON CONFLICT DO NOTHING RETURNING` y `SELECT clave, id … WHERE clave IN (…)` del escritor,
+    con una tabla en memoria (clave natural -> ID) por tabla.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.links = set()
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        if stmt.is_insert:
+            count = 1 + max(int(name.rsplit("_m", 1)[1]) for name in compiled.params)
+            rows = [{name.rsplit("_m", 1)[0]: value for name, value in compiled.params.items()
+                     if name.endswith(f"_m{index}")} for index in range(count)]
+            if stmt.table.name == "quote_tags":
+                self.links.update((row["quote_id"], row["tag_id"]) for row in rows)
+                return FakeResult([])
+            key = stmt._returning[0].key
+            table = self.tables.setdefault(stmt.table.name, {})
+            inserted = []
+            for row in rows:
+                if row[key] not in table:  # ON CONFLICT DO NOTHING: solo devuelve las filas nuevas
+                    table[row[key]] = len(table) + 1
+                    inserted.append((row[key], table[row[key]]))
+            return FakeResult(inserted)
+        column = stmt.selected_columns[0]
+        [values] = compiled.params.values()
+        table = self.tables.get(column.table.name, {})
+        return FakeResult([(value, table[value]) for value in values if value in table])
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+def make_quotes(count, authors=5, prefix="Bulk"):
+    from quote import Quote
+
+    return [Quote(f"{prefix} quote {n}.", f"Bulk Author {'ABCDEFGHIJ'[n % authors]}", "March 14, 1879",
+                  [f"Tag {n % 3}", f"Tag {n % 7}"], f"Place {n % 2}", "Description.") for n in range(count)]
+
+def save(session, quotes, **options):
+    from bulk_writer import BulkWriter
+
+    writer = BulkWriter(**options)
+    saved = asyncio.run(writer.save(session, quotes))
+    return saved, writer.statements
+
+def test_statements_compile_as_multi_row_upserts():
+    session = FakeSession()
+    save(session, make_quotes(20))
+    inserts = [sql for sql in session.statements if sql.startswith("INSERT")]
+    assert [re.match(r"INSERT INTO quotes\.(\w+)", sql).group(1) for sql in inserts] == [
+        "birthdate", "birthplace", "author", "tags", "quotes", "quote_tags"]
+    assert all("ON CONFLICT" in sql and "DO NOTHING" in sql for sql in inserts)
+    assert "ON CONFLICT (content_hash) DO NOTHING RETURNING quotes.quotes.content_hash" in inserts[4]
+    assert "ON CONFLICT (quote_id, tag_id) DO NOTHING" in inserts[5]
+
+def test_statements_per_batch_do_not_depend_on_its_size():
+    small, large = FakeSession(), FakeSession()
+    assert save(small, make_quotes(10))[1] == save(large, make_quotes(400))[1] == 10
+    assert len(large.tables["quotes"]) == 400
+    assert len(large.tables["author"]) == 5
+    assert len(large.tables["tags"]) == 7
+    assert len(large.links) == 400 + sum(1 for n in range(400) if n % 3 != n % 7)
+
+def test_batches_commit_separately():
+    session = FakeSession()
+    saved, statements = save(session, make_quotes(25), batch_size=10)
+    assert saved == 25
+    assert session.commits == 3
+
+def test_repeated_quotes_in_a_batch_are_written_once():
+    session = FakeSession()
+    quotes = make_quotes(10)
+    saved, _ = save(session, quotes + quotes[:4])
+    assert saved == 10
+    assert len(session.tables["quotes"]) == 10
+
+def test_repeating_a_run_creates_no_rows():
+    session = FakeSession()
+    save(session, make_quotes(30))
+    tables = {name: dict(rows) for name, rows in session.tables.items()}
+    links = set(session.links)
+    # Segunda ejecución con las mismas citas (objetos nuevos): los upserts no insertan nada
+    saved, statements = save(session, make_quotes(30))
+    assert saved == 30
+    assert session.tables == tables and session.links == links
+    # Las citas que ya existían se recuperan por su hash
+    assert sum(sql.startswith("SELECT quotes.quotes.content_hash") for sql in session.statements) == 1
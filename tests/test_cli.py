@@ -0,0 +1,82 @@
+"""Pruebas de la línea de comandos (src/main.py) y del arranque sin efectos secundarios al importar."""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_without_a_command_runs_the_crawl():
+    from main import parse_args
+    from src.utils.constants import DB_WRITERS, BULK_BATCH_SIZE
+
+    arguments = parse_args([])
+    assert (arguments.command, arguments.mode, arguments.archive) == ("crawl", None, None)
+    assert (arguments.writers, arguments.batch_size) == (DB_WRITERS, BULK_BATCH_SIZE)
+
+@pytest.mark.parametrize("argv, expected", [
+    (["crawl", "--mode", "copy", "--writers", "4"], {"command": "crawl", "mode": "copy", "writers": 4}),
+    (["load", "/tmp/archive", "--batch-size", "50"], {"command": "load", "archive": "/tmp/archive", "batch_size": 50}),
+    (["search", "life love", "--tag", "Life", "--tag", "love", "--author", "Albert Einstein", "--json"],
+     {"command": "search", "text": "life love", "tag": ["Life", "love"], "author": "Albert Einstein", "json": True}),
+    (["search", "--after", "120"], {"command": "search", "text": None, "tag": [], "after": 120}),
+    (["worker", "--concurrency", "8", "--forever"], {"command": "worker", "concurrency": 8, "forever": True}),
+    (["coordinator", "--pages", "5", "--reset"], {"command": "coordinator", "pages": 5, "reset": True, "wait": False}),
+    (["export", "-", "--format", "csv", "--incremental", "daily"],
+     {"command": "export", "path": "-", "format": "csv", "incremental": "daily"}),
+    (["dead-letters", "--replay"], {"command": "dead-letters", "replay": True, "limit": None}),
+    (["bench", "crawl", "--pages", "10", "--parser", "lxml"],
+     {"command": "bench", "name": "crawl", "arguments": ["--pages", "10", "--parser", "lxml"]}),
+])
+def test_subcommands(argv, expected):
+    from main import parse_args
+
+    arguments = vars(parse_args(argv))
+    assert {key: arguments[key] for key in expected} == expected
+
+@pytest.mark.parametrize("argv", [["crawl", "--mode", "orm"], ["export", "out.txt", "--format", "xml"],
+                                  ["bench", "no-such-benchmark"], ["unknown"]])
+def test_invalid_arguments_exit(argv):
+    from main import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+def test_every_async_subcommand_has_a_handler():
+    from main import COMMANDS, benchmark_names
+
+    assert set(COMMANDS) == {"crawl", "load", "search", "worker", "coordinator", "export", "dead-letters"}
+    assert {"crawl", "search"} <= set(benchmark_names())
+
+# Se ejecuta en un proceso nuevo: importa la configuración, el logger y la línea de comandos y comprueba
+# que no se crea nada (carpetas, handlers) ni se cargan las dependencias pesadas hasta usar el logger.
+IMPORT_CHECK = """
+import json, logging, os, sys
+created = []
+makedirs = os.makedirs
+os.makedirs = lambda path, *args, **kwargs: (created.append(path), makedirs(path, *args, **kwargs))
+sys.path[:0] = [sys.argv[1], os.path.join(sys.argv[1], "src")]
+import src.utils.constants, src.utils.logger, main
+before = {
+    "created": list(created),
+    "handlers": len(logging.getLogger().handlers),
+    "heavy": sorted(name for name in ("sqlalchemy", "aiohttp", "httpx", "pyarrow", "bs4", "lxml") if name in sys.modules),
+}
+src.utils.logger.log_dir = sys.argv[2]
+src.utils.logger.log_file = os.path.join(sys.argv[2], "logs.log")
+src.utils.logger.logger.debug("primer uso")
+print(json.dumps({"before": before, "after": {"created": created, "handlers": len(logging.getLogger().handlers)}}))
+"""
+
+def test_importing_config_and_logger_has_no_side_effects(tmp_path):
+    log_dir = str(tmp_path / "logs")
+    output = subprocess.run([sys.executable, "-c", IMPORT_CHECK, ROOT, log_dir],
+                            capture_output=True, text=True, check=True, cwd=tmp_path).stdout
+    result = json.loads(output)
+    assert result["before"] == {"created": [], "handlers": 0, "heavy": []}
+    # El logging se configura con el primer uso del logger
+    assert result["after"]["created"] == [log_dir]
+    assert result["after"]["handlers"] == 3
+    assert os.path.exists(os.path.join(log_dir, "logs.log"))
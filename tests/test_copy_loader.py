@@ -0,0 +1,67 @@
+"""Pruebas de `CopyLoader` (src/copy_loader.py) con una conexión asyncpg simulada."""
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+
+class FakeConnection:
+    """Conexión asyncpg simulada: guarda las sentencias y los registros de cada COPY."""
+
+    def __init__(self):
+        self.statements = []
+        self.copies = {}
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def _transaction(self):
+        self.transactions += 1
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def execute(self, statement):
+        self.statements.append(" ".join(statement.split()))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies[table] = (columns, list(records))
+
+def make_quotes():
+    from quote import Quote
+
+    return [
+        Quote("Copy quote 1.", "Copy Author", "March 14, 1879", ["Life", "Love"], "Ulm", "First description."),
+        Quote("Copy quote 2.", "Copy Author", None, ["Life"], None, None),
+        Quote("Copy quote 3.", "Other Copy Author", "No birth date found", [], "Paris", "Other."),
+    ]
+
+def test_batch_is_copied_to_staging_and_merged():
+    from datetime import date
+    from copy_loader import CopyLoader
+
+    loader = CopyLoader(schema="bench")
+    connection = FakeConnection()
+    quotes = make_quotes()
+    asyncio.run(loader._load_batch(connection, quotes))
+
+    assert connection.transactions == 1
+    columns, records = connection.copies["stage_quote"]
+    assert columns == ("quote", "content_hash", "author", "tags")
+    assert records == [(q.text, q.content_hash, q.author, list(q.tags)) for q in quotes]
+    # Un registro por autor (con los datos de su primera cita); las fechas no válidas quedan en None
+    columns, records = connection.copies["stage_author"]
+    assert columns == ("name", "birthdate", "birthplace", "description")
+    assert records == [("Copy Author", date(1879, 3, 14), "Ulm", "First description."),
+                       ("Other Copy Author", None, "Paris", "Other.")]
+    assert loader.statements == 2 + 2 + 6
+
+def test_merge_statements_upsert_on_the_natural_keys():
+    from copy_loader import CopyLoader
+
+    statements = [" ".join(statement.split()) for statement in CopyLoader(schema="bench")._merge_statements()]
+    targets = [re.match(r"INSERT INTO bench\.(\w+)", statement).group(1) for statement in statements]
+    # Primero las dimensiones, después las citas y, al final, la relación cita-etiqueta
+    assert targets == ["birthdate", "birthplace", "author", "tags", "quotes", "quote_tags"]
+    conflicts = [re.search(r"ON CONFLICT \(([\w, ]+)\) DO NOTHING$", statement).group(1) for statement in statements]
+    assert conflicts == ["birthdate", "birthplace", "name", "tag", "content_hash", "quote_id, tag_id"]
+    assert all("quotes." not in statement for statement in statements)  # Solo el esquema indicado
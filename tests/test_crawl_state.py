@@ -0,0 +1,102 @@
+"""Pruebas de `CrawlState` (src/crawl_state.py) con un SQLite temporal."""
+
+URL = "http://example.test/page/1"
+HTML = "<html><div class='quote'>First.</div><div class='quote'>Second.</div></html>"
+
+def response(status=200, text=HTML, etag='"v1"'):
+    from http_client import HttpResponse
+
+    return HttpResponse(URL, status, {"ETag": etag} if etag else {}, text, 0.01)
+
+def entries(*texts):
+    return [(text, "Ada Lovelace", ["Math"], "/author/Ada") for text in texts]
+
+def quotes(*texts):
+    from quote import Quote
+
+    return [Quote(text, "Ada Lovelace", "December 10, 1815", ["Math"], "London", "d") for text in texts]
+
+def run_once(path, persist):
+    """Una ejecución: descarga la página, extrae sus dos citas y guarda las indicadas."""
+    from crawl_state import CrawlState
+
+    state = CrawlState(path)
+    try:
+        headers = state.conditional_headers(URL)
+        unchanged = state.is_unchanged(URL, response())
+        if not unchanged:
+            state.fetched(URL, response())
+            state.extracted(URL, entries("First.", "Second."))
+            state.persisted(quotes(*persist))
+            state.commit()
+        return headers, unchanged
+    finally:
+        state.close()
+
+def test_partially_persisted_page_is_not_confirmed(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    run_once(path, persist=["First."])
+    headers, unchanged = run_once(path, persist=[])
+    # La página se vuelve a pedir sin validadores y se analiza otra vez
+    assert headers == {}
+    assert unchanged is False
+
+def test_fully_persisted_page_is_confirmed(tmp_path):
+    path = str(tmp_path / "state.sqlite")
+    run_once(path, persist=["First.", "Second."])
+    headers, unchanged = run_once(path, persist=[])
+    assert headers == {"If-None-Match": '"v1"'}
+    assert unchanged is True
+
+def test_persisting_in_several_batches_confirms_the_page(tmp_path):
+    from crawl_state import CrawlState
+
+    path = str(tmp_path / "state.sqlite")
+    state = CrawlState(path)
+    state.fetched(URL, response())
+    state.extracted(URL, entries("First.", "Second."))
+    state.persisted(quotes("Second."))
+    assert URL not in state._pending
+    state.persisted(quotes("First."))
+    assert URL in state._pending
+    state.commit()
+    state.close()
+    assert run_once(path, persist=[])[1] is True
+
+def test_unchanged_short_circuit_on_matching_hash_or_304(tmp_path):
+    from crawl_state import CrawlState
+
+    path = str(tmp_path / "state.sqlite")
+    run_once(path, persist=["First.", "Second."])
+    state = CrawlState(path)
+    try:
+        # Mismo contenido aunque el servidor no envíe ETag: mismo hash
+        same = state.is_unchanged(URL, response(etag=None))
+        not_modified = state.is_unchanged(URL, response(status=304, text=""))
+        modified = state.is_unchanged(URL, response(text=HTML + "<!-- new -->"))
+    finally:
+        state.close()
+    assert (same, not_modified, modified) == (True, True, False)
+    assert (state.unchanged, state.changed) == (2, 1)
+
+def test_page_without_quotes_is_confirmed_at_once(tmp_path):
+    from crawl_state import CrawlState
+
+    path = str(tmp_path / "state.sqlite")
+    state = CrawlState(path)
+    state.fetched(URL, response())
+    state.extracted(URL, [])
+    state.commit()
+    state.close()
+    assert run_once(path, persist=[])[1] is True
+
+def test_uncommitted_state_is_not_saved(tmp_path):
+    from crawl_state import CrawlState
+
+    path = str(tmp_path / "state.sqlite")
+    state = CrawlState(path)
+    state.fetched(URL, response())
+    state.extracted(URL, entries("First.", "Second."))
+    state.persisted(quotes("First.", "Second."))
+    state.close()  # La ejecución falla antes del commit
+    assert run_once(path, persist=[])[1] is False
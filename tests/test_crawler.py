@@ -0,0 +1,93 @@
+"""Pruebas de `PageCrawler` (src/crawler.py) con una descarga simulada, sin red."""
+
+import asyncio
+import pytest
+
+class FakeSite:
+    """
+    Listado simulado de `pages` páginas con datos. `delays` fija la espera de cada página (para que
+    terminen fuera de orden) y `failures` cuántas veces falla cada una antes de responder.
+    """
+
+    def __init__(self, pages, delays=None, failures=None, next_links=True):
+        self.pages = pages
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.next_links = next_links
+        self.requests = []
+
+    async def fetch(self, url):
+        page = int(url.rstrip("/").rsplit("/", 1)[1])
+        self.requests.append(page)
+        await asyncio.sleep(self.delays.get(page, 0.001))
+        if self.failures.get(page, 0) > 0:
+            self.failures[page] -= 1
+            raise ConnectionError(f"page {page} unavailable")
+        has_data = page <= self.pages
+        return {"page": page, "data": has_data, "next": has_data and self.next_links and page < self.pages}
+
+def crawler(site, **options):
+    from crawler import PageCrawler
+
+    return PageCrawler(site.fetch, lambda tree: tree, lambda tree: tree["data"], lambda tree: tree["next"],
+                       base_url="http://example.test/", **options)
+
+def crawl(page_crawler):
+    async def collect():
+        return [page async for page, tree in page_crawler.crawl()]
+    return asyncio.run(collect())
+
+@pytest.mark.parametrize("discovery", ["speculative", "next"])
+def test_pages_are_delivered_in_order_when_they_complete_out_of_order(discovery):
+    # Las primeras páginas son las más lentas
+    site = FakeSite(8, delays={1: 0.05, 2: 0.04, 3: 0.03, 4: 0.001, 5: 0.02})
+    page_crawler = crawler(site, concurrency=4, discovery=discovery)
+    assert crawl(page_crawler) == list(range(1, 9))
+    assert page_crawler.failed == []
+
+def test_failed_page_is_retried_and_delivered_in_order():
+    site = FakeSite(6, failures={3: 1})
+    page_crawler = crawler(site, concurrency=3, retries=1)
+    assert crawl(page_crawler) == list(range(1, 7))
+    assert page_crawler.failed == []
+    assert site.requests.count(3) == 2
+
+def test_page_is_skipped_after_its_retries():
+    site = FakeSite(6, failures={3: 10})
+    page_crawler = crawler(site, concurrency=3, retries=2)
+    assert crawl(page_crawler) == [1, 2, 4, 5, 6]
+    assert page_crawler.failed == [3]
+    assert site.requests.count(3) == 3  # El intento inicial y dos reintentos
+
+def test_page_is_skipped_without_retries():
+    site = FakeSite(4, failures={2: 1})
+    page_crawler = crawler(site, concurrency=2, retries=0)
+    assert crawl(page_crawler) == [1, 3, 4]
+    assert page_crawler.failed == [2]
+
+def test_consecutive_failures_stop_the_crawl():
+    # El servidor cae a partir de la página 4
+    site = FakeSite(100, failures={page: 10 for page in range(4, 101)})
+    page_crawler = crawler(site, concurrency=1, max_failures=3, retries=1)
+    assert crawl(page_crawler) == [1, 2, 3]
+    assert max(site.requests) < 10
+    assert page_crawler.failed and max(page_crawler.failed) == max(site.requests)
+
+def test_next_discovery_stops_without_a_next_link():
+    site = FakeSite(5)
+    page_crawler = crawler(site, concurrency=4, discovery="next")
+    assert crawl(page_crawler) == [1, 2, 3, 4, 5]
+    # Solo se pide una página cuando la anterior tiene el enlace "next"
+    assert sorted(site.requests) == [1, 2, 3, 4, 5]
+
+def test_speculative_discovery_stops_at_the_first_empty_page():
+    site = FakeSite(5)
+    page_crawler = crawler(site, concurrency=4)
+    assert crawl(page_crawler) == [1, 2, 3, 4, 5]
+    assert 6 in site.requests and max(site.requests) < 6 + 4
+
+def test_next_discovery_requires_has_next():
+    from crawler import PageCrawler
+
+    with pytest.raises(ValueError):
+        PageCrawler(FakeSite(1).fetch, lambda tree: tree, lambda tree: True, discovery="next")
@@ -0,0 +1,152 @@
+"""Pruebas de integración de los savepoints de los escritores y de las dead letters (src/dead_letters.py)."""
+
+import asyncio
+from sqlalchemy import text
+
+def make_quotes(count, bad=(), prefix="Savepoint"):
+    """Citas de dos autores; las de las posiciones `bad` llevan un carácter NUL, que PostgreSQL rechaza."""
+    from quote import Quote
+
+    return [
+        Quote(f"{prefix} quote {n}." + ("\x00" if n in bad else ""), f"{prefix} Author {'AB'[n % 2]}",
+              "March 14, 1879", [f"{prefix.lower()}-{n % 3}"], f"{prefix} Place", "Description.")
+        for n in range(count)
+    ]
+
+async def count(session, table):
+    return (await session.execute(text(f"SELECT count(*) FROM quotes.{table}"))).scalar()
+
+def test_bulk_writer_isolates_failing_quotes(db, run):
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from dimension_cache import DimensionCache
+    from dead_letters import DeadLetterStore
+
+    async def scenario():
+        store = DeadLetterStore()
+        cache = DimensionCache()
+        async with SessionLocal() as session:
+            await cache.warm(session)
+            saved = await BulkWriter(batch_size=10, cache=cache, dead_letters=store).save(
+                session, make_quotes(25, bad={3, 17}))
+            texts = (await session.execute(text("SELECT quote FROM quotes.quotes"))).scalars().all()
+            letters = (await session.execute(text("SELECT payload, error FROM quotes.dead_letters ORDER BY id"))).all()
+        return saved, store.failed, texts, letters
+
+    saved, failed, texts, letters = run(scenario())
+    assert saved == 23
+    assert failed == 2
+    assert sorted(texts) == sorted(f"Savepoint quote {n}." for n in range(25) if n not in (3, 17))
+    assert ['"text": "Savepoint quote 3.\\u0000"' in letters[0].payload,
+            '"text": "Savepoint quote 17.\\u0000"' in letters[1].payload] == [True, True]
+    assert all(letter.error for letter in letters)
+
+def test_orm_mode_isolates_failing_quotes(db, run):
+    from database import SessionLocal
+    from scraper import Scraper
+
+    async def scenario():
+        scraper = Scraper()
+        try:
+            await scraper.save_quotes_to_db(make_quotes(6, bad={2}), mode="orm")
+        finally:
+            await scraper.close()
+        async with SessionLocal() as session:
+            return await count(session, "quotes"), await count(session, "dead_letters")
+
+    assert run(scenario()) == (5, 1)
+
+def test_rolled_back_savepoint_restores_dimension_cache(db, run, monkeypatch):
+    from quote import Quote
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from dimension_cache import DimensionCache
+    from dead_letters import DeadLetterStore
+
+    # La caché no puede depender del evento after_rollback de la sesión para los savepoints
+    monkeypatch.setattr(DimensionCache, "rollback", lambda self: None)
+
+    async def scenario():
+        quotes = [Quote(f"Cache quote {n}.", "Cache Author", "March 14, 1879", ["cache"], "Cache Place", "d")
+                  for n in range(6)]
+        # Una etiqueta de más de 50 caracteres hace fallar la resolución de dimensiones de todo el lote,
+        # después de haber insertado (y obtenido los IDs de) el autor, la fecha y el lugar
+        quotes.insert(3, Quote("Cache bad quote.", "Cache Other", "May 1, 1900", ["x" * 60], "Cache Place", "d"))
+        later = [Quote("Cache later quote.", "Cache Author", "March 14, 1879", ["cache"], "Cache Place", "d")]
+        cache = DimensionCache()
+        store = DeadLetterStore()
+        async with SessionLocal() as session:
+            await cache.warm(session)
+            saved = await BulkWriter(cache=cache, dead_letters=store).save(session, quotes)
+            saved_later = await BulkWriter(cache=cache, dead_letters=store).save(session, later)
+            authors = (await session.execute(text("SELECT name FROM quotes.author ORDER BY name"))).scalars().all()
+        return saved, saved_later, store.failed, authors
+
+    saved, saved_later, failed, authors = run(scenario())
+    assert (saved, saved_later, failed) == (6, 1, 1)
+    # El autor de la cita que falla se deshace con su savepoint; los IDs de la caché siguen siendo válidos
+    assert authors == ["Cache Author"]
+
+def test_replay_saves_fixed_payloads(db, run):
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from dead_letters import DeadLetterStore
+
+    async def scenario():
+        store = DeadLetterStore()
+        async with SessionLocal() as session:
+            await BulkWriter(dead_letters=store).save(session, make_quotes(10, bad={1, 4, 7}))
+            # Corrige el payload de dos de las tres citas
+            await session.execute(text(
+                "UPDATE quotes.dead_letters SET payload = replace(payload, :nul, '') WHERE payload NOT LIKE '%quote 7.%'"),
+                {"nul": "\\u0000"})
+            await session.commit()
+        stats = await DeadLetterStore().replay()
+        async with SessionLocal() as session:
+            left = (await session.execute(text("SELECT payload, error FROM quotes.dead_letters"))).all()
+            return stats, await count(session, "quotes"), left
+
+    stats, quotes, left = run(scenario())
+    assert stats == {"replayed": 3, "saved": 2, "failed": 1}
+    assert quotes == 9
+    assert len(left) == 1 and "quote 7." in left[0].payload and left[0].error
+
+def test_replay_tries_each_failing_row_once(db, run):
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from dead_letters import DeadLetterStore
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await BulkWriter(dead_letters=DeadLetterStore()).save(session, make_quotes(4, bad={0, 1, 2, 3}))
+        # Las citas que vuelven a fallar se vuelven a guardar con un ID nuevo: no se reprocesan otra vez
+        first = await DeadLetterStore(batch_size=1).replay()
+        second = await DeadLetterStore().replay(limit=2)
+        async with SessionLocal() as session:
+            return first, second, await count(session, "dead_letters")
+
+    first, second, left = run(scenario())
+    assert first == {"replayed": 4, "saved": 0, "failed": 4}
+    assert second == {"replayed": 2, "saved": 0, "failed": 2}
+    assert left == 4
+
+def test_concurrent_replays_claim_disjoint_rows(db, run):
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from dead_letters import DeadLetterStore
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await BulkWriter(dead_letters=DeadLetterStore()).save(session, make_quotes(40, bad=set(range(40))))
+            await session.execute(text("UPDATE quotes.dead_letters SET payload = replace(payload, :nul, '')"),
+                                  {"nul": "\\u0000"})
+            await session.commit()
+        # FOR UPDATE SKIP LOCKED: cada ejecución reclama filas distintas, sin esperarse
+        results = await asyncio.gather(*(DeadLetterStore(batch_size=5).replay() for _ in range(3)))
+        async with SessionLocal() as session:
+            return results, await count(session, "quotes"), await count(session, "dead_letters")
+
+    results, quotes, left = run(scenario())
+    assert sum(result["replayed"] for result in results) == 40
+    assert sum(result["saved"] for result in results) == 40
+    assert (quotes, left) == (40, 0)
@@ -0,0 +1,50 @@
+"""Pruebas de `DimensionCache` (src/dimension_cache.py), sin base de datos."""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def test_pending_ids_follow_commit_and_rollback():
+    from dimension_cache import DimensionCache
+
+    cache = DimensionCache()
+    cache.put("tag", "Life", 1)
+    cache.commit()
+    cache.put("tag", "Love", 2)
+    cache.rollback()
+    assert (cache.get("tag", "Life"), cache.get("tag", "Love")) == (1, None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_rollback_to_restores_pending_ids_of_the_savepoint():
+    from dimension_cache import DimensionCache
+
+    cache = DimensionCache()
+    cache.put("author", "Ada Lovelace", 1)
+    snapshot = cache.savepoint()
+    cache.put("author", "Alan Turing", 2)
+    cache.rollback_to(snapshot)
+    assert (cache.get("author", "Ada Lovelace"), cache.get("author", "Alan Turing")) == (1, None)
+
+def test_bind_registers_the_listeners_once():
+    from dimension_cache import DimensionCache
+
+    cache = DimensionCache()
+    session = AsyncSession()
+    cache.bind(session)
+    cache.bind(session)
+    assert len(session.sync_session.dispatch.after_rollback) == 1
+    assert len(session.sync_session.dispatch.after_commit) == 1
+
+def test_every_bound_session_discards_pending_ids_on_rollback():
+    from dimension_cache import DimensionCache
+
+    cache = DimensionCache()
+    # Muchas sesiones de vida corta, como las de los escritores: los IDs de sesiones ya liberadas se
+    # reutilizan, y cada sesión nueva debe recibir sus propios listeners
+    for number in range(200):
+        session = AsyncSession()
+        cache.bind(session)
+        assert event.contains(session.sync_session, "after_rollback", cache._after_rollback)
+        cache.put("tag", f"Tag {number}", number)
+        session.sync_session.dispatch.after_rollback(session.sync_session)
+        assert cache.get("tag", f"Tag {number}") is None
+        del session
@@ -0,0 +1,63 @@
+"""Pruebas de los formatos de exportación (src/exporter.py) sin base de datos."""
+
+import csv
+import json
+import pytest
+
+ROWS = [
+    (1, "“A quote with \"quotes\" and, commas.”", "Albert Einstein", ["Life", "Tag, with comma"]),
+    (2, "Ünïcödé quote.", "Jane Austen", []),
+    (3, "Third quote.", "Albert Einstein", None),
+]
+
+@pytest.mark.parametrize("path, fmt", [
+    ("out.parquet", "parquet"), ("out.PQ", "parquet"), ("dir.v2/out.jsonl", "jsonl"),
+    ("out.json", "jsonl"), ("out.ndjson", "jsonl"), ("out.csv", "csv"),
+])
+def test_detect_format(path, fmt):
+    from exporter import detect_format
+
+    assert detect_format(path) == fmt
+
+@pytest.mark.parametrize("path", ["out.txt", "out", "out.parquet.gz"])
+def test_detect_format_rejects_unknown_extensions(path):
+    from exporter import detect_format
+
+    with pytest.raises(ValueError):
+        detect_format(path)
+
+def export(tmp_path, fmt, batches):
+    from exporter import SINKS
+
+    sink_class, mode = SINKS[fmt]
+    path = tmp_path / f"out.{fmt}"
+    with open(path, mode, **({} if "b" in mode else {"encoding": "utf-8", "newline": ""})) as file:
+        sink = sink_class(file)
+        for batch in batches:
+            sink.write(batch)
+        sink.close()
+    return path
+
+def test_jsonl_sink_round_trip(tmp_path):
+    path = export(tmp_path, "jsonl", [ROWS[:2], ROWS[2:]])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": id_, "citation": citation, "author": author, "tags": list(tags or [])} for id_, citation, author, tags in ROWS]
+
+def test_csv_sink_round_trip(tmp_path):
+    rows = [(id_, citation, author, ",".join(tags or [])) for id_, citation, author, tags in ROWS]
+    path = export(tmp_path, "csv", [rows])
+    with open(path, encoding="utf-8", newline="") as file:
+        assert list(csv.reader(file)) == [["id", "citation", "author", "tags"]] + [[str(v) for v in row] for row in rows]
+
+def test_parquet_sink_round_trip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    path = export(tmp_path, "parquet", [ROWS[:2], ROWS[2:]])
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2  # Un grupo de filas por lote
+    table = parquet.read()
+    assert table.column_names == ["id", "citation", "author", "tags"]
+    assert str(table.schema.field("author").type) == "dictionary<values=string, indices=int32, ordered=0>"
+    assert table.to_pylist() == [
+        {"id": id_, "citation": citation, "author": author, "tags": tags} for id_, citation, author, tags in ROWS]
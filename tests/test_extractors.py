@@ -0,0 +1,125 @@
+"""Pruebas de paridad de los motores de análisis HTML (src/extractors.py)."""
+
+import pytest
+
+# Página del listado con la estructura de quotes.toscrape.com: entidades, etiquetas con espacios y en
+# minúsculas, una cita sin etiquetas y el enlace "next"
+LISTING = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="UTF-8"><title>Quotes to Scrape</title></head>
+<body><div class="container">
+  <div class="row header-box">
+    <div class="col-md-8"><h1><a href="/" style="text-decoration: none">Quotes to Scrape</a></h1></div>
+  </div>
+  <div class="row"><div class="col-md-8">
+    <div class="quote" itemscope itemtype="http://schema.org/CreativeWork">
+      <span class="text" itemprop="text">“The world as we have created it is a process of our thinking.”</span>
+      <span>by <small class="author" itemprop="author">Albert Einstein</small>
+      <a href="/author/Albert-Einstein">(about)</a></span>
+      <div class="tags">Tags:
+        <a class="tag" href="/tag/change/page/1/">change</a>
+        <a class="tag" href="/tag/deep-thoughts/page/1/"> deep-thoughts </a>
+      </div>
+    </div>
+    <div class="quote" itemscope itemtype="http://schema.org/CreativeWork">
+      <span class="text" itemprop="text">  “Love &amp; laughter &lt;always&gt;.”  </span>
+      <span>by <small class="author" itemprop="author"> Jane Austen </small>
+      <a href="/author/Jane-Austen">(about)</a></span>
+      <div class="tags">Tags:
+        <a class="tag" href="/tag/LOVE/page/1/">LOVE</a>
+      </div>
+    </div>
+    <div class="quote" itemscope itemtype="http://schema.org/CreativeWork">
+      <span class="text" itemprop="text">“A quote without tags.”</span>
+      <span>by <small class="author" itemprop="author">Steve Martin</small>
+      <a href="/author/Steve-Martin">(about)</a></span>
+      <div class="tags">Tags:</div>
+    </div>
+    <nav><ul class="pager"><li class="next"><a href="/page/2/">Next <span aria-hidden="true">&rarr;</span></a></li></ul></nav>
+  </div></div>
+</div></body></html>"""
+
+# Última página: sin enlace "next"
+LAST_PAGE = LISTING.replace('<li class="next"><a href="/page/2/">Next <span aria-hidden="true">&rarr;</span></a></li>', "")
+
+# Página posterior al final del listado
+EMPTY_PAGE = """<html><body><div class="container"><div class="row"><div class="col-md-8">
+No quotes found!
+</div></div></div></body></html>"""
+
+AUTHOR = """<html><body><div class="container"><div class="author-details">
+  <h3 class="author-title">Albert Einstein
+  </h3>
+  <p><strong>Born:</strong> <span class="author-born-date">March 14, 1879</span>
+  <span class="author-born-location">in Ulm, Germany</span></p>
+  <div class="author-description">
+    In 1879, Albert Einstein was born in Ulm &amp; later moved to Munich.
+  </div>
+</div></div></body></html>"""
+
+# Página "about" a la que le faltan la fecha y la descripción
+PARTIAL_AUTHOR = """<html><body><div class="author-details">
+  <h3 class="author-title">Steve Martin</h3>
+  <span class="author-born-location">in Waco, Texas, The United States</span>
+</div></body></html>"""
+
+def backends():
+    from extractors import EXTRACTORS
+
+    return list(EXTRACTORS)
+
+def extract(name, html):
+    from extractors import get_extractor
+
+    extractor = get_extractor(name)
+    doc = extractor.parse(html)
+    try:
+        return {
+            "quotes": extractor.quotes(doc),
+            "has_data": extractor.has_data(doc),
+            "has_next": extractor.has_next(doc),
+            "header": extractor.header(doc),
+        }
+    finally:
+        extractor.release(doc)
+
+@pytest.mark.parametrize("html", [LISTING, LAST_PAGE, EMPTY_PAGE], ids=["listing", "last", "empty"])
+@pytest.mark.parametrize("name", backends())
+def test_backends_agree_on_listing_pages(name, html):
+    assert extract(name, html) == extract("bs4", html)
+
+@pytest.mark.parametrize("html", [AUTHOR, PARTIAL_AUTHOR], ids=["author", "partial"])
+@pytest.mark.parametrize("name", backends())
+def test_backends_agree_on_author_pages(name, html):
+    from extractors import get_extractor
+
+    assert get_extractor(name).author_details(html) == get_extractor("bs4").author_details(html)
+
+def test_reference_output():
+    from extractors import NO_AUTHOR_DETAILS, get_extractor
+
+    listing = extract("bs4", LISTING)
+    assert listing == {
+        "quotes": [
+            ("“The world as we have created it is a process of our thinking.”", "Albert Einstein",
+             ["Change", "Deep-thoughts"], "/author/Albert-Einstein"),
+            ("“Love & laughter <always>.”", "Jane Austen", ["Love"], "/author/Jane-Austen"),
+            ("“A quote without tags.”", "Steve Martin", [], "/author/Steve-Martin"),
+        ],
+        "has_data": True,
+        "has_next": True,
+        "header": "Quotes to Scrape",
+    }
+    assert extract("bs4", LAST_PAGE)["has_next"] is False
+    assert extract("bs4", EMPTY_PAGE)["has_data"] is False
+    author = get_extractor("bs4").author_details(AUTHOR)
+    assert author["author_birthdate"] == "March 14, 1879"
+    assert author["author_description"] == "In 1879, Albert Einstein was born in Ulm & later moved to Munich."
+    partial = get_extractor("bs4").author_details(PARTIAL_AUTHOR)
+    assert partial["author_birthdate"] == NO_AUTHOR_DETAILS["author_birthdate"]
+    assert partial["author_description"] == NO_AUTHOR_DETAILS["author_description"]
+
+def test_unknown_backend():
+    from extractors import get_extractor
+
+    with pytest.raises(ValueError):
+        get_extractor("regex")
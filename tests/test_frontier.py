@@ -0,0 +1,73 @@
+"""Pruebas de `CrawlFrontier` (src/frontier.py) con un SQLite temporal."""
+
+def entry(text):
+    return (text, "Ada Lovelace", ["Math"], "/author/Ada")
+
+def quote(text):
+    from quote import Quote
+
+    return Quote(text, "Ada Lovelace", "December 10, 1815", ["Math"], "London", "d")
+
+def die(frontier):
+    """Simula la muerte del proceso: cierra el fichero sin el último checkpoint."""
+    frontier._db.close()
+
+def test_interrupted_crawl_resumes_with_unsaved_entries_only(tmp_path):
+    from frontier import CrawlFrontier
+
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier(path, interval=0)  # Un checkpoint en cada cambio
+    assert frontier.resumed is False
+    for page in (1, 2, 3):
+        frontier.start(f"/page/{page}")
+    frontier.complete("/page/1", [entry("Saved."), entry("Dropped.")])
+    frontier.complete("/page/2", [entry("Unsaved."), entry("Also unsaved.")])
+    frontier.persisted([quote("Saved.")])
+    frontier.dropped([entry("Dropped.")])  # No se pudo construir la cita
+    die(frontier)
+
+    frontier = CrawlFrontier(path, interval=0)
+    try:
+        assert frontier.resumed is True
+        assert frontier.pending_entries() == [entry("Unsaved."), entry("Also unsaved.")]
+        assert [frontier.is_done(f"/page/{page}") for page in (1, 2, 3)] == [True, True, False]
+        # La página que estaba en vuelo vuelve a estar pendiente
+        status = frontier._db.execute("SELECT status FROM frontier WHERE url = '/page/3'").fetchone()[0]
+        assert status == "pending"
+    finally:
+        frontier.close()
+
+def test_changes_after_the_last_checkpoint_are_lost(tmp_path):
+    from frontier import CrawlFrontier
+
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier(path, interval=3600)
+    frontier.complete("/page/1", [entry("First.")])
+    frontier.commit()
+    frontier.complete("/page/2", [entry("Second.")])
+    die(frontier)
+
+    frontier = CrawlFrontier(path)
+    try:
+        assert (frontier.is_done("/page/1"), frontier.is_done("/page/2")) == (True, False)
+        assert frontier.pending_entries() == [entry("First.")]
+    finally:
+        frontier.close()
+
+def test_finish_empties_the_frontier(tmp_path):
+    from frontier import CrawlFrontier
+
+    path = str(tmp_path / "frontier.sqlite")
+    frontier = CrawlFrontier(path)
+    frontier.start("/page/1")
+    frontier.complete("/page/1", [entry("First.")])
+    frontier.finish()
+    frontier.close()
+
+    frontier = CrawlFrontier(path)
+    try:
+        assert frontier.resumed is False
+        assert frontier.pending_entries() == []
+        assert frontier.checkpointed() == 0
+    finally:
+        frontier.close()
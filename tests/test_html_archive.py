@@ -0,0 +1,106 @@
+"""Pruebas de `HtmlArchive` y `ReplayClient` (src/html_archive.py) en un directorio temporal."""
+
+import asyncio
+import os
+import pytest
+
+def page(number):
+    return f"<html><body>Página {number} — {'x' * 200}</body></html>"
+
+def write(path, urls, segment_size=1024):
+    from html_archive import HtmlArchive
+
+    archive = HtmlArchive(path, segment_size=segment_size)
+    for number, url in urls:
+        archive.append(url, 200, page(number))
+    archive.close()
+
+def test_round_trip_across_segments_and_runs(tmp_path):
+    from html_archive import HtmlArchive
+
+    path = str(tmp_path / "archive")
+    write(path, [(n, f"http://example.test/page/{n}/") for n in range(1, 21)])
+    # Una segunda ejecución empieza un segmento nuevo; la última versión de una URL es la que vale
+    write(path, [(99, "http://example.test/page/1/")])
+
+    archive = HtmlArchive(path, readonly=True)
+    try:
+        assert len(archive) == 20
+        assert archive.get("http://example.test/page/1/") == (200, page(99))
+        assert archive.get("http://example.test/page/20/") == (200, page(20))
+        assert archive.get("http://example.test/page/21/") is None
+        assert "http://example.test/page/5/" in archive
+    finally:
+        archive.close()
+    assert len([name for name in os.listdir(path) if name.endswith(".zst")]) > 2
+
+def test_records_are_readable_before_the_segment_is_closed(tmp_path):
+    from html_archive import HtmlArchive
+
+    archive = HtmlArchive(str(tmp_path / "archive"))
+    try:
+        archive.append("http://example.test/page/1/", 200, page(1))
+        assert archive.get("http://example.test/page/1/") == (200, page(1))
+        archive.append("http://example.test/page/2/", 200, page(2))
+        assert archive.get("http://example.test/page/2/") == (200, page(2))
+    finally:
+        archive.close()
+
+def test_truncated_segment_and_index_are_ignored(tmp_path):
+    from html_archive import HtmlArchive, _INDEX_ENTRY
+
+    path = str(tmp_path / "archive")
+    urls = [(n, f"http://example.test/page/{n}/") for n in range(1, 4)]
+    write(path, urls, segment_size=1 << 20)
+    # Caída a mitad de escritura: el segmento pierde el final del último registro y el índice queda con
+    # una entrada incompleta
+    segment = os.path.join(path, "segment-000001.zst")
+    with open(segment, "r+b") as f:
+        f.truncate(os.path.getsize(segment) - 10)
+    index = os.path.join(path, "index.bin")
+    with open(index, "ab") as f:
+        f.write(b"\x00" * 7)
+
+    archive = HtmlArchive(path)
+    try:
+        assert len(archive) == 2
+        assert archive.get("http://example.test/page/1/") == (200, page(1))
+        assert archive.get("http://example.test/page/3/") is None
+        # El índice se recorta a entradas completas y el archivo sigue admitiendo escrituras
+        assert os.path.getsize(index) % _INDEX_ENTRY.size == 0
+        archive.append("http://example.test/page/3/", 200, page(3))
+    finally:
+        archive.close()
+
+    archive = HtmlArchive(path, readonly=True)
+    try:
+        assert archive.get("http://example.test/page/3/") == (200, page(3))
+        with pytest.raises(ValueError):
+            archive.append("http://example.test/page/4/", 200, page(4))
+    finally:
+        archive.close()
+
+def test_replay_client_serves_the_archive_and_404_for_unknown_urls(tmp_path):
+    from html_archive import HtmlArchive, ReplayClient
+
+    path = str(tmp_path / "archive")
+    write(path, [(1, "http://example.test/page/1/")])
+    archive = HtmlArchive(path, readonly=True)
+    client = ReplayClient(archive)
+
+    async def scenario():
+        return await client.get("http://example.test/page/1/"), await client.get("http://example.test/page/2/")
+
+    try:
+        found, missing = asyncio.run(scenario())
+    finally:
+        archive.close()
+    assert (found.status, found.text) == (200, page(1))
+    assert (missing.status, missing.text) == (404, "")
+    assert client.counters == {"requests": 2, "missing": 1}
+
+def test_missing_archive_in_readonly_mode(tmp_path):
+    from html_archive import HtmlArchive
+
+    with pytest.raises(FileNotFoundError):
+        HtmlArchive(str(tmp_path / "missing"), readonly=True)
@@ -0,0 +1,42 @@
+"""Pruebas de `HttpClient` (src/http_client.py) contra un servidor aiohttp local."""
+
+import asyncio
+from aiohttp import web
+
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+def request_count():
+    from src.utils.metrics import metrics
+
+    return metrics.summary()["histograms"].get("http_request_seconds", {}).get("count", 0)
+
+def test_requests_are_recorded_in_the_metrics_without_growing_the_client():
+    from http_client import HttpClient
+
+    async def handler(request):
+        return web.Response(text=f"<html>{request.path}</html>", content_type="text/html")
+
+    async def scenario():
+        runner, url = await serve(handler)
+        client = HttpClient()
+        try:
+            before = request_count()
+            responses = await asyncio.gather(*(client.get(f"{url}page/{n}/") for n in range(20)))
+            return before, request_count(), responses, client
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    before, after, responses, client = asyncio.run(scenario())
+    assert after - before == 20
+    assert [response.text for response in responses] == [f"<html>/page/{n}/</html>" for n in range(20)]
+    assert client.counters["requests"] == 20
+    assert not hasattr(client, "latencies")
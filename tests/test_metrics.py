@@ -0,0 +1,53 @@
+"""Pruebas del registro de telemetría (src/utils/metrics.py)."""
+
+def registry():
+    from src.utils.metrics import Metrics
+
+    return Metrics(prefix="test", buckets=(0.01, 0.1, 1))
+
+def test_render_prometheus_text():
+    metrics = registry()
+    metrics.inc("requests_total", status=200)
+    metrics.inc("requests_total", 2, status=200)
+    metrics.inc("requests_total", status=404)
+    metrics.inc("errors_total", error='Bad "quote"\n')
+    for value in (0.005, 0.05, 0.05, 5):
+        metrics.observe("stage_seconds", value, stage="parse")
+    assert metrics.render() == "\n".join([
+        "# TYPE test_errors_total counter",
+        'test_errors_total{error="Bad \\"quote\\"\\n"} 1',
+        "# TYPE test_requests_total counter",
+        'test_requests_total{status="200"} 3',
+        'test_requests_total{status="404"} 1',
+        "# TYPE test_stage_seconds histogram",
+        'test_stage_seconds_bucket{stage="parse",le="0.01"} 1',
+        'test_stage_seconds_bucket{stage="parse",le="0.1"} 3',
+        'test_stage_seconds_bucket{stage="parse",le="1"} 3',
+        'test_stage_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'test_stage_seconds_sum{stage="parse"} 5.105000',
+        'test_stage_seconds_count{stage="parse"} 4',
+    ]) + "\n"
+
+def test_histogram_buckets_and_quantiles():
+    from src.utils.metrics import Histogram
+
+    histogram = Histogram((0.01, 0.1, 1))
+    for value in (0.01, 0.02, 0.05, 0.5, 3):
+        histogram.observe(value)
+    # Los límites de las cubetas son inclusivos (le = "menor o igual")
+    assert histogram.counts == [1, 2, 1, 1]
+    assert (histogram.count, histogram.max) == (5, 3)
+    assert abs(histogram.quantile(0.5) - 0.0775) < 1e-9
+    assert histogram.quantile(1) == 3
+    assert Histogram((1,)).quantile(0.5) is None
+
+def test_summary_and_timer():
+    metrics = registry()
+    with metrics.timer("step_seconds", step="save"):
+        pass
+    metrics.inc("quotes_total", 10)
+    summary = metrics.summary()
+    assert summary["counters"] == {"quotes_total": 10}
+    assert summary["histograms"]["step_seconds{step=save}"]["count"] == 1
+    metrics.reset()
+    assert metrics.render() == "\n"
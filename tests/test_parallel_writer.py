@@ -0,0 +1,86 @@
+"""Pruebas de `ParallelWriter` (src/parallel_writer.py) con sesiones simuladas, sin base de datos."""
+
+import asyncio
+import zlib
+import pytest
+from test_bulk_writer import FakeSession, make_quotes
+
+class SessionFactory:
+    """Fábrica de sesiones simuladas: anota las citas que escribe cada sesión, en el orden en que se abren."""
+
+    def __init__(self, fail_on=None):
+        self.sessions = []
+        self.fail_on = fail_on
+
+    def __call__(self):
+        factory = self
+
+        class Context:
+            async def __aenter__(self):
+                session = FakeSession()
+                if factory.fail_on is not None and len(factory.sessions) == factory.fail_on:
+                    async def execute(stmt):
+                        raise RuntimeError("conexión perdida")
+                    session.execute = execute
+                factory.sessions.append(session)
+                return session
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Context()
+
+async def iterate(items):
+    for item in items:
+        yield item
+
+def authors_by_session(factory):
+    return [set(session.tables.get("author", {})) for session in factory.sessions]
+
+def test_partition_is_the_crc32_of_the_author():
+    from parallel_writer import ParallelWriter
+
+    writer = ParallelWriter(writers=3)
+    quotes = make_quotes(40, authors=7)
+    assert [writer.partition(q) for q in quotes] == [zlib.crc32(q.author.encode("utf-8")) % 3 for q in quotes]
+    # El mismo autor siempre va a la misma partición, y los autores se reparten entre todas
+    by_author = {}
+    for quote in quotes:
+        by_author.setdefault(quote.author, set()).add(writer.partition(quote))
+    assert all(len(partitions) == 1 for partitions in by_author.values())
+    assert set().union(*by_author.values()) == {0, 1, 2}
+
+def test_defaults_and_bounds():
+    from parallel_writer import ParallelWriter
+    from src.utils.constants import DB_WRITERS, BULK_BATCH_SIZE
+
+    writer = ParallelWriter()
+    assert (writer.writers, writer.batch_size, writer.queue_size) == (DB_WRITERS, BULK_BATCH_SIZE, BULK_BATCH_SIZE)
+    assert ParallelWriter(writers=0, batch_size=0).writers == 1
+    assert all(ParallelWriter(writers=1).partition(q) == 0 for q in make_quotes(10))
+
+def test_each_author_is_written_by_one_session():
+    from parallel_writer import ParallelWriter
+
+    factory = SessionFactory()
+    writer = ParallelWriter(writers=3, batch_size=8, session_factory=factory)
+    quotes = make_quotes(60, authors=7)
+    batches = []
+    on_saved = lambda batch, written: batches.append((len(batch), written))
+    saved = asyncio.run(writer.consume(iterate(quotes), on_saved=on_saved))
+    assert saved == sum(writer.stats) == 60
+    assert sum(written for _, written in batches) == 60 and all(size <= 8 for size, _ in batches)
+    assert len(factory.sessions) == 3
+    written_authors = authors_by_session(factory)
+    # Ningún autor aparece en dos sesiones y cada sesión escribe solo los de su partición
+    assert sum(len(authors) for authors in written_authors) == 7
+    for index, session in enumerate(factory.sessions):
+        expected = {q.content_hash for q in quotes if writer.partition(q) == index}
+        assert set(session.tables.get("quotes", {})) == expected
+
+def test_failed_partition_raises_its_error():
+    from parallel_writer import ParallelWriter
+
+    writer = ParallelWriter(writers=2, batch_size=5, session_factory=SessionFactory(fail_on=1))
+    with pytest.raises(RuntimeError, match="conexión perdida"):
+        asyncio.run(writer.save(None, make_quotes(30, authors=6)))
@@ -0,0 +1,78 @@
+"""Pruebas de `ParsePool` (src/parse_pool.py): análisis en el propio proceso, en procesos trabajadores y por lotes."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+def listing(page, last=3):
+    """Página del listado con dos citas y enlace "Next" salvo en la última."""
+    quotes = "".join(
+        f'<div class="quote"><span class="text">“Pool quote {page}-{n}.”</span>'
+        f'<span>by <small class="author">Pool Author {n}</small> <a href="/author/Pool-Author-{n}">(about)</a></span>'
+        f'<div class="tags"><a class="tag">tag{n}</a></div></div>' for n in range(2))
+    pager = '<li class="next"><a href="/page/{}/">Next</a></li>'.format(page + 1) if page < last else ""
+    return f'<html><body><div class="col-md-4"><h1><a href="/">Quotes</a></h1></div>{quotes}<ul class="pager">{pager}</ul></body></html>'
+
+AUTHOR = ('<html><body><div class="author-details"><h3 class="author-title">Pool Author 0</h3><span class="author-born-date">March 14, 1879</span>'
+          '<span class="author-born-location">in Ulm, Germany</span><div class="author-description">Physicist.</div></div></body></html>')
+
+class RecordingExecutor(ThreadPoolExecutor):
+    """Ejecutor en hilos que anota cuántas tareas lleva cada lote enviado."""
+
+    def __init__(self, parser):
+        from parse_pool import _init_worker
+
+        super().__init__(max_workers=1, initializer=_init_worker, initargs=(parser,))
+        self.batches = []
+
+    def submit(self, fn, tasks, *args, **kwargs):
+        self.batches.append([kind for kind, _ in tasks])
+        return super().submit(fn, tasks, *args, **kwargs)
+
+def parse_all(pool, pages):
+    async def scenario():
+        try:
+            return await asyncio.gather(*(pool.page(html) for html in pages), pool.author(AUTHOR))
+        finally:
+            pool.close()
+
+    return asyncio.run(scenario())
+
+def test_worker_processes_match_inline_parsing():
+    from extractors import get_extractor
+    from parse_pool import ParsePool, PageRecord
+
+    pages = [listing(page) for page in (1, 2, 3)]
+    inline = parse_all(ParsePool(get_extractor("lxml"), workers=0), pages)
+    pooled = parse_all(ParsePool(get_extractor("lxml"), workers=1, batch_size=2, batch_delay=0.01), pages)
+    assert pooled == inline
+    assert all(isinstance(record, PageRecord) for record in pooled[:3])
+    assert [record.has_next for record in pooled[:3]] == [True, True, False]
+    assert len(pooled[0].entries) == 2
+    assert pooled[3]["author_title"] == "Pool Author 0"
+
+def test_pages_are_sent_in_batches():
+    from extractors import get_extractor
+    from parse_pool import ParsePool
+
+    pool = ParsePool(get_extractor("lxml"), workers=1, batch_size=4, batch_delay=0.05)
+    pool._executor = executor = RecordingExecutor("lxml")
+    records = parse_all(pool, [listing(page, last=10) for page in range(1, 10)])
+    # Dos lotes llenos al llegar a `batch_size` y el resto (4 páginas + "about") al vencer `batch_delay`
+    assert executor.batches == [["page"] * 4, ["page"] * 4, ["page", "author"]]
+    assert [record.entries[0][0] for record in records[:9]] == [f"“Pool quote {page}-0.”" for page in range(1, 10)]
+
+def test_batch_error_reaches_every_page():
+    from extractors import get_extractor
+    from parse_pool import ParsePool
+
+    pool = ParsePool(get_extractor("lxml"), workers=1, batch_size=2, batch_delay=0.05)
+    pool._executor = RecordingExecutor("no-such-parser")  # El trabajador no llega a crear su motor de análisis
+
+    async def scenario():
+        try:
+            return await asyncio.gather(pool.page(listing(1)), pool.page(listing(2)), return_exceptions=True)
+        finally:
+            pool.close()
+
+    results = asyncio.run(scenario())
+    assert len(results) == 2 and all(isinstance(result, Exception) for result in results)
@@ -0,0 +1,130 @@
+"""Pruebas de `Quote` (src/quote.py) sin base de datos."""
+
+import asyncio
+import hashlib
+import re
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalar_one(self):
+        assert self.value is not None
+        return self.value
+
+class SaveSession:
+    """
+    Sesión simulada para `Quote.save`: compila cada sentencia con el dialecto de PostgreSQL y emula
+    `INSERT … ON CONFLICT (clave) DO NOTHING RETURNING id` y la consulta del ID por la clave.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.links = set()
+        self.commits = 0
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        if stmt.is_insert:
+            if stmt.table.name == "quote_tags":
+                values = compiled.params
+                count = len(values) // 2
+                self.links.update((values[f"quote_id_m{n}"], values[f"tag_id_m{n}"]) for n in range(count))
+                assert "ON CONFLICT (quote_id, tag_id) DO NOTHING" in str(compiled)
+                return FakeResult(None)
+            key = re.search(r"ON CONFLICT \((\w+)\) DO NOTHING", str(compiled)).group(1)
+            table = self.tables.setdefault(stmt.table.name, {})
+            if compiled.params[key] in table:
+                return FakeResult(None)
+            table[compiled.params[key]] = len(table) + 1
+            return FakeResult(table[compiled.params[key]])
+        [value] = compiled.params.values()
+        return FakeResult(self.tables[stmt.selected_columns[0].table.name].get(value))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        raise AssertionError("rollback inesperado")
+
+def test_content_hash_is_the_sha256_of_the_text():
+    from quote import Quote
+
+    quote = Quote("Hash quote.", "Hash Author", None, ["Life"], None, None)
+    same_text = Quote("Hash quote.", "Other Hash Author", None, ["Love"], None, None)
+    assert quote.content_hash == hashlib.sha256("Hash quote.".encode("utf-8")).hexdigest()
+    assert same_text.content_hash == quote.content_hash
+    assert Quote("Hash quote!", "Hash Author", None, [], None, None).content_hash != quote.content_hash
+
+def test_saving_a_quote_again_creates_no_rows():
+    from quote import Quote
+
+    session = SaveSession()
+    quote = Quote("Idempotent quote.", "Idempotent Author", "March 14, 1879", ["Life", "Love", "Life"], "Ulm", "d")
+
+    async def scenario():
+        await quote.save(session)
+        first = ({name: dict(rows) for name, rows in session.tables.items()}, set(session.links))
+        await quote.save(session)
+        # La misma cita (mismo texto) extraída otra vez, p. ej. al repetir el crawl
+        await Quote("Idempotent quote.", "Idempotent Author", None, ["Life"], None, None).save(session)
+        return first
+
+    tables, links = asyncio.run(scenario())
+    assert session.tables == tables
+    assert session.links == links == {(1, 1), (1, 2)}
+    assert {name: len(rows) for name, rows in tables.items()} == {
+        "birthdate": 1, "birthplace": 1, "author": 1, "quotes": 1, "tags": 2}
+    assert session.commits == 3
+
+def test_natural_keys_are_unique_in_the_schema():
+    from models import Quote as DBQuote, QuoteTag, Author, Tag
+
+    dialect = postgresql.dialect()
+    assert re.search(r"content_hash VARCHAR\(64\) NOT NULL", str(CreateTable(DBQuote.__table__).compile(dialect=dialect)))
+    assert "UNIQUE (content_hash)" in str(CreateTable(DBQuote.__table__).compile(dialect=dialect))
+    assert "UNIQUE (quote_id, tag_id)" in str(CreateTable(QuoteTag.__table__).compile(dialect=dialect))
+    assert "UNIQUE (name)" in str(CreateTable(Author.__table__).compile(dialect=dialect))
+    assert "UNIQUE (tag)" in str(CreateTable(Tag.__table__).compile(dialect=dialect))
+
+def test_convert_birthdate_returns_none_on_bad_input():
+    from datetime import date
+    from quote import Quote
+
+    assert Quote.convert_birthdate("March 14, 1879") == date(1879, 3, 14)
+    assert Quote.convert_birthdate(None) is None
+    assert Quote.convert_birthdate("No birth date found") is None
+    assert Quote.convert_birthdate("1879-03-14") is None
+    # Sin fecha válida la cita se crea igualmente
+    assert Quote("Dateless quote.", "Dateless Author", "Sometime", [], None, None).birthdate is None
+
+def test_quotes_of_an_author_share_one_record():
+    import gc
+    from datetime import date
+    from quote import Quote, AuthorRecord
+
+    first = Quote("Shared quote 1.", "Shared Author", None, ["Life"], None, None)
+    # Los datos que faltaban se completan; los que ya había se conservan (los de la primera cita)
+    second = Quote("Shared quote 2.", "shared author!", "March 14, 1879", ["Life"], "Ulm", "First.")
+    third = Quote("Shared quote 3.", "Shared Author", "May 1, 1900", [], "Paris", "Second.")
+    assert first.author_record is second.author_record is third.author_record
+    assert (first.author, first.birthdate, first.birthplace, first.description) == (
+        "Shared Author", date(1879, 3, 14), "Ulm", "First.")
+    # El registro se libera cuando ninguna cita lo referencia
+    del first, second, third
+    gc.collect()
+    assert "Shared Author" not in AuthorRecord._registry
+
+def test_quotes_use_slots_and_interned_tags():
+    from quote import Quote
+
+    first = Quote("Slots quote 1.", "Slots Author", None, ["Life", "Love"], None, None)
+    second = Quote("Slots quote 2.", "Slots Author", None, ["".join(["Li", "fe"])], None, None)
+    assert not hasattr(first, "__dict__") and not hasattr(first.author_record, "__dict__")
+    assert first.tags == ("Life", "Love")
+    assert second.tags[0] is first.tags[0]
@@ -0,0 +1,183 @@
+"""Pruebas de integración de `quote_details` y los triggers que la mantienen (initdb/init.sql)."""
+
+from sqlalchemy import text
+
+# Filas de quote_details que no coinciden con el join calculado en vivo (en cualquiera de los dos sentidos)
+STALE_ROWS = text("""
+    WITH live AS (
+        SELECT q.id, q.quote, a.name,
+               STRING_AGG(t.tag, ', ' ORDER BY qt.id) AS tags,
+               ARRAY_AGG(t.tag ORDER BY qt.id) FILTER (WHERE t.tag IS NOT NULL) AS tag_list
+        FROM quotes.quotes q
+        JOIN quotes.author a ON q.author_id = a.id
+        LEFT JOIN quotes.quote_tags qt ON q.id = qt.quote_id
+        LEFT JOIN quotes.tags t ON qt.tag_id = t.id
+        GROUP BY q.id, q.quote, a.name
+    ), stored AS (
+        SELECT quote_id, citation, author, tags, tag_list FROM quotes.quote_details
+    )
+    SELECT count(*) FROM ((SELECT * FROM live EXCEPT SELECT * FROM stored)
+                          UNION ALL (SELECT * FROM stored EXCEPT SELECT * FROM live)) diff
+""")
+
+def make_quotes():
+    from quote import Quote
+
+    return [
+        Quote("First details quote.", "Ada Lovelace", "December 10, 1815", ["math", "poetry"], "London", "Analyst."),
+        Quote("Second details quote.", "Ada Lovelace", "December 10, 1815", ["math"], "London", "Analyst."),
+        Quote("Third details quote.", "Alan Turing", "June 23, 1912", ["computing", "math"], "London", "Logician."),
+        Quote("Quote without tags.", "Alan Turing", "June 23, 1912", [], "London", "Logician."),
+    ]
+
+async def load(session):
+    from bulk_writer import BulkWriter
+
+    await BulkWriter().save(session, make_quotes())
+
+async def details(session):
+    result = await session.execute(text(
+        "SELECT citation, author, tags, tag_list FROM quotes.quote_details ORDER BY quote_id"))
+    return [tuple(row) for row in result.all()]
+
+async def stale(session):
+    return (await session.execute(STALE_ROWS)).scalar()
+
+def test_bulk_load_fills_details(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            return await details(session), await stale(session)
+
+    rows, stale_rows = run(scenario())
+    assert stale_rows == 0
+    assert rows == [
+        ("First details quote.", "Ada Lovelace", "math, poetry", ["math", "poetry"]),
+        ("Second details quote.", "Ada Lovelace", "math", ["math"]),
+        ("Third details quote.", "Alan Turing", "computing, math", ["computing", "math"]),
+        ("Quote without tags.", "Alan Turing", None, None),
+    ]
+
+def test_author_rename_refreshes_its_quotes(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            await session.execute(text("UPDATE quotes.author SET name = 'Augusta Ada King' WHERE name = 'Ada Lovelace'"))
+            await session.commit()
+            authors = (await session.execute(text(
+                "SELECT DISTINCT author FROM quotes.quote_details ORDER BY author"))).scalars().all()
+            return authors, await stale(session)
+
+    authors, stale_rows = run(scenario())
+    assert authors == ["Alan Turing", "Augusta Ada King"]
+    assert stale_rows == 0
+
+def test_author_upsert_without_rename_does_not_rewrite_details(db, run):
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            before = (await session.execute(text("SELECT quote_id, txid FROM quotes.quote_details"))).all()
+            # Lo que hace un trabajador del crawl distribuido al guardar los datos de un autor ya creado
+            await BulkWriter().save_authors(session, [
+                {"name": "Ada Lovelace", "birthdate": None, "birthplace": "London", "description": "Updated."}])
+            after = (await session.execute(text("SELECT quote_id, txid FROM quotes.quote_details"))).all()
+            return sorted(before), sorted(after)
+
+    before, after = run(scenario())
+    assert before == after
+
+def test_tag_rename_refreshes_its_quotes(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            # Una etiqueta con comas sigue siendo una sola etiqueta en tag_list
+            await session.execute(text("UPDATE quotes.tags SET tag = 'math, logic' WHERE tag = 'math'"))
+            await session.commit()
+            return await details(session), await stale(session)
+
+    rows, stale_rows = run(scenario())
+    assert stale_rows == 0
+    assert rows[0] == ("First details quote.", "Ada Lovelace", "math, logic, poetry", ["math, logic", "poetry"])
+    assert rows[2] == ("Third details quote.", "Alan Turing", "computing, math, logic", ["computing", "math, logic"])
+
+def test_quote_tags_update_refreshes_old_and_new_quotes(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            # Mueve la etiqueta "poetry" de la primera cita a la cita sin etiquetas
+            await session.execute(text("""
+                UPDATE quotes.quote_tags qt SET quote_id = (SELECT id FROM quotes.quotes WHERE quote = 'Quote without tags.')
+                FROM quotes.tags t WHERE qt.tag_id = t.id AND t.tag = 'poetry'
+            """))
+            await session.commit()
+            return await details(session), await stale(session)
+
+    rows, stale_rows = run(scenario())
+    assert stale_rows == 0
+    assert rows[0][3] == ["math"]
+    assert rows[3][3] == ["poetry"]
+
+def test_deletes_refresh_details(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            await session.execute(text("""
+                DELETE FROM quotes.quote_tags qt USING quotes.tags t WHERE qt.tag_id = t.id AND t.tag = 'math'
+            """))
+            await session.execute(text("""
+                DELETE FROM quotes.quote_tags qt USING quotes.quotes q
+                WHERE qt.quote_id = q.id AND q.quote = 'Third details quote.'
+            """))
+            await session.execute(text("DELETE FROM quotes.quotes WHERE quote = 'Third details quote.'"))
+            await session.commit()
+            return await details(session), await stale(session)
+
+    rows, stale_rows = run(scenario())
+    assert stale_rows == 0
+    assert [row[0] for row in rows] == ["First details quote.", "Second details quote.", "Quote without tags."]
+    assert rows[0][3] == ["poetry"]
+    assert rows[1][3] is None
+
+def test_rolled_back_changes_leave_details_untouched(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            before = await details(session)
+            await session.execute(text("UPDATE quotes.author SET name = 'Nobody' WHERE name = 'Alan Turing'"))
+            await session.rollback()
+            return before, await details(session), await stale(session)
+
+    before, after, stale_rows = run(scenario())
+    assert before == after
+    assert stale_rows == 0
+
+def test_full_refresh_is_idempotent(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        async with SessionLocal() as session:
+            await load(session)
+            before = (await session.execute(text("SELECT quote_id, txid FROM quotes.quote_details"))).all()
+            await session.execute(text("SELECT quotes.refresh_quote_details(NULL)"))
+            await session.commit()
+            after = (await session.execute(text("SELECT quote_id, txid FROM quotes.quote_details"))).all()
+            return sorted(before), sorted(after), await stale(session)
+
+    before, after, stale_rows = run(scenario())
+    assert before == after  # Las filas que no cambian no se reescriben
+    assert stale_rows == 0
@@ -0,0 +1,55 @@
+"""Pruebas del planificador de peticiones (src/rate_limiter.py), con respuestas simuladas."""
+
+import asyncio
+import time
+
+def response(status, headers=None):
+    from http_client import HttpResponse
+
+    return HttpResponse("http://example.test/page/1/", status, headers or {}, "", 0.01)
+
+def test_retry_after_seconds_and_http_date():
+    from rate_limiter import retry_after
+
+    assert retry_after({"Retry-After": "120"}) == 120.0
+    assert retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:30 GMT"}, now=1445412480) == 30.0
+    assert retry_after({"Retry-After": "soon"}) is None
+    assert retry_after({}) is None
+
+def test_retry_after_is_capped_by_max_delay():
+    from rate_limiter import RequestScheduler
+
+    scheduler = RequestScheduler(max_attempts=2, base_delay=0.01, max_delay=0.05)
+    replies = [response(429, {"Retry-After": "3600"}), response(200)]
+
+    async def send():
+        return replies.pop(0)
+
+    async def scenario():
+        start = time.monotonic()
+        result = await scheduler.run("http://example.test/page/1/", send)
+        throttle = scheduler.throttle("http://example.test/")
+        return result, time.monotonic() - start, throttle._wait_time(time.monotonic())
+
+    result, elapsed, paused = asyncio.run(scenario())
+    assert result.status == 200
+    assert elapsed < 1
+    assert paused == 0  # El host ya no está en pausa
+    assert scheduler.counters == {"retries": 1, "throttled": 1, "exhausted": 0}
+
+def test_retry_after_pause_applies_to_other_requests_of_the_host():
+    from rate_limiter import RequestScheduler
+
+    scheduler = RequestScheduler(max_attempts=1, max_delay=30)
+
+    async def send():
+        return response(503, {"Retry-After": "3600"})
+
+    async def scenario():
+        result = await scheduler.run("http://example.test/page/1/", send)
+        return result, scheduler.throttle("http://example.test/page/2/")._wait_time(time.monotonic())
+
+    result, paused = asyncio.run(scenario())
+    assert result.status == 503
+    assert 29 < paused <= 30
+    assert scheduler.counters["exhausted"] == 1
@@ -0,0 +1,35 @@
+"""Pruebas de `QuoteSearch` (src/search.py)."""
+
+def test_tag_filter_is_normalised_like_the_extractors():
+    from search import QuoteSearch
+    from extractors import QuoteExtractor
+
+    stored = QuoteExtractor._entry("Text.", "Author", [" life ", "HUMOR"], "/author/x")[2]
+    assert QuoteSearch._tags(["life", " humor", "Life", " "]) == tuple(stored) == ("Life", "Humor")
+    assert QuoteSearch._tags("life") == ("Life",)
+    assert QuoteSearch._tags(None) == ()
+
+def test_search_with_lowercase_tag(db, run):
+    from quote import Quote
+    from database import SessionLocal
+    from bulk_writer import BulkWriter
+    from search import QuoteSearch
+
+    async def scenario():
+        # Las etiquetas se guardan como las devuelven los extractores ("Life")
+        quotes = [
+            Quote("Life is what happens while you are busy.", "John Lennon", "October 9, 1940", ["Life"], "Liverpool", "d"),
+            Quote("Love all, trust a few.", "William Shakespeare", "April 23, 1564", ["Love", "Life"], "Stratford", "d"),
+            Quote("A day without laughter is wasted.", "Charlie Chaplin", "April 16, 1889", ["Humor"], "London", "d"),
+        ]
+        async with SessionLocal() as session:
+            await BulkWriter().save(session, quotes)
+        finder = QuoteSearch()
+        return (await finder.search(tags="life"), await finder.search("love", tags=["life"]),
+                await finder.search(tags=["life", "missing"]))
+
+    by_tag, by_text_and_tag, missing = run(scenario())
+    assert [hit.citation for hit in by_tag.hits] == [
+        "Life is what happens while you are busy.", "Love all, trust a few."]
+    assert [hit.citation for hit in by_text_and_tag.hits] == ["Love all, trust a few."]
+    assert missing.hits == [] and missing.next_cursor is None
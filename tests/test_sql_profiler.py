@@ -0,0 +1,56 @@
+"""Pruebas del perfilador SQL (src/sql_profiler.py) con un motor SQLite en memoria."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+@pytest.mark.parametrize("statement, shape", [
+    ("SELECT quotes.tags.id FROM quotes.tags WHERE quotes.tags.tag = $1::VARCHAR",
+     "SELECT quotes.tags.id FROM quotes.tags WHERE quotes.tags.tag = ?"),
+    ("INSERT INTO quotes.tags (tag) VALUES ($1::VARCHAR), ($2::VARCHAR), ($3::VARCHAR) ON CONFLICT DO NOTHING",
+     "INSERT INTO quotes.tags (tag) VALUES (?, ...) ... ON CONFLICT DO NOTHING"),
+    ("SELECT id FROM quotes.author\n   WHERE name IN ($1, $2, $3) AND id > 10 LIMIT 5",
+     "SELECT id FROM quotes.author WHERE name IN (...) AND id > ? LIMIT ?"),
+    ("SELECT * FROM t WHERE name = 'O''Brien' AND x = :x AND y = %(y)s",
+     "SELECT * FROM t WHERE name = ? AND x = ? AND y = ?"),
+])
+def test_statement_shape(statement, shape):
+    from sql_profiler import statement_shape
+
+    assert statement_shape(statement) == shape
+
+def test_same_shape_groups_different_lengths():
+    from sql_profiler import statement_shape
+
+    assert statement_shape("SELECT 1 WHERE x IN ($1)") == statement_shape("SELECT 2 WHERE x IN ($1, $2, $3)")
+
+def profile(repeats, threshold=3):
+    from sql_profiler import SqlProfiler, operation
+
+    engine = create_engine("sqlite://")
+    profiler = SqlProfiler(engine, n_plus_one_threshold=threshold).attach()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE tags (id INTEGER PRIMARY KEY, tag TEXT)"))
+            for _ in range(2):
+                with operation("Quote.save"):
+                    for number in range(repeats):
+                        conn.execute(text("SELECT id FROM tags WHERE tag = :tag"), {"tag": f"tag-{number}"})
+                    conn.execute(text("SELECT count(*) FROM tags"))
+    finally:
+        profiler.detach()
+        engine.dispose()
+    return profiler.report()
+
+def test_n_plus_one_fires_at_the_threshold():
+    report = profile(repeats=3)
+    assert report["n_plus_one"] == [{"operation": "Quote.save", "statement": "SELECT id FROM tags WHERE tag = ?",
+                                     "calls_affected": 2, "max_repeats": 3}]
+    assert report["operations"]["Quote.save"]["calls"] == 2
+    assert report["operations"]["Quote.save"]["statements_per_call"] == 4
+    assert report["operations"]["(sin operación)"]["statements"] == 1  # El CREATE TABLE
+
+def test_n_plus_one_below_the_threshold():
+    report = profile(repeats=2)
+    assert report["n_plus_one"] == []
+    top = {item["statement"]: item["calls"] for item in report["top_statements"]}
+    assert top["SELECT id FROM tags WHERE tag = ?"] == 4
@@ -0,0 +1,72 @@
+"""Pruebas del servidor sustituto y del benchmark de crawl (benchmarks/), en local y sin base de datos."""
+
+import argparse
+import asyncio
+import os
+import sys
+from aiohttp import web
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+def test_listing_pages_parse_like_quotes_toscrape():
+    from stand_in_server import StandInSite, author_slug
+    from extractors import get_extractor
+
+    site = StandInSite(pages=3, quotes_per_page=4, authors=5)
+    extractor = get_extractor("lxml")
+    first = extractor.parse(site.page_html(1))
+    last = extractor.parse(site.page_html(3))
+    after = extractor.parse(site.page_html(4))
+    quotes = extractor.quotes(first)
+    assert len(quotes) == 4
+    assert [entry[3] for entry in quotes] == [f"/author/{author_slug(n)}" for n in range(4)]
+    assert (extractor.has_data(first), extractor.has_next(first)) == (True, True)
+    assert (extractor.has_data(last), extractor.has_next(last)) == (True, False)
+    assert extractor.has_data(after) is False
+    # El contenido es determinista
+    assert StandInSite(pages=3, quotes_per_page=4, authors=5).page_html(2) == site.page_html(2)
+
+def test_author_pages_have_valid_details():
+    from stand_in_server import StandInSite, author_name
+    from extractors import get_extractor
+    from quote import Quote
+
+    site = StandInSite(authors=20)
+    names = {author_name(n) for n in range(20)}
+    assert len(names) == 20
+    assert all(Quote.clean_author(name) == name for name in names)
+    details = get_extractor("lxml").author_details(site.author_html(7))
+    assert details["author_title"] == author_name(7)
+    assert Quote.convert_birthdate(details["author_birthdate"]) is not None
+
+def test_percentile_nearest_rank():
+    from crawl_benchmark import percentile
+
+    values = [5, 1, 4, 2, 3]
+    assert (percentile(values, 0.5), percentile(values, 0.99), percentile(values, 0)) == (3, 5, 1)
+    assert percentile([], 0.5) is None
+
+def test_crawl_benchmark_against_the_stand_in(tmp_path, monkeypatch):
+    from stand_in_server import StandInSite
+    from crawl_benchmark import run_scraper
+
+    monkeypatch.chdir(tmp_path)  # El Scraper guarda sus ficheros de trabajo en el directorio actual
+    site = StandInSite(pages=6, quotes_per_page=5, authors=7)
+
+    async def scenario():
+        runner = web.AppRunner(site.app())
+        await runner.setup()
+        server = web.TCPSite(runner, "127.0.0.1", 0)
+        await server.start()
+        port = server._server.sockets[0].getsockname()[1]
+        args = argparse.Namespace(rate=0, concurrency=4, discovery="speculative", parser="lxml", parse_workers=0)
+        try:
+            return await run_scraper(f"http://127.0.0.1:{port}/", args)
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(scenario())
+    assert (result["pages"], result["quotes"], result["failed_pages"]) == (6, 30, 0)
+    assert result["author_fetches"] == 7
+    assert site.counters["authors"] == 7
+    assert result["latency_ms"]["p50"] is not None
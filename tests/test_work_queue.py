@@ -0,0 +1,167 @@
+"""Pruebas de integración de la cola de trabajos del crawl distribuido (src/work_queue.py)."""
+
+import asyncio
+from sqlalchemy import text
+
+def page_jobs(count):
+    return [("page", f"/page/{n}/", {"page": n}) for n in range(1, count + 1)]
+
+async def seeded(count):
+    from work_queue import WorkQueue
+
+    queue = WorkQueue(retry_delay=60)
+    await queue.seed(page_jobs(count))
+    return queue
+
+async def job_row(session, job):
+    result = await session.execute(text(
+        "SELECT status, attempts, worker_id, error, available_at > now() AS delayed FROM quotes.crawl_jobs WHERE id = :id"),
+        {"id": job.id})
+    return result.one()
+
+def test_enqueue_ignores_existing_jobs(db, run):
+    from work_queue import WorkQueue
+
+    async def scenario():
+        queue = WorkQueue()
+        first = await queue.seed(page_jobs(3))
+        second = await queue.seed(page_jobs(5))
+        return first, second, await queue.stats()
+
+    first, second, stats = run(scenario())
+    assert (first, second) == (3, 2)
+    assert stats == {"page.pending": 5, "workers": 0}
+
+def test_claim_skips_rows_locked_by_another_transaction(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        queue = await seeded(8)
+        async with SessionLocal() as locker, SessionLocal() as session:
+            locked = (await locker.execute(text(
+                "SELECT id FROM quotes.crawl_jobs ORDER BY id LIMIT 3 FOR UPDATE"))).scalars().all()
+            # Con SKIP LOCKED la reclamación no espera a que termine la otra transacción
+            jobs = await asyncio.wait_for(queue.claim(session, "worker-b", 5), timeout=5)
+            await locker.rollback()
+        return locked, [job.id for job in jobs]
+
+    locked, claimed = run(scenario())
+    assert not set(locked) & set(claimed)
+    assert claimed == sorted(claimed) and len(claimed) == 5
+
+def test_concurrent_claims_are_disjoint(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        queue = await seeded(60)
+
+        async def worker(name):
+            claimed = []
+            async with SessionLocal() as session:
+                while jobs := await queue.claim(session, name, 4):
+                    claimed.extend(job.id for job in jobs)
+            return claimed
+
+        results = await asyncio.gather(*(worker(f"worker-{n}") for n in range(4)))
+        async with SessionLocal() as session:
+            return results, await queue.remaining(session)
+
+    results, remaining = run(scenario())
+    claimed = [job_id for result in results for job_id in result]
+    assert len(claimed) == len(set(claimed)) == 60
+    assert remaining == 60  # Todos en curso, ninguno pendiente
+
+def test_complete_requires_the_owner(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        queue = await seeded(1)
+        async with SessionLocal() as session:
+            [job] = await queue.claim(session, "worker-a", 1)
+            stolen = await queue.complete(session, job, "worker-b")
+            owned = await queue.complete(session, job, "worker-a")
+            await session.commit()
+            return stolen, owned, await job_row(session, job)
+
+    stolen, owned, row = run(scenario())
+    assert (stolen, owned) == (False, True)
+    assert (row.status, row.worker_id, row.attempts) == ("done", "worker-a", 1)
+
+def test_failed_job_is_retried_later_then_marked_failed(db, run):
+    from database import SessionLocal
+    from work_queue import WorkQueue
+
+    async def scenario():
+        queue = WorkQueue(max_attempts=2, retry_delay=60)
+        await queue.seed(page_jobs(1))
+        rows = []
+        async with SessionLocal() as session:
+            [job] = await queue.claim(session, "worker-a", 1)
+            await queue.fail(session, job, "worker-a", "timeout")
+            rows.append(await job_row(session, job))
+            # La espera aún no ha pasado: no se puede reclamar
+            rows.append(await queue.claim(session, "worker-a", 1))
+            await session.execute(text("UPDATE quotes.crawl_jobs SET available_at = now()"))
+            await session.commit()
+            [job] = await queue.claim(session, "worker-a", 1)
+            await queue.fail(session, job, "worker-a", "timeout again")
+            rows.append(await job_row(session, job))
+        return rows
+
+    retried, early, failed = run(scenario())
+    assert (retried.status, retried.attempts, retried.worker_id, retried.error, retried.delayed) == (
+        "pending", 1, None, "timeout", True)
+    assert early == []
+    assert (failed.status, failed.attempts, failed.error) == ("failed", 2, "timeout again")
+
+def test_final_failure_is_not_retried(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        queue = await seeded(1)
+        async with SessionLocal() as session:
+            [job] = await queue.claim(session, "worker-a", 1)
+            await queue.fail(session, job, "worker-a", "HTTP 404", final=True)
+            return await job_row(session, job), await queue.remaining(session)
+
+    row, remaining = run(scenario())
+    assert (row.status, row.attempts) == ("failed", 1)
+    assert remaining == 0
+
+def test_expired_leases_are_reclaimed(db, run):
+    from database import SessionLocal
+    from work_queue import WorkQueue
+
+    async def scenario():
+        queue = WorkQueue(lease=0)
+        await queue.seed(page_jobs(3))
+        async with SessionLocal() as session:
+            jobs = await queue.claim(session, "worker-a", 2)
+            reclaimed = await queue.reclaim_expired(session)
+            # El trabajador que perdió el lease ya no puede terminar el trabajo
+            late = await queue.complete(session, jobs[0], "worker-a")
+            await session.commit()
+            again = await queue.claim(session, "worker-b", 3)
+        return reclaimed, late, [(job.id, job.attempts) for job in again], [job.id for job in jobs]
+
+    reclaimed, late, again, first = run(scenario())
+    assert reclaimed == 2
+    assert late is False
+    assert again == [(first[0], 2), (first[1], 2), (first[1] + 1, 1)]
+
+def test_release_returns_jobs_without_counting_the_attempt(db, run):
+    from database import SessionLocal
+
+    async def scenario():
+        queue = await seeded(3)
+        async with SessionLocal() as session:
+            await queue.register(session, "worker-a")
+            await queue.claim(session, "worker-a", 2)
+            await queue.release(session, "worker-a")
+            rows = (await session.execute(text(
+                "SELECT status, attempts, worker_id FROM quotes.crawl_jobs ORDER BY id"))).all()
+            return [tuple(row) for row in rows], await queue.stats(session)
+
+    rows, stats = run(scenario())
+    assert rows == [("pending", 0, None)] * 3
+    assert stats == {"page.pending": 3, "workers": 0}